@@ -0,0 +1,59 @@
+import logging
+from collections import OrderedDict
+from typing import Callable
+
+from app.infrastructure.entities.base_agent import LangpifyBaseAgent
+from app.domain.settings.constants import AGENT_FACTORY_MAX_AGENTS
+
+logger = logging.getLogger(__name__)
+
+
+class AgentFactory:
+    """
+    Agent Factory
+
+    Keeps built agents (their LLM clients and compiled LangGraph workflows) by
+    manifest fingerprint, so re-initializing the environment with unchanged
+    manifests reuses them instead of compiling new graphs. A changed manifest,
+    framework or sub-agent gives a new fingerprint and a new build; the least
+    recently used builds are dropped beyond max_agents.
+    """
+
+    def __init__(self, max_agents: int = AGENT_FACTORY_MAX_AGENTS):
+        """
+        Initialize the AgentFactory.
+
+        Args:
+            max_agents: Maximum number of built agents kept
+        """
+        self.max_agents = max_agents
+        self._agents: "OrderedDict[str, LangpifyBaseAgent]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def get_or_create(
+        self, fingerprint: str, build: Callable[[], LangpifyBaseAgent]
+    ) -> LangpifyBaseAgent:
+        """
+        Get the agent built for a fingerprint, building it on the first call
+
+        Args:
+            fingerprint: Hash of everything that shapes the agent
+            build: Builds the agent
+
+        Returns:
+            The agent
+        """
+        agent = self._agents.get(fingerprint)
+        if agent is not None:
+            self._agents.move_to_end(fingerprint)
+            logger.debug(f"Reusing built agent {agent.aid}")
+            return agent
+
+        agent = build()
+        self._agents[fingerprint] = agent
+        while len(self._agents) > self.max_agents:
+            self._agents.popitem(last=False)
+        logger.info(f"Built agent {agent.aid}")
+        return agent
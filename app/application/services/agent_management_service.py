@@ -1,11 +1,31 @@
 import yaml
 import os
 import logging
+import hashlib
+import json
 from app.infrastructure.entities.base_agent import LangpifyBaseAgent
+from app.application.services.agent_factory import AgentFactory
+from app.application.services.agent_registry import (
+    AgentNotFoundError,
+    AgentRegistry,
+    AgentStatusError,
+)
+from app.application.services.prefetcher import Prefetcher
+from app.application.services.query_router import (
+    DIRECT_PATHWAYS,
+    SUPERVISOR_AID,
+    QueryRouter,
+    RouteDecision,
+)
 from app.domain.agents.templates import templates
-from app.infrastructure.entities.entities import LangpifyStatus, LangpifyAgentTemplate
+from app.infrastructure.entities.entities import (
+    LangpifyAgentTemplate,
+    LangpifyAgentType,
+    LangpifyStatus,
+)
 from app.application.ai_settings.ai_settings_provider import AISettingsProvider
 import traceback
+from typing import AsyncIterator, Optional, Tuple
 from app.domain.agents.supervisor.supervisor_models import (
     SupervisorResponse,
     SupervisorState,
@@ -24,15 +44,43 @@ from app.domain.agents.pokemon_expert.pokemon_expert_models import (
 )
 
 
+from app.application.tools.utils.cache import get_agent_response_cache
+from app.application.tools.utils.single_flight import SingleFlight
+from app.domain.settings.constants import PREFETCH_ENABLED, QUERY_ROUTER_ENABLED
+
 from langsmith import traceable
-from langchain.schema import SystemMessage, HumanMessage
+from langchain.schema import SystemMessage, HumanMessage, AIMessage
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
 
 
-# In productive environments we should use circuitbreakers
-# from circuitbreaker import circuit
+# Circuit breakers live in the LLM gateway (app/domain/utils/llm_gateway.py),
+# one per model, so a failing provider falls back instead of failing the agent
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Agents whose workflows are embedded in a coordinator's graph, by coordinator aid
+SUB_AGENTS = {
+    "supervisor@langpify.agents": [
+        "researcher@langpify.agents",
+        "pokemon_expert@langpify.agents",
+    ],
+}
+
+
+def _jsonable(value):
+    """JSON-safe copy of a workflow state value (messages keep their type)"""
+    if isinstance(value, BaseMessage):
+        return message_to_dict(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
 
 class AgentManagementService:
     """
@@ -44,14 +92,33 @@ class AgentManagementService:
     In production environments, this should be a micro-service.
     """
 
-    def __init__(self, ai_settings_provider: AISettingsProvider):
+    def __init__(
+        self,
+        ai_settings_provider: AISettingsProvider,
+        agent_factory: Optional[AgentFactory] = None,
+        query_router: Optional[QueryRouter] = None,
+        prefetcher: Optional[Prefetcher] = None,
+    ):
         """
         Initialize the AgentManagementService.
 
         Args:
             ai_settings_provider: Provider for AI settings
+            agent_factory: Factory reusing built agents across environment inits
+            query_router: Classifier sending obvious supervisor queries straight
+                to the sub-agents (unused when QUERY_ROUTER_ENABLED is off)
+            prefetcher: Background fetcher of the Pokémon named in questions
+                (unused when PREFETCH_ENABLED is off)
         """
-        self._agents: list[LangpifyBaseAgent] = []
+        self._agents = AgentRegistry()
+        self._fingerprints: dict[str, str] = {}
+        self._agent_factory = agent_factory or AgentFactory()
+        self.query_router = (
+            (query_router or QueryRouter()) if QUERY_ROUTER_ENABLED else None
+        )
+        self.prefetcher = (prefetcher or Prefetcher()) if PREFETCH_ENABLED else None
+        self._response_cache = get_agent_response_cache()
+        self._invocations = SingleFlight()
         self.ai_settings_provider = ai_settings_provider
         logger.info(
             f"Creating new instance of AgentManagementService with ID: {id(self)}"
@@ -124,28 +191,39 @@ class AgentManagementService:
                 state_schema = PokemonExpertState
                 tools = POKEMON_EXPERT_TOOLS
 
-            sub_workflows = []
-
-            if template.aid == "supervisor@langpify.agents":
-                sub_workflows.append(self._agents[0].planning["workflow"]["graph"])
-                sub_workflows.append(self._agents[1].planning["workflow"]["graph"])
-
-            agent = LangpifyBaseAgent(
-                aid=template.aid,
-                name=template.name,
-                type=template.type,
-                role=template.role,
-                settings=settings,
-                language=template.language,
-                planning=template.planning,
-                safety=template.safety,
-                response_model=response_model,
-                state_schema=state_schema,
-                tools=tools,
-                sub_workflows=sub_workflows,
+            sub_agents = SUB_AGENTS.get(template.aid, [])
+            sub_workflows = [
+                self._agents.require(aid).planning["workflow"]["graph"]
+                for aid in sub_agents
+            ]
+
+            # Unchanged manifests reuse the agent (and compiled graph) built before
+            fingerprint = self._fingerprint(template, sub_agents)
+            agent = self._agent_factory.get_or_create(
+                fingerprint,
+                lambda: LangpifyBaseAgent(
+                    aid=template.aid,
+                    name=template.name,
+                    type=template.type,
+                    role=template.role,
+                    settings=settings,
+                    language=template.language,
+                    planning=template.planning,
+                    safety=template.safety,
+                    response_model=response_model,
+                    state_schema=state_schema,
+                    tools=tools,
+                    sub_workflows=sub_workflows,
+                ),
             )
 
-            self._agents.append(agent)
+            # A reused build may belong to an agent deleted before
+            if agent.status == LangpifyStatus.DELETED:
+                agent.status = LangpifyStatus.INITIATED
+
+            # Re-creating an agent replaces it instead of adding a duplicate
+            self._agents.put(agent)
+            self._fingerprints[agent.aid] = fingerprint
 
             return agent
 
@@ -155,8 +233,69 @@ class AgentManagementService:
             )
             return None
 
-    async def list_agents(self) -> list[LangpifyBaseAgent]:
-        return self._agents
+    async def list_agents(
+        self,
+        type: Optional[LangpifyAgentType] = None,
+        status: Optional[LangpifyStatus] = None,
+    ) -> list[LangpifyBaseAgent]:
+        """
+        List agents, optionally filtered by type and status.
+
+        Args:
+            type: Only agents of this type
+            status: Only agents in this status
+
+        Returns:
+            Matching agents
+        """
+        return self._agents.find(type=type, status=status)
+
+    async def suspend_agent(self, aid: str) -> LangpifyBaseAgent:
+        """
+        Suspend an active agent. Its workflow is kept, so resuming is instant.
+
+        Raises:
+            AgentNotFoundError: If the agent doesn't exist
+            AgentStatusError: If the agent is not active
+        """
+        agent = self._agents.require(aid)
+        if agent.status != LangpifyStatus.ACTIVE:
+            raise AgentStatusError(f"Agent {aid} is {agent.status.value}, not active")
+        return self._agents.set_status(aid, LangpifyStatus.SUSPENDED)
+
+    async def resume_agent(self, aid: str) -> LangpifyBaseAgent:
+        """
+        Reactivate a suspended agent.
+
+        Raises:
+            AgentNotFoundError: If the agent doesn't exist
+            AgentStatusError: If the agent is not suspended
+        """
+        agent = self._agents.require(aid)
+        if agent.status != LangpifyStatus.SUSPENDED:
+            raise AgentStatusError(
+                f"Agent {aid} is {agent.status.value}, not suspended"
+            )
+        return self._agents.set_status(aid, LangpifyStatus.ACTIVE)
+
+    async def delete_agent(self, aid: str) -> LangpifyBaseAgent:
+        """
+        Delete an agent. Its build stays in the agent factory, so creating it
+        again from an unchanged template is instant.
+
+        Raises:
+            AgentNotFoundError: If the agent doesn't exist
+            AgentStatusError: If a coordinator still embeds the agent's workflow
+        """
+        for coordinator, children in SUB_AGENTS.items():
+            if aid in children and coordinator in self._agents:
+                raise AgentStatusError(
+                    f"Agent {aid} is a sub-agent of {coordinator}, delete it first"
+                )
+        agent = self._agents.set_status(aid, LangpifyStatus.DELETED)
+        self._agents.remove(aid)
+        self._fingerprints.pop(aid, None)
+        return agent
 
     async def init_environment(self) -> list[LangpifyBaseAgent]:
         """
@@ -181,55 +320,297 @@ class AgentManagementService:
 
             # Set agent status to ACTIVE
             if researcher_agent:
-                researcher_agent.status = LangpifyStatus.ACTIVE
-                agents.append(researcher_agent)
+                agents.append(
+                    self._agents.set_status(researcher_agent.aid, LangpifyStatus.ACTIVE)
+                )
             if pokemon_expert_agent:
-                pokemon_expert_agent.status = LangpifyStatus.ACTIVE
-                agents.append(pokemon_expert_agent)
+                agents.append(
+                    self._agents.set_status(
+                        pokemon_expert_agent.aid, LangpifyStatus.ACTIVE
+                    )
+                )
 
+            supervisor_agent = None
             if researcher_agent and pokemon_expert_agent:
                 supervisor_agent = await self.create_agent_from_template(
                     "supervisorAgent"
                 )
 
             if supervisor_agent:
-                supervisor_agent.status = LangpifyStatus.ACTIVE
-                agents.append(supervisor_agent)
+                agents.append(
+                    self._agents.set_status(supervisor_agent.aid, LangpifyStatus.ACTIVE)
+                )
 
             return agents
 
         except Exception as e:
-            logger.error(f"Error creating agent from template {aid_prefix}: {str(e)}")
+            logger.error(f"Error initializing the environment: {str(e)}")
 
         return agents
 
+    def _fingerprint(self, template: LangpifyAgentTemplate, children: list[str]) -> str:
+        """
+        Hash of everything that shapes an agent's answers: its manifest (role,
+        models, planning, safety), the framework and its sub-agents' fingerprints.
+        """
+        payload = {
+            "template": template.model_dump(mode="json"),
+            "framework": str(self.ai_settings_provider.ai_settings.get("_framework")),
+            "children": [self._fingerprints.get(aid, aid) for aid in children],
+        }
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """Normalize case, whitespace and trailing punctuation of a question"""
+        return " ".join(question.lower().split()).rstrip("?!. ")
+
+    def _cache_key(self, aid: str, question: str) -> str:
+        raw = f"{aid}|{self._fingerprints.get(aid, '')}|{self.normalize_question(question)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cached_state(self, key: str) -> Optional[dict]:
+        """Final state stored for a cache key, with its messages rebuilt"""
+        cached = self._response_cache.get(key)
+        if cached is None:
+            return None
+        return {**cached, "messages": messages_from_dict(cached.get("messages") or [])}
+
+    def _cache_state(self, key: str, state: dict) -> None:
+        """Store a final state as JSON (never pickled: the disk tier is shared)"""
+        self._response_cache.set(key, _jsonable(state))
+
+    def _get_active_agent(self, aid: str) -> LangpifyBaseAgent:
+        """
+        Find an agent by aid
+
+        Raises:
+            ValueError: If the agent doesn't exist or is not active
+        """
+        agent = self._agents.get(aid)
+        if agent is None:
+            logger.error(f"Agent {aid} not found")
+            raise AgentNotFoundError(f"Agent {aid} not found")
+        if agent.status != LangpifyStatus.ACTIVE:
+            logger.error(f"Agent {aid} is not active")
+            raise AgentStatusError(f"Agent {aid} is not active")
+        return agent
+
+    def get_chat_model(self, aid: str):
+        """
+        Get the chat model (LLM gateway) of an active agent, to prompt it
+        outside of its workflow
+
+        Raises:
+            ValueError: If the agent doesn't exist or is not active
+        """
+        return self._get_active_agent(aid).language["llm"]["model"]
+
+    @staticmethod
+    def _initial_state(agent: LangpifyBaseAgent, question: str) -> dict:
+        messages = [
+            SystemMessage(content=agent.role["prompt"]),
+            HumanMessage(content=question),
+        ]
+        return {
+            "input": question,
+            "messages": messages,
+            "remaining_steps": 20,
+            "structured_response": None,
+        }
+
     @traceable
-    # @circuit(failure_threshold=3, recovery_timeout=60)
-    async def invoke_agent(self, aid: str, question: str) -> None:
+    async def invoke_agent(
+        self, aid: str, question: str, use_cache: bool = True, refresh: bool = False
+    ) -> None:
+        """
+        Invoke an agent workflow, answering repeated questions from the response cache.
+
+        Args:
+            aid: Agent identifier
+            question: User question
+            use_cache: Read and write the response cache (False bypasses it)
+            refresh: Skip the cached answer and store a fresh one
+
+        Returns:
+            The final workflow state
+        """
         try:
-            for agent in self._agents:
-                if agent.aid == aid:
-                    if agent.status == LangpifyStatus.ACTIVE:
-                        messages = [
-                            SystemMessage(content=agent.role["prompt"]),
-                            HumanMessage(content=question),
-                        ]
-
-                        initial_state = {
-                            "input": question,
-                            "messages": messages,
-                            "remaining_steps": 20,
-                            "structured_response": None,
-                        }
-                        logger.info(f"Invoking agent: {agent.aid}")
-                        workflow = agent.planning["workflow"]["graph"]
-                        state = await workflow.ainvoke(initial_state)
+            agent = self._get_active_agent(aid)
+            key = self._cache_key(aid, question)
+            if use_cache and not refresh:
+                cached = self._cached_state(key)
+                if cached is not None:
+                    logger.info(f"Agent {aid} answered from cache")
+                    return cached
+
+            async def run():
+                self._prefetch(question)
+                if aid == SUPERVISOR_AID and self.query_router is not None:
+                    state = await self._route(question)
+                    if state is not None:
                         return state
-                    else:
-                        logger.error(f"Agent {aid} is not active")
-                        raise ValueError(f"Agent {aid} is not active")
-            logger.error(f"Agent {aid} not found")
-            raise ValueError(f"Agent {aid} not found")
+                logger.info(f"Invoking agent: {agent.aid}")
+                workflow = agent.planning["workflow"]["graph"]
+                return await workflow.ainvoke(self._initial_state(agent, question))
+
+            if not use_cache:
+                return await run()
+
+            # Identical questions in flight share one workflow run
+            state = await self._invocations.do(key, run)
+            self._cache_state(key, state)
+            return state
         except Exception as e:
             logger.error(f"Error invoking agent {aid}: {str(e)}", exc_info=True)
             raise ValueError(f"Error invoking agent {aid}: {str(e)}")
+
+    def _prefetch(self, question: str) -> None:
+        """Start fetching the Pokémon named in a question while the agents think"""
+        if self.prefetcher is None:
+            return
+        try:
+            self.prefetcher.prefetch(question)
+        except Exception as e:
+            logger.warning(f"Prefetch failed: {str(e)}")
+
+    async def _route(self, question: str) -> Optional[dict]:
+        """
+        Answer a supervisor query without the supervisor when the query router
+        classifies it confidently.
+
+        Returns:
+            A supervisor-shaped final state, or None to run the supervisor
+        """
+        decision = self.query_router.classify(question)
+        if decision.direct:
+            try:
+                state = await self._invoke_direct(decision, question)
+                self.query_router.record(decision, direct=True)
+                return state
+            except Exception as e:
+                logger.warning(
+                    f"Direct dispatch of pathway {decision.pathway} failed, "
+                    f"falling back to the supervisor: {str(e)}"
+                )
+                self.query_router.record_dispatch_error()
+        self.query_router.record(decision, direct=False)
+        return None
+
+    async def _invoke_direct(self, decision: RouteDecision, question: str) -> dict:
+        """
+        Run the sub-agents of a pathway in sequence, the way the supervisor
+        would delegate to them, each one getting the previous one's answer.
+
+        Returns:
+            The final state, shaped like the supervisor's
+        """
+        logger.info(
+            f"Routing pathway {decision.pathway} for {decision.pokemon} "
+            f"directly (confidence {decision.confidence:.2f})"
+        )
+        prompt = question
+        responses = {}
+        state = None
+        for aid in DIRECT_PATHWAYS[decision.pathway]:
+            agent = self._get_active_agent(aid)
+            workflow = agent.planning["workflow"]["graph"]
+            state = await workflow.ainvoke(self._initial_state(agent, prompt))
+            responses[aid] = state.get("structured_response")
+            answer = state["messages"][-1].content
+            prompt = f"{question}\n\nData from the {agent.name}:\n{answer}"
+
+        expert = responses.get("pokemon_expert@langpify.agents")
+        return {
+            "input": question,
+            "messages": [HumanMessage(content=question), AIMessage(content=answer)],
+            "structured_response": SupervisorResponse(
+                answer=answer,
+                # Only the expert reasons; the router's match is not an answer
+                reasoning=getattr(expert, "reasoning", None),
+            ),
+            "research_response": responses.get("researcher@langpify.agents"),
+            "pokemon_expert_response": expert,
+            "route": decision._asdict(),
+        }
+
+    async def stream_agent(
+        self, aid: str, question: str, use_cache: bool = True, refresh: bool = False
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Stream an agent workflow as it runs.
+
+        Yields (event, data) pairs: 'token' (LLM output chunks), 'handoff'
+        (supervisor transfers), 'tool_start' / 'tool_end' and a last 'final'
+        with the structured response. Cached answers are replayed as a single
+        'final' event.
+
+        Args:
+            aid: Agent identifier
+            question: User question
+            use_cache: Read and write the response cache (False bypasses it)
+            refresh: Skip the cached answer and store a fresh one
+
+        Raises:
+            ValueError: If the agent doesn't exist or is not active
+        """
+        agent = self._get_active_agent(aid)
+        key = self._cache_key(aid, question)
+        if use_cache and not refresh:
+            cached = self._cached_state(key)
+            if cached is not None:
+                logger.info(f"Agent {aid} answered from cache")
+                yield "final", self._final_payload(cached, cached=True)
+                return
+
+        self._prefetch(question)
+        logger.info(f"Streaming agent: {agent.aid}")
+        workflow = agent.planning["workflow"]["graph"]
+        final_state = None
+        async for event in workflow.astream_events(
+            self._initial_state(agent, question), version="v2"
+        ):
+            kind = event["event"]
+            node = event.get("metadata", {}).get("langgraph_node")
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content:
+                    yield "token", {"agent": node, "content": content}
+            elif kind == "on_tool_start":
+                if event["name"].startswith("transfer_to_"):
+                    yield "handoff", {"to": event["name"][len("transfer_to_") :]}
+                else:
+                    yield "tool_start", {
+                        "agent": node,
+                        "tool": event["name"],
+                        "input": event["data"].get("input"),
+                    }
+            elif kind == "on_tool_end" and not event["name"].startswith("transfer_"):
+                yield "tool_end", {
+                    "agent": node,
+                    "tool": event["name"],
+                    "output": str(event["data"].get("output"))[:2000],
+                }
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                # The root run ends with the final state
+                final_state = event["data"].get("output")
+
+        if final_state is None:
+            raise ValueError(f"Agent {aid} finished without a final state")
+        if use_cache:
+            self._cache_state(key, final_state)
+        yield "final", self._final_payload(final_state)
+
+    @staticmethod
+    def _final_payload(state: dict, cached: bool = False) -> dict:
+        structured = state.get("structured_response")
+        if hasattr(structured, "model_dump"):
+            structured = structured.model_dump()
+        messages = state.get("messages") or []
+        return {
+            "structured_response": structured,
+            "answer": getattr(messages[-1], "content", None) if messages else None,
+            "cached": cached,
+        }
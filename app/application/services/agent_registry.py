@@ -0,0 +1,135 @@
+import logging
+from typing import Dict, Iterator, List, Optional
+
+from app.infrastructure.entities.base_agent import LangpifyBaseAgent
+from app.infrastructure.entities.entities import LangpifyAgentType, LangpifyStatus
+
+logger = logging.getLogger(__name__)
+
+
+class AgentNotFoundError(ValueError):
+    """Raised when no agent is registered with an aid"""
+
+
+class AgentStatusError(ValueError):
+    """Raised when an agent is not in a status that allows the operation"""
+
+
+class AgentRegistry:
+    """
+    Agent Registry
+
+    Agents keyed by aid, with secondary indexes by type and status so
+    lookups and filtered listings never scan every agent. Registering an aid
+    again replaces the previous agent in place, and status changes go through
+    set_status so the indexes stay in sync.
+    """
+
+    def __init__(self):
+        self._agents: Dict[str, LangpifyBaseAgent] = {}
+        # Indexes map to dicts used as insertion-ordered sets of aids
+        self._by_type: Dict[Optional[LangpifyAgentType], Dict[str, None]] = {}
+        self._by_status: Dict[LangpifyStatus, Dict[str, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __contains__(self, aid: str) -> bool:
+        return aid in self._agents
+
+    def __iter__(self) -> Iterator[LangpifyBaseAgent]:
+        return iter(list(self._agents.values()))
+
+    def _index(self, agent: LangpifyBaseAgent) -> None:
+        self._by_type.setdefault(agent.type, {})[agent.aid] = None
+        self._by_status.setdefault(agent.status, {})[agent.aid] = None
+
+    def _unindex(self, agent: LangpifyBaseAgent) -> None:
+        self._by_type.get(agent.type, {}).pop(agent.aid, None)
+        self._by_status.get(agent.status, {}).pop(agent.aid, None)
+
+    def put(self, agent: LangpifyBaseAgent) -> None:
+        """
+        Register an agent, replacing any agent registered with the same aid
+
+        Args:
+            agent: Agent to register
+        """
+        previous = self._agents.get(agent.aid)
+        if previous is not None:
+            self._unindex(previous)
+        self._agents[agent.aid] = agent
+        self._index(agent)
+
+    def get(self, aid: str) -> Optional[LangpifyBaseAgent]:
+        """Get the agent registered with an aid, or None"""
+        return self._agents.get(aid)
+
+    def require(self, aid: str) -> LangpifyBaseAgent:
+        """
+        Get the agent registered with an aid
+
+        Raises:
+            AgentNotFoundError: If no agent is registered with the aid
+        """
+        agent = self._agents.get(aid)
+        if agent is None:
+            raise AgentNotFoundError(f"Agent {aid} not found")
+        return agent
+
+    def remove(self, aid: str) -> LangpifyBaseAgent:
+        """
+        Unregister an agent
+
+        Returns:
+            The agent removed
+
+        Raises:
+            AgentNotFoundError: If no agent is registered with the aid
+        """
+        agent = self.require(aid)
+        self._unindex(agent)
+        del self._agents[aid]
+        return agent
+
+    def set_status(self, aid: str, status: LangpifyStatus) -> LangpifyBaseAgent:
+        """
+        Change the status of an agent
+
+        Raises:
+            AgentNotFoundError: If no agent is registered with the aid
+        """
+        agent = self.require(aid)
+        self._unindex(agent)
+        agent.status = status
+        self._index(agent)
+        return agent
+
+    def find(
+        self,
+        type: Optional[LangpifyAgentType] = None,
+        status: Optional[LangpifyStatus] = None,
+    ) -> List[LangpifyBaseAgent]:
+        """
+        List agents, optionally filtered by type and status
+
+        Args:
+            type: Only agents of this type
+            status: Only agents in this status
+
+        Returns:
+            Matching agents
+        """
+        if type is None and status is None:
+            return list(self._agents.values())
+        indexes = []
+        if type is not None:
+            indexes.append(self._by_type.get(type, {}))
+        if status is not None:
+            indexes.append(self._by_status.get(status, {}))
+        smallest = min(indexes, key=len)
+        return [
+            self._agents[aid]
+            for aid in smallest
+            if all(aid in index for index in indexes)
+        ]
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import re
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.application.services.agent_management_service import AgentManagementService
+from app.application.tools.utils.cache import get_narration_cache
+from app.application.tools.utils.pokemon_utils import (
+    afetch_pokemon_data,
+    analyze_pokemon_battle,
+)
+from app.domain.agents.pokemon_expert.pokemon_expert_models import (
+    PokemonExpertResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+SUPERVISOR_AID = "supervisor@langpify.agents"
+NARRATION_ID = re.compile(r"[0-9a-f]{32}")
+
+NARRATION_PROMPT = (
+    "You are a Pokémon battle commentator. The battle below has already been "
+    "decided: narrate it in a few vivid sentences. Never change the winner "
+    "and don't contradict the reasoning."
+)
+
+
+class BattleService:
+    """
+    Battle Service
+
+    Answers battles deterministically with `analyze_pokemon_battle` (no LLM
+    call) and optionally asks the supervisor's chat model for a narration of
+    the result in the background, so the verdict is returned in milliseconds.
+    """
+
+    def __init__(self, agent_management_service: AgentManagementService):
+        """
+        Initialize the BattleService.
+
+        Args:
+            agent_management_service: Service providing the narrator's chat model
+        """
+        self.agent_management_service = agent_management_service
+        self._narrations = get_narration_cache()
+        self._tasks: set = set()
+
+    async def resolve_pokemon(
+        self, pokemon1: str, pokemon2: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Load both Pokémon from the data layer concurrently
+
+        Raises:
+            ValueError: If a Pokémon is not found
+        """
+        data1, data2 = await asyncio.gather(
+            afetch_pokemon_data(pokemon1), afetch_pokemon_data(pokemon2)
+        )
+        for data in (data1, data2):
+            if "error" in data:
+                raise ValueError(data["error"])
+        return data1, data2
+
+    async def fast_battle(self, pokemon1: str, pokemon2: str) -> PokemonExpertResponse:
+        """
+        Determine the winner of a battle without invoking any agent.
+
+        Args:
+            pokemon1: First Pokémon name
+            pokemon2: Second Pokémon name
+
+        Returns:
+            The winner and the reasoning, as the Pokémon Expert would return them
+        """
+        data1, data2 = await self.resolve_pokemon(pokemon1, pokemon2)
+        winner, reasoning = analyze_pokemon_battle(data1, data2)
+        return PokemonExpertResponse(winner=winner, reasoning=reasoning)
+
+    def narrate(
+        self, pokemon1: str, pokemon2: str, result: PokemonExpertResponse
+    ) -> str:
+        """
+        Start a background narration of a battle result.
+
+        The supervisor's chat model is prompted directly: running the agents
+        (or the query router's researcher -> expert pathway) would analyze
+        the battle again and could contradict the winner.
+
+        Args:
+            pokemon1: First Pokémon name
+            pokemon2: Second Pokémon name
+            result: Deterministic battle result to narrate
+
+        Returns:
+            Narration id to poll with get_narration
+        """
+        narration_id = uuid.uuid4().hex
+        self._store_narration(narration_id, "pending", None)
+
+        battle = (
+            f"Battle: {pokemon1} vs {pokemon2}\n"
+            f"Winner: {result.winner}\n"
+            f"Reasoning: {result.reasoning}"
+        )
+
+        async def run():
+            try:
+                model = self.agent_management_service.get_chat_model(SUPERVISOR_AID)
+                message = await model.ainvoke(
+                    [
+                        SystemMessage(content=NARRATION_PROMPT),
+                        HumanMessage(content=battle),
+                    ]
+                )
+                narration = message.content
+                self._store_narration(narration_id, "done", narration)
+            except Exception as e:
+                logger.warning(f"Narration {narration_id} failed: {str(e)}")
+                self._store_narration(narration_id, "error", None)
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return narration_id
+
+    def _store_narration(
+        self, narration_id: str, status: str, narration: Optional[str]
+    ) -> None:
+        self._narrations.set(narration_id, {"status": status, "narration": narration})
+
+    def get_narration(self, narration_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status ('pending', 'done' or 'error') and text of a narration
+
+        Args:
+            narration_id: Id returned by narrate
+
+        Returns:
+            The narration entry, or None if it is unknown or expired
+        """
+        # Ids name files in the narration store
+        if not NARRATION_ID.fullmatch(narration_id):
+            return None
+        return self._narrations.get(narration_id)
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from app.application.tools.utils.name_extractor import (
+    NameExtractor,
+    get_name_extractor,
+)
+from app.application.tools.utils.pokemon_utils import afetch_pokemon_data
+from app.domain.settings.constants import PREFETCH_MAX_NAMES, PREFETCH_SPRITES
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """
+    Speculative Pokémon Prefetcher
+
+    Starts loading the data (and optionally the sprites) of the Pokémon named
+    in a question as soon as the question arrives, in the background, so the
+    researcher's tool calls issued a few LLM steps later find a warm cache.
+    Fetches go through the shared PokéAPI cache and its single-flight, so a
+    tool call arriving while a prefetch is in flight waits for it instead of
+    fetching again.
+    """
+
+    def __init__(
+        self,
+        extractor: Optional[NameExtractor] = None,
+        sprites: bool = PREFETCH_SPRITES,
+        max_names: int = PREFETCH_MAX_NAMES,
+    ):
+        """
+        Initialize the Prefetcher.
+
+        Args:
+            extractor: Name extractor (the shared one by default)
+            sprites: Also warm the sprite cache used by the battle renderer
+            max_names: Most Pokémon prefetched per question
+        """
+        self._extractor = extractor
+        self.sprites = sprites
+        self.max_names = max_names
+        self._tasks: set = set()
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, int] = {
+            "questions": 0,
+            "pokemon": 0,
+            "errors": 0,
+        }
+
+    def _name_extractor(self) -> NameExtractor:
+        if self._extractor is None:
+            self._extractor = get_name_extractor()
+        return self._extractor
+
+    def prefetch(self, question: str) -> List[str]:
+        """
+        Start prefetching the Pokémon named in a question.
+
+        Must be called from the event loop; returns without waiting.
+
+        Args:
+            question: User question
+
+        Returns:
+            The Pokémon being prefetched
+        """
+        names = self._name_extractor().extract(question)[: self.max_names]
+        with self._lock:
+            self._metrics["questions"] += 1
+            self._metrics["pokemon"] += len(names)
+        for index, name in enumerate(names):
+            # Battles put the first Pokémon on the near (back sprite) side
+            task = asyncio.create_task(self._warm(name, first=index == 0))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if names:
+            logger.info(f"Prefetching {names}")
+        return names
+
+    async def _warm(self, name: str, first: bool) -> None:
+        try:
+            await afetch_pokemon_data(name)
+            if self.sprites:
+                # Imported here so the API process only pays for PIL when enabled
+                from app.application.tools.utils.visualization_utils import (
+                    get_pokemon_sprite,
+                )
+
+                # The PNG sprite cache on disk is shared with the render workers
+                await asyncio.to_thread(get_pokemon_sprite, name, "default", first)
+        except Exception as e:
+            logger.warning(f"Prefetch of {name} failed: {str(e)}")
+            with self._lock:
+                self._metrics["errors"] += 1
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        Prefetch counts
+
+        Returns:
+            Questions scanned, Pokémon prefetched and failed prefetches
+        """
+        with self._lock:
+            return dict(self._metrics)
@@ -0,0 +1,219 @@
+import logging
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from app.application.tools.utils.name_extractor import (
+    NameExtractor,
+    get_name_extractor,
+    match_key,
+)
+from app.domain.settings.constants import QUERY_ROUTER_MIN_CONFIDENCE
+
+logger = logging.getLogger(__name__)
+
+# Coordinator whose queries are routed
+SUPERVISOR_AID = "supervisor@langpify.agents"
+
+# Pathways of the supervisor prompt
+GENERAL = "A"
+SINGLE_POKEMON = "B"
+COMPARISON = "C"
+BATTLE = "D"
+VISUALIZATION = "E"
+
+# Pathways the router can run without the supervisor, and the sub-agents each
+# one goes through, in order
+DIRECT_PATHWAYS = {
+    SINGLE_POKEMON: ["researcher@langpify.agents"],
+    COMPARISON: ["researcher@langpify.agents", "pokemon_expert@langpify.agents"],
+    BATTLE: ["researcher@langpify.agents", "pokemon_expert@langpify.agents"],
+}
+
+# A pair of names: "between X and Y"
+PAIR_PATTERN = r"\bbetween\b.+\band\b"
+
+# Intent rules: (pathway, pattern, confidence when the pattern matches)
+INTENT_RULES = [
+    (VISUALIZATION, r"\b(visuali[sz]e|animat\w*|gif|render|draw)\b", 0.95),
+    (BATTLE, r"\bwho (would|will|could) (win|beat)\b|\bwho wins\b", 0.95),
+    (BATTLE, r"\b(vs|versus)\b", 0.9),
+    (BATTLE, r"\b(battle|fight|beat|defeat)\b.*" + PAIR_PATTERN, 0.9),
+    (COMPARISON, r"\b(compare|comparison|difference between)\b", 0.95),
+    (
+        COMPARISON,
+        r"\b(better|stronger|weaker|faster|slower|bulkier)\b.*" + PAIR_PATTERN,
+        0.9,
+    ),
+    (SINGLE_POKEMON, r"\b(base stats?|stats?|types?|abilit(y|ies))\b", 0.9),
+    # Too vague on their own to skip the supervisor ("best team to beat
+    # Charizard and Blastoise", "can Pikachu beat Charizard in a race?")
+    (BATTLE, r"\b(battle|fight|beat|defeat|win against)\b", 0.7),
+    (COMPARISON, r"\b(better|stronger|weaker|faster|slower|bulkier)\b", 0.7),
+    (
+        SINGLE_POKEMON,
+        r"\b(tell me about|info(rmation)? (on|about)|what is|who is)\b",
+        0.7,
+    ),
+]
+
+# Confidence of a pair pattern naming other than two Pokémon
+VAGUE_CONFIDENCE = 0.7
+
+# Number of Pokémon each pathway needs (minimum, maximum)
+POKEMON_COUNTS = {
+    SINGLE_POKEMON: (1, 1),
+    COMPARISON: (2, None),
+    BATTLE: (2, 2),
+}
+
+
+class RouteDecision(NamedTuple):
+    pathway: str
+    confidence: float
+    pokemon: List[str]
+    reason: str
+
+    @property
+    def direct(self) -> bool:
+        """Whether the query can skip the supervisor"""
+        return (
+            self.pathway in DIRECT_PATHWAYS
+            and self.confidence >= QUERY_ROUTER_MIN_CONFIDENCE
+        )
+
+
+class QueryRouter:
+    """
+    Query Router
+
+    Classifies supervisor queries into the pathways of the supervisor prompt
+    with keyword rules and a Pokémon name index, so obvious requests ("who
+    would win between X and Y") go straight to the researcher and expert
+    workflows instead of paying for the supervisor's classification hop.
+    Queries with no clear intent, or a number of Pokémon that doesn't fit it,
+    fall back to the supervisor.
+    """
+
+    def __init__(self, names: Optional[Iterable[str]] = None):
+        """
+        Initialize the QueryRouter.
+
+        Args:
+            names: Canonical Pokémon names (the shared name extractor over the
+                Pokédex snapshot's names and aliases by default)
+        """
+        self._extractor = (
+            NameExtractor({name: name for name in names}) if names is not None else None
+        )
+        self._rules = [
+            (pathway, re.compile(pattern), confidence)
+            for pathway, pattern, confidence in INTENT_RULES
+        ]
+        self._pair = re.compile(PAIR_PATTERN)
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, int]] = {"decisions": {}, "direct": {}}
+        self._dispatch_errors = 0
+
+    def _name_extractor(self) -> NameExtractor:
+        if self._extractor is None:
+            self._extractor = get_name_extractor()
+        return self._extractor
+
+    def extract_pokemon(self, question: str) -> List[str]:
+        """
+        Find the Pokémon named in a question
+
+        Args:
+            question: User question
+
+        Returns:
+            Canonical names, in order of appearance and without duplicates
+        """
+        return self._name_extractor().extract(question)
+
+    def classify(self, question: str) -> RouteDecision:
+        """
+        Classify a supervisor query
+
+        Args:
+            question: User question
+
+        Returns:
+            The pathway, its confidence (0 to 1), the Pokémon found and why
+        """
+        text = match_key(question)
+        scores: Dict[str, float] = {}
+        for pathway, pattern, confidence in self._rules:
+            if pattern.search(text):
+                scores[pathway] = max(scores.get(pathway, 0.0), confidence)
+        pokemon = self.extract_pokemon(question)
+
+        if not scores:
+            return RouteDecision(GENERAL, 0.0, pokemon, "no intent rule matched")
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        # A battle is also a comparison and any named Pokémon implies its
+        # stats, so the most specific matching intent wins
+        for specific in (VISUALIZATION, BATTLE, COMPARISON):
+            if specific in scores:
+                pathway = specific
+                break
+        else:
+            pathway = ranked[0][0]
+        confidence = scores[pathway]
+
+        if pathway == BATTLE and COMPARISON in scores and len(pokemon) > 2:
+            pathway, confidence = COMPARISON, scores[COMPARISON]
+        # "Between X and Y" only vouches for a query naming exactly two Pokémon
+        if self._pair.search(text) and len(pokemon) != 2:
+            confidence = min(confidence, VAGUE_CONFIDENCE)
+
+        minimum, maximum = POKEMON_COUNTS.get(pathway, (0, None))
+        if len(pokemon) < minimum or (maximum is not None and len(pokemon) > maximum):
+            needed = str(minimum) if minimum == maximum else f"{minimum}+"
+            return RouteDecision(
+                pathway,
+                confidence * 0.5,
+                pokemon,
+                f"pathway {pathway} needs {needed} Pokémon, found {len(pokemon)}",
+            )
+        return RouteDecision(
+            pathway,
+            confidence,
+            pokemon,
+            f"matched {', '.join(p for p, _ in ranked)}",
+        )
+
+    def record(self, decision: RouteDecision, direct: bool) -> None:
+        """Count a routing decision and where the query was sent"""
+        with self._lock:
+            for key in ("decisions", "direct") if direct else ("decisions",):
+                counts = self._metrics[key]
+                counts[decision.pathway] = counts.get(decision.pathway, 0) + 1
+
+    def record_dispatch_error(self) -> None:
+        """Count a direct dispatch that failed and went to the supervisor"""
+        with self._lock:
+            self._dispatch_errors += 1
+
+    def metrics(self) -> Dict[str, object]:
+        """
+        Routing decisions and hit rate
+
+        Returns:
+            Total queries, queries answered without the supervisor, the hit
+            rate, failed direct dispatches and counts by pathway
+        """
+        with self._lock:
+            direct = sum(self._metrics["direct"].values())
+            total = sum(self._metrics["decisions"].values())
+            return {
+                "queries": total,
+                "direct": direct,
+                "supervisor": total - direct,
+                "hit_rate": direct / total if total else 0.0,
+                "dispatch_errors": self._dispatch_errors,
+                "decisions": dict(self._metrics["decisions"]),
+                "direct_by_pathway": dict(self._metrics["direct"]),
+            }
@@ -0,0 +1,859 @@
+import asyncio
+import base64
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait
+from multiprocessing.managers import BaseManager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.application.tools.utils.cache import (
+    battle_animation_key,
+    get_battle_animation_cache,
+)
+from app.application.tools.utils.pokemon_utils import (
+    afetch_pokemon_data,
+    analyze_pokemon_battle,
+)
+from app.application.tools.utils.warmup import warm_up_renderer
+from app.domain.settings.constants import (
+    BATTLE_ANIMATION_FORMAT,
+    BATTLE_ANIMATION_FORMATS,
+    RENDER_MAX_JOBS,
+    RENDER_MAX_QUEUE,
+    RENDER_SOCKET,
+    RENDER_STREAM_BUFFER,
+    RENDER_TIMEOUT,
+    RENDER_WORKERS,
+    WARMUP_ENABLED,
+)
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Environment of the API workers forked after the shared broker was started
+BROKER_ADDRESS_ENV = "RENDER_BROKER_ADDRESS"
+BROKER_AUTHKEY_ENV = "RENDER_BROKER_AUTHKEY"
+
+
+class RenderQueueFullError(Exception):
+    """Raised when the render queue is at capacity"""
+
+
+class RenderStream:
+    """
+    Frames of a streamed render
+
+    Holds a place in the render queue from the moment the stream is created.
+    The place is given back once, when the frames run out, fail, or the
+    stream is closed, so a stream that is never iterated still frees it
+    when its consumer closes it.
+    """
+
+    def __init__(
+        self,
+        events: AsyncIterator[Tuple[str, Dict[str, Any]]],
+        release: Callable[[], Awaitable[None]],
+    ):
+        self._events = events
+        self._release: Optional[Callable[[], Awaitable[None]]] = release
+
+    def __aiter__(self) -> "RenderStream":
+        return self
+
+    async def __anext__(self) -> Tuple[str, Dict[str, Any]]:
+        try:
+            return await self._events.__anext__()
+        except BaseException:
+            # The frames ran out, failed or were cancelled
+            await self._done()
+            raise
+
+    async def aclose(self) -> None:
+        """Stop the render and free its place in the queue"""
+        try:
+            await self._events.aclose()
+        finally:
+            await self._done()
+
+    async def _done(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            await release()
+
+
+def _drain(frames: Any) -> None:
+    try:
+        while True:
+            frames.get_nowait()
+    except queue.Empty:
+        pass
+
+
+def _timeout_handler(signum, frame):
+    raise TimeoutError("Render timed out")
+
+
+def render_battle_job(
+    pokemon1_data: Dict[str, Any],
+    pokemon2_data: Dict[str, Any],
+    battle_result: Dict[str, Any],
+    use_shiny: bool,
+    timeout: float,
+    output_format: str = BATTLE_ANIMATION_FORMAT,
+) -> str:
+    """
+    Render a battle animation inside a pool worker process
+
+    The worker arms SIGALRM so a stuck render frees its process instead of
+    holding it after the API has given up on the job.
+
+    Returns:
+        Path of the generated animation
+    """
+    # Imported here so the API process doesn't pay for PIL/imageio
+    from app.application.tools.utils.visualization_utils import (
+        generate_battle_animation,
+    )
+
+    alarm = hasattr(signal, "SIGALRM")
+    if alarm:
+        signal.signal(signal.SIGALRM, _timeout_handler)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return generate_battle_animation(
+            pokemon1_data,
+            pokemon2_data,
+            battle_result,
+            use_shiny=use_shiny,
+            output_format=output_format,
+        )
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def stream_battle_job(
+    pokemon1_data: Dict[str, Any],
+    pokemon2_data: Dict[str, Any],
+    battle_result: Dict[str, Any],
+    use_shiny: bool,
+    timeout: float,
+    frames: Any,
+    stop: Any,
+) -> None:
+    """
+    Render a battle frame by frame inside a pool worker process
+
+    Each frame is JPEG-encoded and put on the `frames` queue as soon as it is
+    drawn, followed by None once the battle is over. The queue is bounded, so
+    a slow client slows the render down instead of piling frames up. The API
+    sets `stop` when the client goes away, and the worker gives up after the
+    frame it is drawing.
+
+    Args:
+        frames: Queue shared with the API process
+        stop: Event shared with the API process
+    """
+    from app.application.tools.utils.animation_encoder import encode_frame
+    from app.application.tools.utils.visualization_utils import (
+        generate_battle_frames,
+    )
+
+    alarm = hasattr(signal, "SIGALRM")
+    if alarm:
+        signal.signal(signal.SIGALRM, _timeout_handler)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        for frame, duration in generate_battle_frames(
+            pokemon1_data, pokemon2_data, battle_result, use_shiny=use_shiny
+        ):
+            if stop.is_set():
+                break
+            frames.put((encode_frame(frame), duration), timeout=timeout)
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        try:
+            frames.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+
+
+class RenderBroker:
+    """
+    Render Broker
+
+    Owns the render process pool, the job table and the queue bound. Under
+    gunicorn a single broker runs in its own process, started by the master,
+    and every API worker reaches it over a Unix socket: a job submitted to one
+    worker can be polled on any other, and render capacity doesn't grow with
+    the number of request workers. Single-process servers use an in-process
+    broker.
+
+    Queued jobs and streams the API hands over late (its worker died) are
+    dropped after `timeout` plus a grace period, so they can't hold the queue.
+    """
+
+    # Extra seconds the broker waits for a worker, so the worker's own alarm fires first
+    TIMEOUT_GRACE = 5.0
+
+    def __init__(
+        self,
+        max_workers: int = RENDER_WORKERS,
+        max_queue: int = RENDER_MAX_QUEUE,
+        timeout: float = RENDER_TIMEOUT,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize the RenderBroker.
+
+        Args:
+            max_workers: Render processes (and concurrently running jobs)
+            max_queue: Maximum queued plus running jobs and streams
+            timeout: Seconds a job may render before it fails
+            executor: Executor to render on (a spawn-based process pool by default)
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = executor
+        self._manager = None
+        self._started = False
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Queued or running ids -> when the API must next hand them over or
+        # read from them (None while the broker itself is working on them)
+        self._active: Dict[str, Optional[float]] = {}
+        # Stream id -> its frame queue, stop event and worker (None while opening)
+        self._streams: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._closed: set = set()
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._lock = threading.RLock()
+        logger.info(f"Creating new instance of RenderBroker with {max_workers} workers")
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers don't inherit the broker's sockets and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=warm_up_renderer if WARMUP_ENABLED else None,
+                )
+            return self._executor
+
+    def _get_manager(self):
+        with self._lock:
+            if self._manager is None:
+                # Queues created by a manager can be handed to pool workers
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager
+
+    def start(self) -> None:
+        """
+        Start every worker process now instead of on the first renders, so
+        they are spawned and warmed up before traffic arrives
+        """
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        executor = self._get_executor()
+        # Spawned pools start one process per submission that finds no idle worker
+        for _ in range(self.max_workers):
+            executor.submit(int)
+
+    def _deadline(self) -> float:
+        return time.monotonic() + self.timeout + self.TIMEOUT_GRACE
+
+    def _reserve(self) -> str:
+        with self._lock:
+            now = time.monotonic()
+            for key, deadline in list(self._active.items()):
+                if deadline is None or deadline > now:
+                    continue
+                if key in self._jobs:
+                    self.finish(
+                        key, FAILED, error="Render job was abandoned by its API worker"
+                    )
+                else:
+                    self._active[key] = None
+                    threading.Thread(
+                        target=self.close_stream, args=(key,), daemon=True
+                    ).start()
+            if len(self._active) >= self.max_queue:
+                raise RenderQueueFullError(
+                    f"Render queue is full ({self.max_queue} jobs), retry later"
+                )
+            key = uuid.uuid4().hex
+            self._active[key] = self._deadline()
+            return key
+
+    def reserve_job(self, output_format: str = BATTLE_ANIMATION_FORMAT) -> str:
+        """
+        Queue a render job, to be handed over with run or finish
+
+        Args:
+            output_format: 'gif', 'webp' or 'apng'
+
+        Returns:
+            The job id
+
+        Raises:
+            RenderQueueFullError: If max_queue jobs are already queued or running
+        """
+        with self._lock:
+            job_id = self._reserve()
+            self._jobs[job_id] = {
+                "status": QUEUED,
+                "path": None,
+                "error": None,
+                "media_type": BATTLE_ANIMATION_FORMATS[output_format][1],
+            }
+            while len(self._jobs) > RENDER_MAX_JOBS:
+                oldest = next(iter(self._jobs))
+                if oldest in self._active:
+                    break
+                self._jobs.popitem(last=False)
+            return job_id
+
+    def run(
+        self,
+        job_id: str,
+        pokemon1_data: Dict[str, Any],
+        pokemon2_data: Dict[str, Any],
+        battle_result: Dict[str, Any],
+        use_shiny: bool,
+        output_format: str,
+    ) -> None:
+        """Render a queued job on the pool, without waiting for it"""
+        with self._lock:
+            # Abandoned, or already handed over
+            if self._active.get(job_id) is None:
+                return
+            self._active[job_id] = None
+        threading.Thread(
+            target=self._render,
+            args=(
+                job_id,
+                pokemon1_data,
+                pokemon2_data,
+                battle_result,
+                use_shiny,
+                output_format,
+            ),
+            daemon=True,
+        ).start()
+
+    def _render(
+        self,
+        job_id: str,
+        pokemon1_data: Dict[str, Any],
+        pokemon2_data: Dict[str, Any],
+        battle_result: Dict[str, Any],
+        use_shiny: bool,
+        output_format: str,
+    ) -> None:
+        try:
+            with self._slots:
+                with self._lock:
+                    self._jobs[job_id]["status"] = RUNNING
+                future = self._get_executor().submit(
+                    render_battle_job,
+                    pokemon1_data,
+                    pokemon2_data,
+                    battle_result,
+                    use_shiny,
+                    self.timeout,
+                    output_format,
+                )
+                path = future.result(timeout=self.timeout + self.TIMEOUT_GRACE)
+            self.finish(job_id, DONE, path)
+        except TimeoutError:
+            self.finish(
+                job_id, FAILED, error=f"Render timed out after {self.timeout:.0f}s"
+            )
+        except Exception as e:
+            logger.warning(f"Render job {job_id} failed: {str(e)}")
+            self.finish(job_id, FAILED, error=str(e))
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        path: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record the outcome of a job and free its place in the queue"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(status=status, path=path, error=error)
+            self._active.pop(job_id, None)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status ('queued', 'running', 'done' or 'failed'), output path,
+        error and media type of a job
+
+        Args:
+            job_id: Id returned by reserve_job
+
+        Returns:
+            A copy of the job entry, or None if it is unknown or was evicted
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def reserve_stream(self) -> str:
+        """
+        Take a place in the render queue for a stream, to be opened with
+        open_stream and given back with close_stream
+
+        Raises:
+            RenderQueueFullError: If max_queue jobs are already queued or running
+        """
+        return self._reserve()
+
+    def open_stream(
+        self,
+        stream_id: str,
+        pokemon1_data: Dict[str, Any],
+        pokemon2_data: Dict[str, Any],
+        battle_result: Dict[str, Any],
+        use_shiny: bool,
+    ) -> None:
+        """Start drawing the frames of a reserved stream once a worker is free"""
+        with self._lock:
+            if stream_id not in self._active or stream_id in self._streams:
+                raise ValueError(f"Render stream {stream_id} is closed")
+            self._active[stream_id] = None
+            self._streams[stream_id] = None
+        try:
+            self._slots.acquire()
+            try:
+                manager = self._get_manager()
+                frames = manager.Queue(RENDER_STREAM_BUFFER)
+                stop = manager.Event()
+                future = self._get_executor().submit(
+                    stream_battle_job,
+                    pokemon1_data,
+                    pokemon2_data,
+                    battle_result,
+                    use_shiny,
+                    self.timeout,
+                    frames,
+                    stop,
+                )
+            except BaseException:
+                self._slots.release()
+                raise
+        except BaseException:
+            with self._lock:
+                self._streams.pop(stream_id, None)
+                self._closed.discard(stream_id)
+                self._active.pop(stream_id, None)
+            raise
+
+        stream = {"frames": frames, "stop": stop, "future": future}
+        with self._lock:
+            closed = stream_id in self._closed
+            self._closed.discard(stream_id)
+            if closed:
+                self._streams.pop(stream_id, None)
+            else:
+                self._streams[stream_id] = stream
+                self._active[stream_id] = self._deadline()
+        if closed:
+            # The client left while the stream was waiting for a worker
+            try:
+                self._stop(stream)
+            finally:
+                with self._lock:
+                    self._active.pop(stream_id, None)
+            raise ValueError(f"Render stream {stream_id} is closed")
+
+    def next_frame(self, stream_id: str) -> Optional[Tuple[bytes, float]]:
+        """
+        Wait for the next frame of a stream
+
+        Returns:
+            The JPEG-encoded frame and its display time in milliseconds, or
+            None once the battle is over
+
+        Raises:
+            The worker's error, or TimeoutError if it stalls
+        """
+        with self._lock:
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                raise ValueError(f"Render stream {stream_id} is closed")
+            self._active[stream_id] = None
+        try:
+            item = stream["frames"].get(True, self.timeout + self.TIMEOUT_GRACE)
+        except queue.Empty:
+            raise TimeoutError(f"Render stalled for {self.timeout:.0f}s")
+        finally:
+            with self._lock:
+                if stream_id in self._active:
+                    self._active[stream_id] = self._deadline()
+        if item is None:
+            # Raises the worker's error, if any
+            stream["future"].result(timeout=self.timeout + self.TIMEOUT_GRACE)
+        return item
+
+    def close_stream(self, stream_id: str) -> None:
+        """
+        Stop a stream and give its place in the queue back, once its worker
+        has stopped. Closing a stream twice, or one never opened, is allowed.
+        """
+        with self._lock:
+            if stream_id not in self._streams:
+                self._active.pop(stream_id, None)
+                return
+            stream = self._streams[stream_id]
+            if stream is None:
+                # Still waiting for a worker; open_stream cleans up
+                self._closed.add(stream_id)
+                return
+            del self._streams[stream_id]
+        try:
+            self._stop(stream)
+        finally:
+            with self._lock:
+                self._active.pop(stream_id, None)
+
+    def _stop(self, stream: Dict[str, Any]) -> None:
+        future: Future = stream["future"]
+        try:
+            if not future.done():
+                stream["stop"].set()
+            while not future.done():
+                # Unblock a worker waiting for room in the queue
+                _drain(stream["frames"])
+                wait([future], timeout=0.1)
+            if not future.cancelled() and future.exception() is not None:
+                logger.debug(f"Stopped render stream failed: {str(future.exception())}")
+            # Wake up a reader still waiting for a frame
+            stream["frames"].put_nowait(None)
+        except queue.Full:
+            pass
+        finally:
+            self._slots.release()
+
+    def active(self) -> int:
+        """Queued and running jobs and streams"""
+        with self._lock:
+            return len(self._active)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+            self._started = False
+
+
+_broker: Optional[RenderBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_render_broker() -> RenderBroker:
+    """Get the process-wide render broker"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = RenderBroker()
+    return _broker
+
+
+class RenderBrokerManager(BaseManager):
+    """Serves the render broker to the API workers over a Unix socket"""
+
+
+RenderBrokerManager.register("broker", callable=get_render_broker)
+
+_server: Optional[RenderBrokerManager] = None
+
+
+def start_render_broker(address: str = RENDER_SOCKET) -> None:
+    """
+    Start the shared render broker in its own process and point the API
+    workers forked afterwards at it (gunicorn's master calls this)
+
+    Args:
+        address: Unix socket the broker listens on
+    """
+    global _server
+    os.makedirs(os.path.dirname(os.path.abspath(address)), exist_ok=True)
+    if os.path.exists(address):
+        os.remove(address)
+    authkey = os.urandom(32)
+    _server = RenderBrokerManager(
+        address=address, authkey=authkey, ctx=multiprocessing.get_context("spawn")
+    )
+    _server.start()
+    os.environ[BROKER_ADDRESS_ENV] = address
+    os.environ[BROKER_AUTHKEY_ENV] = authkey.hex()
+    if WARMUP_ENABLED:
+        _server.broker().start()
+    logger.info(f"Render broker listening on {address}")
+
+
+def stop_render_broker() -> None:
+    """Stop the shared render broker and its worker processes"""
+    global _server
+    if _server is None:
+        return
+    try:
+        _server.broker().shutdown()
+    finally:
+        _server.shutdown()
+        _server = None
+        os.environ.pop(BROKER_ADDRESS_ENV, None)
+        os.environ.pop(BROKER_AUTHKEY_ENV, None)
+
+
+def connect_render_broker() -> Optional[Any]:
+    """Proxy of the shared render broker, if one was started for this server"""
+    address = os.environ.get(BROKER_ADDRESS_ENV)
+    if not address:
+        return None
+    manager = RenderBrokerManager(
+        address=address, authkey=bytes.fromhex(os.environ[BROKER_AUTHKEY_ENV])
+    )
+    manager.connect()
+    return manager.broker()
+
+
+class RenderService:
+    """
+    Render Service
+
+    Renders battle animations on the render broker's process pool so CPU-bound
+    PIL work never runs on an API worker's event loop. Jobs get their own ids,
+    wait in a bounded queue shared by every API worker (submissions beyond it
+    are rejected so the route can answer 429) and fail after a per-job timeout.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = RENDER_WORKERS,
+        max_queue: int = RENDER_MAX_QUEUE,
+        timeout: float = RENDER_TIMEOUT,
+        executor: Optional[Executor] = None,
+        broker: Optional[Any] = None,
+    ):
+        """
+        Initialize the RenderService.
+
+        Args:
+            max_workers: Render processes of an in-process broker
+            max_queue: Maximum queued plus running jobs of an in-process broker
+            timeout: Seconds a job may render before it fails
+            executor: Executor an in-process broker renders on
+            broker: Broker to render on (the shared one when gunicorn's master
+                started it, an in-process one otherwise)
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = executor
+        self._broker = broker
+        self._tasks: set = set()
+
+    def _get_broker(self) -> Any:
+        if self._broker is None:
+            self._broker = connect_render_broker() or RenderBroker(
+                self.max_workers, self.max_queue, self.timeout, self._executor
+            )
+        return self._broker
+
+    def start(self) -> None:
+        """
+        Start every worker process now instead of on the first renders, so
+        they are spawned and warmed up before traffic arrives
+        """
+        self._get_broker().start()
+
+    async def _battle(
+        self, pokemon1: str, pokemon2: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        data1, data2 = await asyncio.gather(
+            afetch_pokemon_data(pokemon1), afetch_pokemon_data(pokemon2)
+        )
+        for data in (data1, data2):
+            if "error" in data:
+                raise ValueError(data["error"])
+        winner, reasoning = analyze_pokemon_battle(data1, data2)
+        return data1, data2, {"winner": winner, "reasoning": reasoning}
+
+    def submit(
+        self,
+        pokemon1: str,
+        pokemon2: str,
+        use_shiny: bool = False,
+        output_format: str = BATTLE_ANIMATION_FORMAT,
+    ) -> str:
+        """
+        Queue a battle render.
+
+        Args:
+            pokemon1: First Pokémon name
+            pokemon2: Second Pokémon name
+            use_shiny: Whether to use shiny sprites
+            output_format: 'gif', 'webp' or 'apng'
+
+        Returns:
+            The job id
+
+        Raises:
+            RenderQueueFullError: If max_queue jobs are already queued or running
+        """
+        job_id = self._get_broker().reserve_job(output_format)
+        task = asyncio.create_task(
+            self._run(job_id, pokemon1, pokemon2, use_shiny, output_format)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job_id
+
+    async def _run(
+        self,
+        job_id: str,
+        pokemon1: str,
+        pokemon2: str,
+        use_shiny: bool,
+        output_format: str,
+    ) -> None:
+        broker = self._get_broker()
+        loop = asyncio.get_running_loop()
+        try:
+            data1, data2, battle_result = await self._battle(pokemon1, pokemon2)
+
+            # Battles rendered before are a file lookup, no worker needed
+            path = get_battle_animation_cache(output_format).get(
+                battle_animation_key(
+                    data1["name"],
+                    data2["name"],
+                    battle_result["winner"],
+                    battle_result["reasoning"],
+                    use_shiny,
+                )
+            )
+            if path is not None:
+                await loop.run_in_executor(None, broker.finish, job_id, DONE, path)
+                return
+
+            await loop.run_in_executor(
+                None,
+                broker.run,
+                job_id,
+                data1,
+                data2,
+                battle_result,
+                use_shiny,
+                output_format,
+            )
+        except Exception as e:
+            logger.warning(f"Render job {job_id} failed: {str(e)}")
+            await loop.run_in_executor(
+                None, broker.finish, job_id, FAILED, None, str(e)
+            )
+
+    def stream(
+        self, pokemon1: str, pokemon2: str, use_shiny: bool = False
+    ) -> RenderStream:
+        """
+        Render a battle and stream its frames as soon as each one is drawn.
+
+        Streams take a place in the render queue like jobs do, until they
+        end or are closed; callers must close streams they stop iterating.
+
+        Args:
+            pokemon1: First Pokémon name
+            pokemon2: Second Pokémon name
+            use_shiny: Whether to use shiny sprites
+
+        Returns:
+            RenderStream of (event, data) pairs: 'frame' with the frame index,
+            its display time in milliseconds and a JPEG data URL, then 'done'
+            with the battle result
+
+        Raises:
+            RenderQueueFullError: If max_queue jobs are already queued or running
+        """
+        broker = self._get_broker()
+        stream_id = broker.reserve_stream()
+
+        async def release() -> None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, broker.close_stream, stream_id)
+
+        return RenderStream(
+            self._stream(broker, stream_id, pokemon1, pokemon2, use_shiny), release
+        )
+
+    async def _stream(
+        self,
+        broker: Any,
+        stream_id: str,
+        pokemon1: str,
+        pokemon2: str,
+        use_shiny: bool,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        data1, data2, battle_result = await self._battle(pokemon1, pokemon2)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, broker.open_stream, stream_id, data1, data2, battle_result, use_shiny
+        )
+
+        index = 0
+        while True:
+            item = await loop.run_in_executor(None, broker.next_frame, stream_id)
+            if item is None:
+                break
+            image, duration = item
+            yield "frame", {
+                "index": index,
+                "duration": duration,
+                "image": "data:image/jpeg;base64," + base64.b64encode(image).decode(),
+            }
+            index += 1
+
+        yield "done", battle_result
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status ('queued', 'running', 'done' or 'failed'), output path,
+        error and media type of a job
+
+        Args:
+            job_id: Id returned by submit
+
+        Returns:
+            The job entry, or None if it is unknown or was evicted
+        """
+        return self._get_broker().get_job(job_id)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes of an in-process broker"""
+        # The shared broker belongs to gunicorn's master
+        if isinstance(self._broker, RenderBroker):
+            self._broker.shutdown()
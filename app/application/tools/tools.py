@@ -1,12 +1,17 @@
 from app.application.tools.utils.pokemon_utils import (
+    afetch_pokemon_data,
     fetch_pokemon_data,
     analyze_pokemon_battle,
 )
-from typing import Dict, Any, Tuple
+from app.application.tools.utils.name_resolver import canonical_key
+from app.domain.settings.constants import POKEAPI_MAX_CONCURRENCY
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
 from langchain.prompts import PromptTemplate
 from langchain_groq import ChatGroq
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+import asyncio
 import os
 
 
@@ -103,3 +108,70 @@ def fetch_pokemon_info(pokemon_name: str) -> Dict[str, Any]:
         return fetch_pokemon_data(pokemon_name.lower())
     except Exception as e:
         return {"error": str(e)}
+
+
+async def afetch_pokemon_info(pokemon_name: str) -> Dict[str, Any]:
+    """
+    Fetch information about a specific Pokémon from the PokéAPI
+
+    Args:
+        pokemon_name: Name of the Pokémon (case-insensitive)
+
+    Returns:
+        Dictionary containing Pokémon data
+    """
+    try:
+        return await afetch_pokemon_data(pokemon_name.lower())
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _unique_names(pokemon_names: List[str]) -> List[str]:
+    # Names are compared the way the fetchers normalize them, keeping the first spelling
+    unique: Dict[str, str] = {}
+    for name in pokemon_names:
+        unique.setdefault(canonical_key(name), name)
+    return list(unique.values())
+
+
+def _batch_record(name: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    # Errors carry the requested name so the caller knows which one failed
+    if "error" in record:
+        return {"name": name, **record}
+    return record
+
+
+def fetch_pokemon_infos(pokemon_names: List[str]) -> List[Dict[str, Any]]:
+    """
+    Fetch information about several Pokémon from the PokéAPI at once
+
+    Args:
+        pokemon_names: Names of the Pokémon (case-insensitive)
+
+    Returns:
+        One dictionary of Pokémon data per distinct name, in request order
+    """
+    names = _unique_names(pokemon_names)
+    if not names:
+        return []
+    with ThreadPoolExecutor(
+        max_workers=min(len(names), POKEAPI_MAX_CONCURRENCY)
+    ) as executor:
+        records = list(executor.map(fetch_pokemon_info, names))
+    return [_batch_record(name, record) for name, record in zip(names, records)]
+
+
+async def afetch_pokemon_infos(pokemon_names: List[str]) -> List[Dict[str, Any]]:
+    """
+    Fetch information about several Pokémon from the PokéAPI at once
+
+    Args:
+        pokemon_names: Names of the Pokémon (case-insensitive)
+
+    Returns:
+        One dictionary of Pokémon data per distinct name, in request order
+    """
+    names = _unique_names(pokemon_names)
+    # Cached names return at once; the others share the PokéAPI client's pool
+    records = await asyncio.gather(*(afetch_pokemon_info(name) for name in names))
+    return [_batch_record(name, record) for name, record in zip(names, records)]
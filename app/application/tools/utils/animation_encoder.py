@@ -0,0 +1,168 @@
+"""
+Animation encoder for battle renders.
+
+Consecutive identical frames are collapsed into one longer frame. GIFs share a
+single palette computed once per animation (instead of quantizing every frame
+on its own), and each frame after the first only stores the rectangle that
+changed, with unchanged pixels inside it left transparent so they compress to
+almost nothing. Animated WebP and APNG are available for clients that support
+them.
+"""
+
+import io
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, features
+
+from app.domain.settings.constants import BATTLE_ANIMATION_FORMATS
+
+# Every Nth row and column of each frame is sampled to build the GIF palette
+PALETTE_SAMPLE_STEP = 4
+
+# JPEG quality of frames streamed one by one
+FRAME_QUALITY = 85
+
+# Palette index of unchanged pixels in GIF delta frames, never used by a color
+TRANSPARENT_INDEX = 255
+
+
+def collapse_frames(
+    frames: Sequence[Image.Image], durations: Sequence[float]
+) -> Tuple[List[Image.Image], List[float]]:
+    """
+    Merge runs of identical consecutive frames into one frame
+
+    Args:
+        frames: Frames of the animation
+        durations: Display time of each frame, in milliseconds
+
+    Returns:
+        Tuple of (frames, durations) without consecutive duplicates
+    """
+    unique: List[Image.Image] = []
+    unique_durations: List[float] = []
+    previous = None
+    for frame, duration in zip(frames, durations):
+        pixels = np.asarray(frame)
+        if previous is not None and np.array_equal(pixels, previous):
+            unique_durations[-1] += duration
+            continue
+        unique.append(frame)
+        unique_durations.append(duration)
+        previous = pixels
+    return unique, unique_durations
+
+
+def shared_palette(frames: Sequence[Image.Image]) -> Image.Image:
+    """
+    Compute one palette for every frame of an animation
+
+    Index TRANSPARENT_INDEX is left free to mark unchanged pixels.
+
+    Args:
+        frames: RGB frames
+
+    Returns:
+        A 'P' image holding the palette, to pass to Image.quantize
+    """
+    sample = np.concatenate(
+        [
+            np.asarray(frame)[::PALETTE_SAMPLE_STEP, ::PALETTE_SAMPLE_STEP]
+            for frame in frames
+        ]
+    )
+    palette = Image.fromarray(sample).quantize(
+        colors=TRANSPARENT_INDEX, method=Image.Quantize.FASTOCTREE
+    )
+    # Pad to 256 entries; the last one repeats the first so nearest-color
+    # lookups (which keep the first match) never pick it
+    colors = palette.getpalette()
+    colors += colors[:3] * (256 - len(colors) // 3)
+    palette.putpalette(colors)
+    return palette
+
+
+def encode_animation(
+    frames: Sequence[Image.Image],
+    durations: Sequence[float],
+    path: str,
+    output_format: str = "gif",
+) -> str:
+    """
+    Encode frames as a looping animation
+
+    Args:
+        frames: Frames of the animation
+        durations: Display time of each frame, in milliseconds
+        path: Destination file
+        output_format: 'gif', 'webp' or 'apng'
+
+    Returns:
+        The path
+    """
+    if output_format not in BATTLE_ANIMATION_FORMATS:
+        raise ValueError(f"Unknown animation format: {output_format}")
+    if output_format == "webp" and not features.check("webp"):
+        raise ValueError("Animated WebP is not supported by this Pillow build")
+
+    frames, durations = collapse_frames(
+        [frame.convert("RGB") for frame in frames], durations
+    )
+    durations = [int(round(duration)) for duration in durations]
+
+    if output_format == "gif":
+        palette = shared_palette(frames)
+        frames = [
+            frame.quantize(palette=palette, dither=Image.Dither.NONE)
+            for frame in frames
+        ]
+        # disposal=1 keeps the previous frame: Pillow then writes only the
+        # rectangle that changed, with unchanged pixels set to TRANSPARENT_INDEX
+        frames[0].save(
+            path,
+            format="GIF",
+            save_all=True,
+            append_images=frames[1:],
+            duration=durations,
+            loop=0,
+            disposal=1,
+            transparency=TRANSPARENT_INDEX,
+            optimize=True,
+        )
+    elif output_format == "webp":
+        frames[0].save(
+            path,
+            format="WEBP",
+            save_all=True,
+            append_images=frames[1:],
+            duration=durations,
+            loop=0,
+            quality=80,
+            method=4,
+        )
+    else:
+        frames[0].save(
+            path,
+            format="PNG",
+            save_all=True,
+            append_images=frames[1:],
+            duration=durations,
+            loop=0,
+        )
+    return path
+
+
+def encode_frame(frame: Image.Image) -> bytes:
+    """
+    Encode a single frame for streaming
+
+    Args:
+        frame: Frame of the animation
+
+    Returns:
+        The frame as JPEG bytes
+    """
+    buffer = io.BytesIO()
+    frame.convert("RGB").save(buffer, format="JPEG", quality=FRAME_QUALITY)
+    return buffer.getvalue()
@@ -0,0 +1,650 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.domain.settings.constants import (
+    AGENT_CACHE_DIR,
+    AGENT_CACHE_DISK,
+    AGENT_CACHE_MAX_DISK_MB,
+    AGENT_CACHE_MAX_ENTRIES,
+    AGENT_CACHE_TTL,
+    BATTLE_NARRATION_DIR,
+    BATTLE_NARRATION_MAX_DISK_MB,
+    BATTLE_NARRATION_TTL,
+    BATTLE_ANIMATION_CACHE_DIR,
+    BATTLE_ANIMATION_CACHE_MAX_DISK_MB,
+    BATTLE_ANIMATION_FORMATS,
+    POKEAPI_CACHE_DIR,
+    POKEAPI_CACHE_MAX_DISK_MB,
+    POKEAPI_CACHE_MAX_ENTRIES,
+    POKEAPI_CACHE_STALE_TTL,
+    POKEAPI_CACHE_TTL,
+    POKEAPI_NEGATIVE_CACHE_MAX_ENTRIES,
+    POKEAPI_NEGATIVE_CACHE_TTL,
+    POKEAPI_NEGATIVE_CIRCUIT_MISSES,
+    POKEAPI_NEGATIVE_CIRCUIT_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+# Background refreshes for sync callers (the async path uses tasks instead)
+_revalidation_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="cache-revalidate"
+)
+
+
+def enforce_directory_budget(
+    directory: str, max_bytes: int, suffix: str, target_ratio: float = 0.9
+) -> Tuple[int, int]:
+    """
+    Delete the least recently used files of a directory until it fits its budget
+
+    Recency is the file mtime, so readers should touch files on hit.
+
+    Args:
+        directory: Directory to trim
+        max_bytes: Size budget for the matching files
+        suffix: Only files ending with this suffix are considered
+        target_ratio: Fraction of the budget to trim down to once it's exceeded
+
+    Returns:
+        Tuple of (bytes remaining, files evicted)
+    """
+    entries = []
+    total = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(suffix):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+    except FileNotFoundError:
+        return 0, 0
+
+    if total <= max_bytes:
+        return total, 0
+
+    evicted = 0
+    target = int(max_bytes * target_ratio)
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            evicted += 1
+        except FileNotFoundError:
+            total -= size
+    return total, evicted
+
+
+def _file_size(path: str) -> int:
+    """Size of a file, or 0 if it doesn't exist"""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+class TwoTierCache:
+    """
+    Bounded in-process LRU in front of a size-capped disk tier.
+
+    Entries are fresh for `ttl` seconds and may then be served stale for
+    `stale_ttl` more seconds while a single background refresh runs
+    (stale-while-revalidate). Disk writes are atomic, so concurrent gunicorn
+    workers sharing the directory never read partial files.
+
+    Keys known not to exist upstream can be remembered in a separate, bounded
+    in-process negative tier for `negative_ttl` seconds. A key missed
+    `circuit_misses` times in a row is held for `circuit_ttl` seconds instead
+    (its circuit is open), then a single lookup is let through to check again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        directory: Optional[str],
+        max_entries: int = 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        ttl: float = 7 * 24 * 3600,
+        stale_ttl: float = 30 * 24 * 3600,
+        negative_ttl: float = 0.0,
+        max_negative_entries: int = 1024,
+        circuit_misses: int = 3,
+        circuit_ttl: float = 3600.0,
+    ):
+        self.name = name
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_negative_entries = max_negative_entries
+        self.circuit_misses = circuit_misses
+        self.circuit_ttl = circuit_ttl
+        self._suffix = ".json"
+
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._revalidating: set = set()
+        self._tasks: set = set()
+        self._stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "expirations": 0,
+            "revalidations": 0,
+        }
+        self._disk_bytes = 0
+
+        # Key -> (expires at, consecutive misses)
+        self._negative: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._negative_stats: Dict[str, int] = {
+            "hits": 0,
+            "writes": 0,
+            "evictions": 0,
+            "circuit_opens": 0,
+        }
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes, _ = enforce_directory_budget(
+                directory, max_disk_bytes, self._suffix
+            )
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self._suffix}")
+
+    def _state(self, stored_at: float) -> str:
+        age = time.time() - stored_at
+        if age <= self.ttl:
+            return FRESH
+        if age <= self.ttl + self.stale_ttl:
+            return STALE
+        return MISS
+
+    def _remember(self, key: str, stored_at: float, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = (stored_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats["memory_evictions"] += 1
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Any]]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                envelope = json.load(f)
+            # Touch the file so the disk tier evicts by recency of use
+            os.utime(path, None)
+            return envelope["stored_at"], envelope["value"]
+        except (FileNotFoundError, KeyError, TypeError, ValueError, EOFError):
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable cache file {path}: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, stored_at: float, value: Any) -> None:
+        if not self.directory:
+            return
+        envelope = {"stored_at": stored_at, "value": value}
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(envelope, f, separators=(",", ":"))
+            size = os.path.getsize(tmp_path)
+            # An overwritten entry gives its bytes back to the budget
+            replaced = _file_size(self._path(key))
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            logger.debug(f"Could not write cache entry {key}: {str(e)}")
+            return
+
+        with self._lock:
+            self._disk_bytes += size - replaced
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            remaining, evicted = enforce_directory_budget(
+                self.directory, self.max_disk_bytes, self._suffix
+            )
+            with self._lock:
+                self._disk_bytes = remaining
+                self._stats["disk_evictions"] += evicted
+
+    def lookup(self, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Look a key up in both tiers
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, state) where state is 'fresh', 'stale' or 'miss'
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        tier = "memory_hits"
+
+        if entry is None:
+            entry = self._read_disk(key)
+            tier = "disk_hits"
+            if entry is not None:
+                self._remember(key, entry[0], entry[1])
+
+        if entry is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None, MISS
+
+        state = self._state(entry[0])
+        with self._lock:
+            if state == FRESH:
+                self._stats[tier] += 1
+            elif state == STALE:
+                self._stats["stale_hits"] += 1
+            else:
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                self._memory.pop(key, None)
+        return (entry[1], state) if state != MISS else (None, MISS)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a fresh or stale value, or None"""
+        value, _ = self.lookup(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in both tiers"""
+        stored_at = time.time()
+        self._remember(key, stored_at, value)
+        self._write_disk(key, stored_at, value)
+        with self._lock:
+            self._stats["writes"] += 1
+            self._negative.pop(key, None)
+
+    def is_missing(self, key: str) -> bool:
+        """Whether a key is remembered as not existing upstream"""
+        with self._lock:
+            entry = self._negative.get(key)
+            if entry is None or entry[0] < time.time():
+                return False
+            self._negative.move_to_end(key)
+            self._negative_stats["hits"] += 1
+            return True
+
+    def set_missing(self, key: str) -> None:
+        """
+        Remember that a key doesn't exist upstream (no-op without a negative TTL)
+
+        Args:
+            key: Cache key
+        """
+        if self.negative_ttl <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            expires_at, misses = self._negative.pop(key, (now, 0))
+            # Misses older than a circuit period are forgotten
+            if now - expires_at > self.circuit_ttl:
+                misses = 0
+            misses += 1
+            ttl = self.negative_ttl
+            if misses >= self.circuit_misses:
+                ttl = self.circuit_ttl
+                self._negative_stats["circuit_opens"] += 1
+            self._negative[key] = (now + ttl, misses)
+            self._negative_stats["writes"] += 1
+            while len(self._negative) > self.max_negative_entries:
+                self._negative.popitem(last=False)
+                self._negative_stats["evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        """Remove a key from both tiers"""
+        with self._lock:
+            self._memory.pop(key, None)
+            self._negative.pop(key, None)
+        if self.directory:
+            size = _file_size(self._path(key))
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                return
+            with self._lock:
+                self._disk_bytes -= size
+
+    def clear_memory(self) -> None:
+        """Drop the in-process tier (the disk tier is kept)"""
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current tier sizes"""
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def negative_stats(self) -> Dict[str, int]:
+        """Negative tier counters, current entries and open circuits"""
+        now = time.time()
+        with self._lock:
+            return {
+                **self._negative_stats,
+                "entries": len(self._negative),
+                "open_circuits": sum(
+                    1
+                    for expires_at, misses in self._negative.values()
+                    if misses >= self.circuit_misses and expires_at >= now
+                ),
+            }
+
+    def _claim_revalidation(self, key: str) -> bool:
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            self._stats["revalidations"] += 1
+            return True
+
+    def _release_revalidation(self, key: str) -> None:
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def get_or_fetch(
+        self, key: str, fetch: Callable[[], Optional[Any]]
+    ) -> Optional[Any]:
+        """
+        Get a value, calling `fetch` on a miss and in the background when stale
+
+        Args:
+            key: Cache key
+            fetch: Callable returning the value, or None to skip caching
+
+        Returns:
+            Cached or fetched value
+        """
+        value, state = self.lookup(key)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            if self._claim_revalidation(key):
+
+                def revalidate():
+                    try:
+                        fresh = fetch()
+                        if fresh is not None:
+                            self.set(key, fresh)
+                    except Exception as e:
+                        logger.warning(f"Revalidation of {key} failed: {str(e)}")
+                    finally:
+                        self._release_revalidation(key)
+
+                _revalidation_executor.submit(revalidate)
+            return value
+
+        value = fetch()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    async def aget_or_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        """
+        Async version of get_or_fetch; stale refreshes run as event loop tasks
+
+        Args:
+            key: Cache key
+            fetch: Coroutine function returning the value, or None to skip caching
+
+        Returns:
+            Cached or fetched value
+        """
+        value, state = self.lookup(key)
+        if state == FRESH:
+            return value
+        if state == STALE:
+            if self._claim_revalidation(key):
+
+                async def revalidate():
+                    try:
+                        fresh = await fetch()
+                        if fresh is not None:
+                            self.set(key, fresh)
+                    except Exception as e:
+                        logger.warning(f"Revalidation of {key} failed: {str(e)}")
+                    finally:
+                        self._release_revalidation(key)
+
+                task = asyncio.create_task(revalidate())
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return value
+
+        value = await fetch()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+
+class FileCache:
+    """
+    Size-capped directory of files addressed by key, e.g. rendered GIFs.
+
+    Hits touch the file so `enforce_directory_budget` evicts the least
+    recently used ones, and files are written to a temporary name then
+    renamed, so readers never see a partial file.
+    """
+
+    def __init__(self, directory: str, max_disk_bytes: int, suffix: str):
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.suffix = suffix
+
+    def path(self, key: str) -> str:
+        """Path of the file of a key"""
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get the path of a cached file
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The path, or None if the file is not cached
+        """
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, write: Callable[[str], None]) -> str:
+        """
+        Create the file of a key
+
+        Args:
+            key: Cache key
+            write: Writes the content to the path it is given
+
+        Returns:
+            The path of the cached file
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, self.path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        enforce_directory_budget(self.directory, self.max_disk_bytes, self.suffix)
+        return self.path(key)
+
+
+_pokeapi_cache: Optional[TwoTierCache] = None
+_pokeapi_cache_lock = threading.Lock()
+
+
+def get_pokeapi_cache() -> TwoTierCache:
+    """Get the process-wide cache for PokéAPI JSON responses"""
+    global _pokeapi_cache
+    if _pokeapi_cache is None:
+        with _pokeapi_cache_lock:
+            if _pokeapi_cache is None:
+                _pokeapi_cache = TwoTierCache(
+                    name="pokeapi",
+                    directory=POKEAPI_CACHE_DIR,
+                    max_entries=POKEAPI_CACHE_MAX_ENTRIES,
+                    max_disk_bytes=POKEAPI_CACHE_MAX_DISK_MB * 1024 * 1024,
+                    ttl=POKEAPI_CACHE_TTL,
+                    stale_ttl=POKEAPI_CACHE_STALE_TTL,
+                    negative_ttl=POKEAPI_NEGATIVE_CACHE_TTL,
+                    max_negative_entries=POKEAPI_NEGATIVE_CACHE_MAX_ENTRIES,
+                    circuit_misses=POKEAPI_NEGATIVE_CIRCUIT_MISSES,
+                    circuit_ttl=POKEAPI_NEGATIVE_CIRCUIT_TTL,
+                )
+    return _pokeapi_cache
+
+
+_agent_cache: Optional[TwoTierCache] = None
+_agent_cache_lock = threading.Lock()
+
+
+def get_agent_response_cache() -> TwoTierCache:
+    """Get the process-wide cache for agent workflow results"""
+    global _agent_cache
+    if _agent_cache is None:
+        with _agent_cache_lock:
+            if _agent_cache is None:
+                # Holds JSON copies of the final states (see AgentManagementService).
+                # Stale answers are never served: refreshing one costs LLM calls
+                _agent_cache = TwoTierCache(
+                    name="agents",
+                    directory=AGENT_CACHE_DIR if AGENT_CACHE_DISK else None,
+                    max_entries=AGENT_CACHE_MAX_ENTRIES,
+                    max_disk_bytes=AGENT_CACHE_MAX_DISK_MB * 1024 * 1024,
+                    ttl=AGENT_CACHE_TTL,
+                    stale_ttl=0,
+                )
+    return _agent_cache
+
+
+_narration_cache: Optional[TwoTierCache] = None
+_narration_cache_lock = threading.Lock()
+
+
+def get_narration_cache() -> TwoTierCache:
+    """Get the process-wide store of battle narrations"""
+    global _narration_cache
+    if _narration_cache is None:
+        with _narration_cache_lock:
+            if _narration_cache is None:
+                # Disk only: a narration started on one worker is finished
+                # there and polled on any other, so memory copies would go stale
+                _narration_cache = TwoTierCache(
+                    name="narrations",
+                    directory=BATTLE_NARRATION_DIR,
+                    max_entries=0,
+                    max_disk_bytes=BATTLE_NARRATION_MAX_DISK_MB * 1024 * 1024,
+                    ttl=BATTLE_NARRATION_TTL,
+                    stale_ttl=0,
+                )
+    return _narration_cache
+
+
+# Bump when the rendering changes, so GIFs rendered before are not served
+BATTLE_ANIMATION_VERSION = 2
+
+
+def battle_animation_key(
+    pokemon1: str, pokemon2: str, winner: str, reasoning: str, use_shiny: bool
+) -> str:
+    """
+    Content address of a battle GIF
+
+    The renderer seeds its randomness (sprite variants, decorations, messages,
+    damage) from this key, so equal keys always render the same GIF.
+
+    Args:
+        pokemon1: First Pokémon name
+        pokemon2: Second Pokémon name
+        winner: Winner of the battle
+        reasoning: Reasoning shown on the last frame
+        use_shiny: Whether shiny sprites are used
+
+    Returns:
+        Hex digest of the battle
+    """
+    raw = json.dumps(
+        [
+            BATTLE_ANIMATION_VERSION,
+            pokemon1.lower(),
+            pokemon2.lower(),
+            winner.lower(),
+            reasoning,
+            use_shiny,
+        ]
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+_battle_animation_caches: Dict[str, FileCache] = {}
+_battle_animation_cache_lock = threading.Lock()
+
+
+def get_battle_animation_cache(output_format: str = "gif") -> FileCache:
+    """
+    Get the process-wide cache of rendered battle animations of a format
+
+    Args:
+        output_format: 'gif', 'webp' or 'apng', each cached in its own directory
+
+    Returns:
+        The cache
+    """
+    if output_format not in BATTLE_ANIMATION_FORMATS:
+        raise ValueError(f"Unknown animation format: {output_format}")
+    cache = _battle_animation_caches.get(output_format)
+    if cache is None:
+        with _battle_animation_cache_lock:
+            cache = _battle_animation_caches.get(output_format)
+            if cache is None:
+                cache = FileCache(
+                    directory=os.path.join(BATTLE_ANIMATION_CACHE_DIR, output_format),
+                    max_disk_bytes=BATTLE_ANIMATION_CACHE_MAX_DISK_MB * 1024 * 1024,
+                    suffix=BATTLE_ANIMATION_FORMATS[output_format][0],
+                )
+                _battle_animation_caches[output_format] = cache
+    return cache
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Best Counters Index
+
+Scores every Pokémon of the offline Pokédex against every other one with the
+matchup engine (same rules as `analyze_pokemon_battle`) and keeps, for each
+species, the top-K attackers that beat it by the widest margin. The index is a
+small .npz file that is loaded once and kept in memory, so "what beats X?" is
+a dictionary lookup plus an array slice.
+
+Usage:
+    python -m app.application.tools.utils.counters_index build
+
+    or
+
+    python -m app.application.tools.utils.counters_index build --output data/counters.npz --top-k 20
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.application.tools.utils.matchup_engine import (
+    Roster,
+    analyze_matchups,
+    encode_pokedex,
+)
+from app.application.tools.utils.pokedex import (
+    PokedexStore,
+    get_pokedex,
+    normalize_key,
+)
+from app.domain.settings.constants import (
+    COUNTERS_TOP_K,
+    PATH_COUNTERS_INDEX,
+    PATH_POKEDEX,
+)
+
+logger = logging.getLogger(__name__)
+
+# Defenders scored per pass, bounds the NxM matrices to N x 256
+DEFENDER_CHUNK = 256
+
+
+def build_counters(
+    roster: Roster, top_k: int = COUNTERS_TOP_K
+) -> Dict[str, np.ndarray]:
+    """
+    Compute the top-K counters of every Pokémon of a roster
+
+    Args:
+        roster: Encoded Pokémon (attackers and defenders)
+        top_k: Number of counters kept per Pokémon
+
+    Returns:
+        Arrays 'names', 'counters' (indices into names, -1 when there are fewer
+        than K counters), 'margins', 'attacker_turns' and 'defender_turns'
+    """
+    n = len(roster.names)
+    k = min(top_k, max(n - 1, 0))
+    counters = np.full((n, k), -1, dtype=np.int32)
+    margins = np.zeros((n, k), dtype=np.float32)
+    attacker_turns = np.zeros((n, k), dtype=np.float32)
+    defender_turns = np.zeros((n, k), dtype=np.float32)
+
+    for start in range(0, n, DEFENDER_CHUNK):
+        stop = min(start + DEFENDER_CHUNK, n)
+        defenders = Roster(
+            names=roster.names[start:stop],
+            stats=roster.stats[start:stop],
+            attack_rows=roster.attack_rows[start:stop],
+            combos=roster.combos[start:stop],
+        )
+        matrices = analyze_matchups(roster, defenders)
+        if k == 0:
+            continue
+
+        # Rows are defenders; only attackers that win count, widest margin first
+        score = np.where(matrices["attacker_wins"], matrices["margin"], -np.inf).T
+        top = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        order = np.argsort(
+            -np.take_along_axis(score, top, axis=1), axis=1, kind="stable"
+        )
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(score, top, axis=1)
+        wins = np.isfinite(top_scores)
+
+        counters[start:stop] = np.where(wins, top, -1)
+        margins[start:stop] = np.where(wins, top_scores, 0)
+        attacker_turns[start:stop] = np.where(
+            wins, np.take_along_axis(matrices["attacker_turns"].T, top, axis=1), 0
+        )
+        defender_turns[start:stop] = np.where(
+            wins, np.take_along_axis(matrices["defender_turns"].T, top, axis=1), 0
+        )
+
+    return {
+        "names": np.array(roster.names, dtype=str),
+        "counters": counters,
+        "margins": margins,
+        "attacker_turns": attacker_turns,
+        "defender_turns": defender_turns,
+    }
+
+
+def write_counters(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """Write a counters index atomically"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class CountersIndex:
+    """
+    In-memory view over a counters index.
+
+    Answers are materialized per Pokémon on first use, so repeated queries
+    return the same list without touching the arrays again.
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, store: Optional[PokedexStore] = None
+    ):
+        self.path = path
+        self._store = store
+        self._names: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._answers: Dict[int, List[Dict[str, Any]]] = {}
+
+        if path and os.path.exists(path):
+            with np.load(path) as data:
+                self._arrays = {key: data[key] for key in data.files}
+            self._names = [str(name) for name in self._arrays["names"]]
+            self._index = {name: i for i, name in enumerate(self._names)}
+            logger.info(f"Counters index loaded: {len(self._names)} Pokémon")
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def resolve(self, pokemon: str) -> Optional[str]:
+        """Resolve a name, national dex id or alias to a name of the index"""
+        key = normalize_key(pokemon)
+        if key in self._index:
+            return key
+        store = self._store if self._store is not None else get_pokedex()
+        pokemon_id = store.resolve_id(key)
+        if pokemon_id is None:
+            return None
+        name = store.get_pokemon(pokemon_id)["name"]
+        return name if name in self._index else None
+
+    def counters(
+        self, pokemon: str, limit: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Best counters of a Pokémon, widest winning margin first
+
+        Args:
+            pokemon: Name, national dex id or alias
+            limit: Optional maximum number of counters
+
+        Returns:
+            List of counters, or None if the Pokémon is not in the index
+        """
+        name = self.resolve(pokemon)
+        if name is None:
+            return None
+        i = self._index[name]
+        answer = self._answers.get(i)
+        if answer is None:
+            answer = [
+                {
+                    "name": self._names[j],
+                    "margin": round(float(margin), 3),
+                    "turns_to_win": round(float(attacker_turns), 3),
+                    "opponent_turns_to_win": round(float(defender_turns), 3),
+                }
+                for j, margin, attacker_turns, defender_turns in zip(
+                    self._arrays["counters"][i],
+                    self._arrays["margins"][i],
+                    self._arrays["attacker_turns"][i],
+                    self._arrays["defender_turns"][i],
+                )
+                if j >= 0
+            ]
+            self._answers[i] = answer
+        return answer[:limit] if limit is not None else answer
+
+
+def build_counters_index(
+    path: str = PATH_COUNTERS_INDEX,
+    pokedex_path: str = PATH_POKEDEX,
+    top_k: int = COUNTERS_TOP_K,
+) -> int:
+    """
+    Build the counters index from the offline Pokédex
+
+    Args:
+        path: Destination .npz file
+        pokedex_path: Pokédex snapshot to read
+        top_k: Number of counters kept per Pokémon
+
+    Returns:
+        Number of Pokémon indexed
+    """
+    store = PokedexStore(pokedex_path)
+    if len(store) == 0:
+        raise ValueError(
+            f"No Pokédex snapshot at {pokedex_path}, build it first with "
+            "`python -m app.application.tools.utils.pokedex build`"
+        )
+    arrays = build_counters(encode_pokedex(store), top_k)
+    write_counters(path, arrays)
+    return len(arrays["names"])
+
+
+_index: Optional[CountersIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_counters_index() -> CountersIndex:
+    """Get the process-wide counters index (empty if it has not been built)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CountersIndex(PATH_COUNTERS_INDEX)
+    return _index
+
+
+def main():
+    """Main function to parse arguments and run the requested command"""
+    parser = argparse.ArgumentParser(description="Best counters index tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="Score the offline Pokédex and write the counters index"
+    )
+    build_parser.add_argument(
+        "--output", "-o", type=str, default=PATH_COUNTERS_INDEX, help="Index file path"
+    )
+    build_parser.add_argument(
+        "--pokedex", "-p", type=str, default=PATH_POKEDEX, help="Pokédex snapshot path"
+    )
+    build_parser.add_argument(
+        "--top-k", "-k", type=int, default=COUNTERS_TOP_K, help="Counters per Pokémon"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(f"Building counters index at {args.output}...")
+        try:
+            count = build_counters_index(args.output, args.pokedex, args.top_k)
+            print(f"Counters index built for {count} Pokémon")
+        except Exception as e:
+            print(f"Error building counters index: {str(e)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
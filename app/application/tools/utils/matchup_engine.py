@@ -0,0 +1,181 @@
+"""
+Vectorized matchup engine.
+
+Scores N attackers against M defenders in one NumPy pass with exactly the
+rules of `analyze_pokemon_battle`: every pair gets the same winner and the
+same turns-to-win as the scalar function, so tables built here (e.g. a full
+species-vs-species table) can answer "who beats X" without the LLM.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, TypedDict
+
+import numpy as np
+
+from app.application.tools.utils.pokedex import PokedexStore
+from app.application.tools.utils.pokemon_utils import (
+    STAT_KEYS,
+    numeric_base_stats,
+    parse_pokemon_data,
+)
+from app.application.tools.utils.type_chart import (
+    DEFENDER_TABLE,
+    TYPES,
+    TYPE_INDEX,
+    defender_combo_index,
+)
+
+# Column of each stat in a stat array
+HP, ATTACK, DEFENSE, SPECIAL_ATTACK, SPECIAL_DEFENSE, SPEED = range(len(STAT_KEYS))
+
+# Combination index used for defenders without any known type (always neutral)
+NO_COMBO = DEFENDER_TABLE.shape[1]
+
+# ATTACK_ROWS[attacking type, defender combo]; the extra row is an attacker
+# without any known type and the extra column a defender without one, both
+# neutral like in `type_effectiveness`
+NO_TYPE = len(TYPES)
+ATTACK_ROWS = np.ones((len(TYPES) + 1, NO_COMBO + 1), dtype=np.float64)
+ATTACK_ROWS[: len(TYPES), :NO_COMBO] = DEFENDER_TABLE
+ATTACK_ROWS.flags.writeable = False
+
+
+class Roster(NamedTuple):
+    """Pokémon encoded as arrays for the matchup engine"""
+
+    names: List[str]
+    # (N, 6) float64 base stats in STAT_KEYS order
+    stats: np.ndarray
+    # (N, 172) best multiplier of each Pokémon against every defender combo
+    attack_rows: np.ndarray
+    # (N,) defender combo index of each Pokémon (NO_COMBO if it has no type)
+    combos: np.ndarray
+
+
+class MatchupMatrices(TypedDict):
+    """NxM results, rows are attackers and columns defenders"""
+
+    attacker_wins: np.ndarray
+    attacker_turns: np.ndarray
+    defender_turns: np.ndarray
+    margin: np.ndarray
+
+
+def encode_type_indices(type_indices: np.ndarray) -> np.ndarray:
+    """
+    Best multiplier of each attacker against every defender combo
+
+    Args:
+        type_indices: (N, 2) attacking type indices; single-type Pokémon repeat
+            their type and Pokémon without a known type use NO_TYPE
+
+    Returns:
+        (N, 172) array of multipliers
+    """
+    type_indices = np.asarray(type_indices, dtype=np.intp)
+    return np.maximum(ATTACK_ROWS[type_indices[:, 0]], ATTACK_ROWS[type_indices[:, 1]])
+
+
+def encode_roster(pokemons: Iterable[Dict[str, Any]]) -> Roster:
+    """
+    Encode researcher-shaped Pokémon data (name, types, base_stats)
+
+    Args:
+        pokemons: Pokémon data as returned by fetch_pokemon_data
+
+    Returns:
+        The roster arrays
+    """
+    names = []
+    stats = []
+    type_indices = []
+    combos = []
+    for pokemon in pokemons:
+        names.append(pokemon["name"])
+        base_stats = numeric_base_stats(pokemon)
+        stats.append([base_stats[key] for key in STAT_KEYS])
+
+        known = [TYPE_INDEX[t] for t in pokemon["types"] if t in TYPE_INDEX]
+        if not known:
+            type_indices.append((NO_TYPE, NO_TYPE))
+        else:
+            # Attackers use every known type, like type_effectiveness
+            type_indices.append((known[0], known[1] if len(known) > 1 else known[0]))
+
+        combo = defender_combo_index(pokemon["types"])
+        combos.append(NO_COMBO if combo is None else combo)
+
+    return Roster(
+        names=names,
+        stats=np.array(stats, dtype=np.float64).reshape(-1, len(STAT_KEYS)),
+        attack_rows=encode_type_indices(
+            np.array(type_indices, dtype=np.intp).reshape(-1, 2)
+        ),
+        combos=np.array(combos, dtype=np.intp),
+    )
+
+
+def encode_pokedex(store: PokedexStore) -> Roster:
+    """
+    Encode every Pokémon of a Pokédex snapshot, in national dex order
+
+    Args:
+        store: Pokédex snapshot
+
+    Returns:
+        The roster arrays
+    """
+    return encode_roster(
+        parse_pokemon_data(store.get_pokemon(name)) for name in store.names()
+    )
+
+
+def analyze_matchups(attackers: Roster, defenders: Roster) -> MatchupMatrices:
+    """
+    Score every attacker against every defender
+
+    Args:
+        attackers: N encoded attackers (pokemon1 of analyze_pokemon_battle)
+        defenders: M encoded defenders (pokemon2 of analyze_pokemon_battle)
+
+    Returns:
+        NxM matrices: whether the attacker wins, the turns each side needs to
+        win and the margin (defender turns - attacker turns, positive when the
+        attacker is faster to finish the fight)
+    """
+    a = attackers.stats
+    d = defenders.stats
+
+    # Type effectiveness in both directions, (N, M)
+    a_effectiveness = attackers.attack_rows[:, defenders.combos]
+    d_effectiveness = defenders.attack_rows[:, attackers.combos].T
+
+    a_power = np.maximum(
+        a[:, ATTACK, None] * a_effectiveness,
+        a[:, SPECIAL_ATTACK, None] * a_effectiveness,
+    )
+    d_power = np.maximum(
+        d[None, :, ATTACK] * d_effectiveness,
+        d[None, :, SPECIAL_ATTACK] * d_effectiveness,
+    )
+
+    a_effective_hp = a[:, HP] * (((a[:, DEFENSE] + a[:, SPECIAL_DEFENSE]) / 2) / 100)
+    d_effective_hp = d[:, HP] * (((d[:, DEFENSE] + d[:, SPECIAL_DEFENSE]) / 2) / 100)
+
+    attacker_turns = d_effective_hp[None, :] / np.maximum(a_power, 1)
+    defender_turns = a_effective_hp[:, None] / np.maximum(d_power, 1)
+
+    # Same tie-breakers as analyze_pokemon_battle: turns, then speed, then HP
+    speed_diff = a[:, SPEED, None] - d[None, :, SPEED]
+    hp_diff = a[:, HP, None] - d[None, :, HP]
+    attacker_wins = np.where(
+        attacker_turns != defender_turns,
+        attacker_turns < defender_turns,
+        np.where(speed_diff != 0, speed_diff > 0, hp_diff > 0),
+    )
+
+    return {
+        "attacker_wins": attacker_wins,
+        "attacker_turns": attacker_turns,
+        "defender_turns": defender_turns,
+        "margin": defender_turns - attacker_turns,
+    }
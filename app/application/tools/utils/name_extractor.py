@@ -0,0 +1,143 @@
+"""
+Pokémon name extraction from free text.
+
+An Aho–Corasick automaton over every name and alias of the Pokédex snapshot
+finds all the Pokémon named in a question in one pass over its characters,
+however many names the index holds. Matches must start and end on word
+boundaries, and overlapping matches keep the leftmost, longest one ("mr
+mime" rather than "mime").
+"""
+
+import logging
+import re
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from app.application.tools.utils.pokedex import get_pokedex
+from app.domain.settings.constants import POPULAR_POKEMON
+
+logger = logging.getLogger(__name__)
+
+
+def match_key(text: str) -> str:
+    """
+    Normalize text for name matching: lowercase words separated by single
+    spaces, with hyphens as word breaks and apostrophes, dots and colons
+    dropped ('Farfetch’d' -> 'farfetchd', 'Type: Null' -> 'type null')
+    """
+    text = re.sub(r"['’.:]", "", text.lower())
+    return " ".join(re.findall(r"[^\W_]+", text))
+
+
+class NameExtractor:
+    """Aho–Corasick automaton mapping name and alias matches to canonical names"""
+
+    def __init__(self, aliases: Dict[str, str]):
+        """
+        Args:
+            aliases: Lookup key (name or alias) to canonical Pokémon name;
+                numeric keys (dex ids) are ignored
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Length and canonical name of the key ending at each node
+        self._out: List[Optional[Tuple[int, str]]] = [None]
+        # Nearest node on the failure chain that ends a key
+        self._link: List[int] = [0]
+        self._keys = 0
+        for alias, name in aliases.items():
+            key = match_key(alias)
+            if key and not key.isdigit():
+                self._add(key, name)
+        self._build()
+
+    def __len__(self) -> int:
+        return self._keys
+
+    def _add(self, key: str, name: str) -> None:
+        node = 0
+        for char in key:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+                self._link.append(0)
+            node = child
+        if self._out[node] is None:
+            self._out[node] = (len(key), name)
+            self._keys += 1
+
+    def _build(self) -> None:
+        # Breadth-first, so every node's failure target is final before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fallback = self._goto[fail].get(char, 0)
+                self._fail[child] = fallback
+                self._link[child] = (
+                    fallback if self._out[fallback] else self._link[fallback]
+                )
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Find the Pokémon named in a text
+
+        Args:
+            text: Free text (e.g. a user question)
+
+        Returns:
+            Canonical names, in order of appearance and without duplicates
+        """
+        text = match_key(text)
+        matches = []
+        node = 0
+        for end, char in enumerate(text, start=1):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            hit = node if self._out[node] else self._link[node]
+            while hit:
+                length, name = self._out[hit]
+                start = end - length
+                if (start == 0 or text[start - 1] == " ") and (
+                    end == len(text) or text[end] == " "
+                ):
+                    matches.append((start, end, name))
+                hit = self._link[hit]
+
+        found: Dict[str, None] = {}
+        covered = 0
+        for start, end, name in sorted(matches, key=lambda m: (m[0], -m[1])):
+            if start >= covered:
+                found[name] = None
+                covered = end
+        return list(found)
+
+
+_extractor: Optional[NameExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_name_extractor() -> NameExtractor:
+    """
+    Get the process-wide name extractor over the Pokédex snapshot's names and
+    aliases (and the popular Pokémon, so they are found without a snapshot)
+    """
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                aliases = {name: name for name in POPULAR_POKEMON}
+                aliases.update(get_pokedex().aliases())
+                _extractor = NameExtractor(aliases)
+                logger.info(f"Name extractor built over {len(_extractor)} keys")
+    return _extractor
@@ -0,0 +1,270 @@
+"""
+Pokémon name resolution.
+
+Every Pokémon name the data layer receives goes through one canonicalizer,
+canonical_key, which turns user spellings into PokéAPI names ("Mr. Mime" ->
+"mr-mime", "Alolan Ninetales" -> "ninetales-alola", "Mega Charizard X" ->
+"charizard-mega-x"). The key is then looked up in an index of every name and
+alias of the Pokédex snapshot, plus the species whose PokéAPI name is one of
+their forms ("mimikyu" -> "mimikyu-disguised").
+
+Keys the index doesn't know are matched against it with a trigram index
+ranked by edit distance, giving suggestions for misspelled names. When the
+index comes from a complete Pokédex snapshot it knows every Pokémon, so a
+close, unambiguous match is taken as the intended name without asking the
+PokéAPI; otherwise unknown names go upstream unchanged, since they may well
+be real Pokémon missing from the index.
+"""
+
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.application.tools.utils.pokedex import get_pokedex
+from app.domain.settings.constants import POPULAR_POKEMON
+
+logger = logging.getLogger(__name__)
+
+# Form words to their PokéAPI suffix
+FORM_WORDS = {
+    "mega": "mega",
+    "primal": "primal",
+    "alola": "alola",
+    "alolan": "alola",
+    "galar": "galar",
+    "galarian": "galar",
+    "hisui": "hisui",
+    "hisuian": "hisui",
+    "paldea": "paldea",
+    "paldean": "paldea",
+    "gmax": "gmax",
+    "gigantamax": "gmax",
+}
+
+# Species whose PokéAPI /pokemon name is their default form, and other common
+# aliases (the snapshot has these too; this covers processes without one)
+COMMON_ALIASES = {
+    "deoxys": "deoxys-normal",
+    "wormadam": "wormadam-plant",
+    "giratina": "giratina-altered",
+    "shaymin": "shaymin-land",
+    "basculin": "basculin-red-striped",
+    "darmanitan": "darmanitan-standard",
+    "tornadus": "tornadus-incarnate",
+    "thundurus": "thundurus-incarnate",
+    "landorus": "landorus-incarnate",
+    "enamorus": "enamorus-incarnate",
+    "keldeo": "keldeo-ordinary",
+    "meloetta": "meloetta-aria",
+    "meowstic": "meowstic-male",
+    "aegislash": "aegislash-shield",
+    "pumpkaboo": "pumpkaboo-average",
+    "gourgeist": "gourgeist-average",
+    "zygarde": "zygarde-50",
+    "oricorio": "oricorio-baile",
+    "lycanroc": "lycanroc-midday",
+    "wishiwashi": "wishiwashi-solo",
+    "minior": "minior-red-meteor",
+    "mimikyu": "mimikyu-disguised",
+    "toxtricity": "toxtricity-amped",
+    "eiscue": "eiscue-ice",
+    "indeedee": "indeedee-male",
+    "morpeko": "morpeko-full-belly",
+    "urshifu": "urshifu-single-strike",
+    "nidoran-female": "nidoran-f",
+    "nidoran-male": "nidoran-m",
+}
+
+# Most ranked suggestions returned for a name
+MAX_SUGGESTIONS = 5
+
+
+def canonical_key(name: str) -> str:
+    """
+    Normalize a Pokémon name the way the PokéAPI spells it: lowercase words
+    joined by hyphens, without accents, apostrophes, dots or colons, and with
+    leading form words moved after the species ('Galarian Mr. Mime' ->
+    'mr-mime-galar')
+
+    Args:
+        name: Pokémon name, alias or national dex id
+
+    Returns:
+        Lookup key
+    """
+    text = unicodedata.normalize("NFKD", str(name).lower().strip())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"['’.:]", "", text.replace("♀", "-f").replace("♂", "-m"))
+    words = re.findall(r"[^\W_]+", text)
+
+    words = [FORM_WORDS.get(word, word) for word in words]
+    # Leading form words go after the species ("alolan ninetales")
+    forms = []
+    while len(words) > 1 and words[0] in FORM_WORDS.values():
+        forms.append(words.pop(0))
+    if forms:
+        # Mega X and Y keep their letter last ("charizard-mega-x")
+        variant = words[-1:] if "mega" in forms and words[-1] in ("x", "y") else []
+        words = words[: len(words) - len(variant)] + forms + variant
+    return "-".join(words)
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance counting an adjacent transposition as one edit"""
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[len(b)]
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _max_correction(key: str) -> int:
+    # One edit per four characters, so short names need a near-exact match
+    return max(1, len(key) // 4)
+
+
+class NameResolution(NamedTuple):
+    # Name to look up: the canonical name, the correction of a misspelling or
+    # the key itself when the index doesn't know it
+    name: str
+    # Whether the key is a known name or alias
+    exact: bool
+    # Closest known names, best first, when the key isn't known
+    suggestions: List[str]
+
+
+class NameResolver:
+    """Exact and fuzzy lookup of Pokémon names and aliases"""
+
+    def __init__(self, aliases: Dict[str, str], complete: bool = False):
+        """
+        Args:
+            aliases: Lookup key (name or alias) to canonical Pokémon name
+            complete: Whether the aliases cover every Pokémon, so that an
+                unknown name can be taken for a misspelling and corrected
+        """
+        self.complete = complete
+        self._names: Dict[str, str] = {}
+        for alias, name in aliases.items():
+            for key in (canonical_key(alias), canonical_key(name)):
+                if key:
+                    self._names.setdefault(key, name)
+        # Fuzzy matching skips dex ids; an unknown id is never a typo
+        self._keys = [key for key in self._names if not key.isdigit()]
+        self._trigrams: Dict[str, List[int]] = {}
+        for index, key in enumerate(self._keys):
+            for trigram in _trigrams(key):
+                self._trigrams.setdefault(trigram, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def suggest(self, name: str, limit: int = MAX_SUGGESTIONS) -> List[str]:
+        """
+        Known Pokémon closest to a name
+
+        Args:
+            name: Pokémon name, possibly misspelled
+            limit: Most suggestions returned
+
+        Returns:
+            Canonical names, closest first
+        """
+        return [name for name, _ in self._rank(canonical_key(name))[:limit]]
+
+    def _rank(self, key: str) -> List[Tuple[str, int]]:
+        if not key or key.isdigit():
+            return []
+        # Shortlist the keys sharing the most trigrams, then rank by edit distance
+        shared = Counter(
+            index
+            for trigram in _trigrams(key)
+            for index in self._trigrams.get(trigram, ())
+        )
+        bound = len(key) // 3 + 1
+        best: Dict[str, tuple] = {}
+        for index, count in shared.most_common(50):
+            candidate = self._keys[index]
+            if abs(len(candidate) - len(key)) > bound:
+                continue
+            distance = edit_distance(key, candidate)
+            if distance > bound:
+                continue
+            name = self._names[candidate]
+            rank = (distance, -count, name)
+            if name not in best or rank < best[name]:
+                best[name] = rank
+        return [
+            (name, rank[0])
+            for name, rank in sorted(best.items(), key=lambda item: item[1])
+        ]
+
+    def resolve(self, name: str) -> NameResolution:
+        """
+        Resolve a Pokémon name, alias or national dex id
+
+        Args:
+            name: Name as given by the user or the LLM
+
+        Returns:
+            The name to look up, whether it was known, and suggestions
+        """
+        key = canonical_key(name)
+        canonical = self._names.get(key)
+        if canonical is not None:
+            return NameResolution(canonical, True, [])
+
+        ranked = self._rank(key)
+        suggestions = [candidate for candidate, _ in ranked[:MAX_SUGGESTIONS]]
+        if (
+            self.complete
+            and ranked
+            and ranked[0][1] <= _max_correction(key)
+            # Two names equally close are left to the caller
+            and (len(ranked) == 1 or ranked[1][1] > ranked[0][1])
+        ):
+            return NameResolution(ranked[0][0], False, suggestions)
+        return NameResolution(key, False, suggestions)
+
+
+_resolver: Optional[NameResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_name_resolver() -> NameResolver:
+    """
+    Get the process-wide name resolver over the Pokédex snapshot's names and
+    aliases, the common aliases and the popular Pokémon
+    """
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                pokedex = get_pokedex()
+                aliases = {name: name for name in POPULAR_POKEMON}
+                aliases.update(COMMON_ALIASES)
+                aliases.update(pokedex.aliases())
+                _resolver = NameResolver(aliases, complete=pokedex.complete)
+                logger.info(f"Name resolver built over {len(_resolver)} keys")
+    return _resolver
+
+
+def resolve_pokemon_name(name: str) -> str:
+    """Name to look a Pokémon up by in the snapshot and the PokéAPI"""
+    return get_name_resolver().resolve(name).name
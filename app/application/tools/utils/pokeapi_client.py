@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.application.tools.utils.cache import get_pokeapi_cache
+from app.application.tools.utils.single_flight import SingleFlight
+from app.domain.settings.constants import (
+    POKEAPI_BASE_URL,
+    POKEAPI_CONNECT_TIMEOUT,
+    POKEAPI_MAX_CONCURRENCY,
+    POKEAPI_MAX_CONNECTIONS,
+    POKEAPI_MAX_KEEPALIVE,
+    POKEAPI_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 is only available when the optional `h2` package is installed
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+async def _aclose_stale_client(
+    client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Close the client of an event loop that is no longer the current one"""
+    if loop is not None and loop.is_running():
+        # The other loop still runs (in another thread); close it there
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    try:
+        await client.aclose()
+    except Exception as e:
+        # Connections of a closed loop can't be shut down cleanly
+        logger.debug(f"Could not close a stale PokéAPI client: {str(e)}")
+
+
+class PokeAPIClient:
+    """
+    Shared, connection-pooled HTTP client for the PokéAPI.
+
+    The async client is the primary interface and is the one used from the
+    LangGraph event loop. A sync client with the same pool limits, timeouts
+    and concurrency bound backs the sync wrappers used by the CLI and by the
+    (CPU-bound) visualization code.
+    """
+
+    def __init__(
+        self,
+        base_url: str = POKEAPI_BASE_URL,
+        timeout: float = POKEAPI_TIMEOUT,
+        connect_timeout: float = POKEAPI_CONNECT_TIMEOUT,
+        max_connections: int = POKEAPI_MAX_CONNECTIONS,
+        max_keepalive: int = POKEAPI_MAX_KEEPALIVE,
+        max_concurrency: int = POKEAPI_MAX_CONCURRENCY,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+        )
+        self.max_concurrency = max_concurrency
+
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_semaphore: Optional[asyncio.Semaphore] = None
+
+        self._sync_client: Optional[httpx.Client] = None
+        self._sync_semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    def url_for(self, path_or_url: str) -> str:
+        """Build an absolute URL from an API path (e.g. 'pokemon/pikachu')"""
+        if path_or_url.startswith(("http://", "https://")):
+            return path_or_url
+        return f"{self.base_url}/{path_or_url.lstrip('/')}"
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        return {
+            "timeout": self.timeout,
+            "limits": self.limits,
+            "http2": HTTP2_AVAILABLE,
+            "follow_redirects": True,
+            "headers": {"Accept": "application/json"},
+        }
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        # Async clients and semaphores are bound to the event loop that uses them
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            stale, stale_loop = self._async_client, self._async_loop
+            self._async_client = httpx.AsyncClient(**self._client_kwargs())
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_loop = loop
+            if stale is not None:
+                await _aclose_stale_client(stale, stale_loop)
+        return self._async_client
+
+    def _get_sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(**self._client_kwargs())
+            return self._sync_client
+
+    async def get(self, path_or_url: str) -> httpx.Response:
+        """
+        Perform a GET request on the shared async client
+
+        Args:
+            path_or_url: API path relative to the base URL, or an absolute URL
+
+        Returns:
+            The HTTP response
+        """
+        client = await self._get_async_client()
+        async with self._async_semaphore:
+            return await client.get(self.url_for(path_or_url))
+
+    def get_sync(self, path_or_url: str) -> httpx.Response:
+        """
+        Perform a GET request on the shared sync client
+
+        Args:
+            path_or_url: API path relative to the base URL, or an absolute URL
+
+        Returns:
+            The HTTP response
+        """
+        client = self._get_sync_client()
+        with self._sync_semaphore:
+            return client.get(self.url_for(path_or_url))
+
+    async def aclose(self) -> None:
+        """Close both underlying connection pools"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
+        self.close_sync()
+
+    def close_sync(self) -> None:
+        """Close the sync connection pool"""
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+
+_client: Optional[PokeAPIClient] = None
+_client_lock = threading.Lock()
+
+
+def get_pokeapi_client() -> PokeAPIClient:
+    """Get the process-wide PokéAPI client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PokeAPIClient()
+                logger.info(
+                    f"PokéAPI client created (http2={HTTP2_AVAILABLE}, "
+                    f"max_concurrency={_client.max_concurrency})"
+                )
+    return _client
+
+
+# Coalesces concurrent upstream fetches of the same resource
+resource_flight = SingleFlight()
+
+
+def resource_cache_key(endpoint: str, name: str) -> str:
+    """Cache key of a PokéAPI resource (e.g. 'pokemon_form_pikachu')"""
+    return f"{endpoint.replace('-', '_')}_{name}"
+
+
+async def afetch_resource(endpoint: str, name: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a PokéAPI resource asynchronously through the shared cache
+
+    Args:
+        endpoint: Resource endpoint (e.g. 'pokemon', 'pokemon-form')
+        name: Resource name or id
+
+    Returns:
+        Parsed JSON body, or None if the resource was not found (404s are
+        remembered in the cache's negative tier)
+    """
+
+    key = resource_cache_key(endpoint, name)
+    cache = get_pokeapi_cache()
+
+    async def fetch_upstream() -> Optional[Dict[str, Any]]:
+        response = await get_pokeapi_client().get(f"{endpoint}/{name}")
+        if response.status_code == 404:
+            cache.set_missing(key)
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    async def fetch() -> Optional[Dict[str, Any]]:
+        # Names that just came back 404 aren't asked for again until they expire
+        if cache.is_missing(key):
+            return None
+        return await resource_flight.do(key, fetch_upstream)
+
+    return await cache.aget_or_fetch(key, fetch)
+
+
+def fetch_resource(endpoint: str, name: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a PokéAPI resource synchronously (CLI and worker-thread callers)
+    through the shared cache
+
+    Args:
+        endpoint: Resource endpoint (e.g. 'pokemon', 'pokemon-form')
+        name: Resource name or id
+
+    Returns:
+        Parsed JSON body, or None if the resource was not found (404s are
+        remembered in the cache's negative tier)
+    """
+
+    key = resource_cache_key(endpoint, name)
+    cache = get_pokeapi_cache()
+
+    def fetch_upstream() -> Optional[Dict[str, Any]]:
+        response = get_pokeapi_client().get_sync(f"{endpoint}/{name}")
+        if response.status_code == 404:
+            cache.set_missing(key)
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    def fetch() -> Optional[Dict[str, Any]]:
+        # Names that just came back 404 aren't asked for again until they expire
+        if cache.is_missing(key):
+            return None
+        return resource_flight.do_sync(key, fetch_upstream)
+
+    return cache.get_or_fetch(key, fetch)
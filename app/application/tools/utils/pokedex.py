@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Offline Pokédex Snapshot
+
+Downloads the species/form/type dataset from the PokéAPI once and stores it in a
+compact SQLite file. At runtime the store is opened read-only and an in-memory
+alias index answers lookups by name, national dex id or alias in O(1), so the
+network is only needed for names the snapshot doesn't know.
+
+Usage:
+    python -m app.application.tools.utils.pokedex build
+
+    or
+
+    python -m app.application.tools.utils.pokedex build --output data/pokedex.sqlite --limit 151
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.application.tools.utils.pokeapi_client import get_pokeapi_client
+from app.domain.settings.constants import PATH_POKEDEX
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE pokemon (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    species TEXT NOT NULL,
+    data TEXT NOT NULL,
+    form TEXT
+);
+CREATE TABLE aliases (alias TEXT PRIMARY KEY, pokemon_id INTEGER NOT NULL);
+CREATE TABLE types (name TEXT PRIMARY KEY, data TEXT NOT NULL);
+"""
+
+# Sprite groups used by the battle renderer; everything else is dropped
+KEPT_OTHER_SPRITES = ("official-artwork", "home")
+
+
+def normalize_key(key: Any) -> str:
+    """Normalize a lookup key (name, alias or id) for the alias index"""
+    return str(key).lower().strip()
+
+
+def trim_pokemon_record(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a raw /pokemon record to the fields the application uses
+
+    Args:
+        data: Raw JSON of the /pokemon/{name} endpoint
+
+    Returns:
+        PokéAPI-shaped record with id, name, species, types, stats and sprites
+    """
+    sprites = {
+        key: value
+        for key, value in (data.get("sprites") or {}).items()
+        if key not in ("other", "versions")
+    }
+    other = (data.get("sprites") or {}).get("other") or {}
+    sprites["other"] = {
+        key: {"front_default": (other.get(key) or {}).get("front_default")}
+        for key in KEPT_OTHER_SPRITES
+    }
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "species": {"name": data["species"]["name"]},
+        "types": [
+            {"slot": t["slot"], "type": {"name": t["type"]["name"]}}
+            for t in data["types"]
+        ],
+        "stats": [
+            {"base_stat": s["base_stat"], "stat": {"name": s["stat"]["name"]}}
+            for s in data["stats"]
+        ],
+        "sprites": sprites,
+    }
+
+
+def trim_form_record(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a raw /pokemon-form record to its name and sprites"""
+    return {"name": data["name"], "sprites": data.get("sprites") or {}}
+
+
+def species_aliases(species: Dict[str, Any]) -> List[str]:
+    """
+    Aliases of the default variety of a species: its name, national dex id
+    and localized names
+
+    Args:
+        species: Raw JSON of the /pokemon-species/{name} endpoint
+
+    Returns:
+        List of alias keys
+    """
+    aliases = [species["name"], str(species["id"])]
+    aliases.extend(entry["name"] for entry in species.get("names", []))
+    return aliases
+
+
+class PokedexStore:
+    """
+    Read-only view over a Pokédex snapshot.
+
+    The alias index and the decoded records are kept in memory, so lookups
+    never touch SQLite more than once per Pokémon.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._index: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._pokemon: Dict[int, Dict[str, Any]] = {}
+        self._forms: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        # Whether the snapshot holds every Pokémon (no failed or limited download)
+        self.complete = False
+
+        if path and os.path.exists(path):
+            self._load_index()
+
+    def _connection(self) -> sqlite3.Connection:
+        # A SQLite connection must not be used across fork (gunicorn workers of
+        # a preloaded app inherit this store), so each process opens its own
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+    def _load_index(self) -> None:
+        conn = self._connection()
+        for pokemon_id, name in conn.execute("SELECT id, name FROM pokemon"):
+            self._names[pokemon_id] = name
+            self._index[normalize_key(name)] = pokemon_id
+            self._index[str(pokemon_id)] = pokemon_id
+        for alias, pokemon_id in conn.execute("SELECT alias, pokemon_id FROM aliases"):
+            self._index.setdefault(normalize_key(alias), pokemon_id)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'complete'").fetchone()
+        self.complete = bool(row) and row[0] == "true"
+        logger.info(
+            f"Pokédex snapshot loaded: {len(self._names)} Pokémon"
+            + ("" if self.complete else " (incomplete)")
+        )
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, key: Any) -> bool:
+        return normalize_key(key) in self._index
+
+    def resolve_id(self, key: Any) -> Optional[int]:
+        """Resolve a name, national dex id or alias to a Pokémon id"""
+        return self._index.get(normalize_key(key))
+
+    def names(self) -> List[str]:
+        """Canonical names of every Pokémon in the snapshot, in id order"""
+        return [self._names[pokemon_id] for pokemon_id in sorted(self._names)]
+
+    def aliases(self) -> Dict[str, str]:
+        """Every lookup key mapped to its canonical Pokémon name"""
+        return {key: self._names[pokemon_id] for key, pokemon_id in self._index.items()}
+
+    def _load_row(self, pokemon_id: int) -> None:
+        with self._lock:
+            if pokemon_id in self._pokemon:
+                return
+            row = (
+                self._connection()
+                .execute("SELECT data, form FROM pokemon WHERE id = ?", (pokemon_id,))
+                .fetchone()
+            )
+            self._pokemon[pokemon_id] = json.loads(row[0])
+            self._forms[pokemon_id] = json.loads(row[1]) if row[1] else None
+
+    def get_pokemon(self, key: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get the PokéAPI-shaped /pokemon record for a name, id or alias
+
+        Args:
+            key: Name, national dex id or alias
+
+        Returns:
+            Pokémon record, or None if the snapshot doesn't know the key
+        """
+        pokemon_id = self.resolve_id(key)
+        if pokemon_id is None:
+            return None
+        if pokemon_id not in self._pokemon:
+            self._load_row(pokemon_id)
+        return self._pokemon[pokemon_id]
+
+    def get_form(self, key: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get the PokéAPI-shaped /pokemon-form record for a name, id or alias
+
+        Args:
+            key: Name, national dex id or alias
+
+        Returns:
+            Form record, or None if the snapshot doesn't know the key
+        """
+        pokemon_id = self.resolve_id(key)
+        if pokemon_id is None:
+            return None
+        if pokemon_id not in self._forms:
+            self._load_row(pokemon_id)
+        return self._forms[pokemon_id]
+
+    def get_type(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the stored /type record (damage relations) for a type name"""
+        if self._conn is None:
+            return None
+        row = (
+            self._connection()
+            .execute("SELECT data FROM types WHERE name = ?", (normalize_key(name),))
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+
+def write_pokedex(
+    path: str,
+    entries: Iterable[Dict[str, Any]],
+    types: Optional[Iterable[Dict[str, Any]]] = None,
+    complete: bool = False,
+) -> int:
+    """
+    Write a Pokédex snapshot atomically
+
+    Args:
+        path: Destination SQLite file
+        entries: Items with 'pokemon' (trimmed record), optional 'form' and 'aliases'
+        types: Optional /type records (name and damage_relations)
+        complete: Whether the entries are every Pokémon, so unknown names can
+            be taken for misspellings
+
+    Returns:
+        Number of Pokémon written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".sqlite.tmp")
+    os.close(fd)
+
+    count = 0
+    try:
+        conn = sqlite3.connect(tmp_path)
+        conn.executescript(SCHEMA)
+        for entry in entries:
+            pokemon = entry["pokemon"]
+            form = entry.get("form")
+            conn.execute(
+                "INSERT INTO pokemon (id, name, species, data, form) VALUES (?, ?, ?, ?, ?)",
+                (
+                    pokemon["id"],
+                    pokemon["name"],
+                    pokemon["species"]["name"],
+                    json.dumps(pokemon, separators=(",", ":")),
+                    json.dumps(form, separators=(",", ":")) if form else None,
+                ),
+            )
+            for alias in entry.get("aliases", []):
+                conn.execute(
+                    "INSERT OR IGNORE INTO aliases (alias, pokemon_id) VALUES (?, ?)",
+                    (normalize_key(alias), pokemon["id"]),
+                )
+            count += 1
+        for type_record in types or []:
+            conn.execute(
+                "INSERT INTO types (name, data) VALUES (?, ?)",
+                (type_record["name"], json.dumps(type_record, separators=(",", ":"))),
+            )
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('pokemon_count', ?)", (str(count),)
+        )
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('complete', ?)",
+            ("true" if complete else "false",),
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return count
+
+
+async def _get_json(path: str) -> Optional[Dict[str, Any]]:
+    response = await get_pokeapi_client().get(path)
+    if response.status_code != 200:
+        logger.warning(f"Skipping {path}: HTTP {response.status_code}")
+        return None
+    return response.json()
+
+
+async def download_pokedex(limit: Optional[int] = None) -> Dict[str, List[Any]]:
+    """
+    Download every Pokémon with its default form, species aliases and the type chart
+
+    Args:
+        limit: Optional maximum number of Pokémon (in PokéAPI order)
+
+    Returns:
+        Dictionary with 'entries', 'types' and 'complete' ready for
+        write_pokedex, and the 'missing' Pokémon that failed to download
+    """
+    listing = await _get_json(f"pokemon?limit={limit or 100000}")
+    if listing is None:
+        raise RuntimeError("Could not list the PokéAPI Pokémon")
+    names = [item["name"] for item in listing["results"]]
+
+    async def load_entry(name: str) -> Optional[Dict[str, Any]]:
+        raw = await _get_json(f"pokemon/{name}")
+        if raw is None:
+            return None
+        form = None
+        if raw.get("forms"):
+            form_raw = await _get_json(f"pokemon-form/{raw['forms'][0]['name']}")
+            form = trim_form_record(form_raw) if form_raw else None
+        return {"pokemon": trim_pokemon_record(raw), "form": form, "aliases": []}
+
+    # Concurrency is bounded by the shared client's semaphore; one failed
+    # Pokémon leaves a gap in the snapshot instead of aborting the build
+    loaded = await asyncio.gather(
+        *(load_entry(name) for name in names), return_exceptions=True
+    )
+    entries = []
+    missing = []
+    for name, entry in zip(names, loaded):
+        if isinstance(entry, Exception):
+            logger.warning(f"Skipping pokemon/{name}: {str(entry)}")
+        if entry is None or isinstance(entry, Exception):
+            missing.append(name)
+        else:
+            entries.append(entry)
+    by_name = {entry["pokemon"]["name"]: entry for entry in entries}
+
+    species_names = sorted({entry["pokemon"]["species"]["name"] for entry in entries})
+    species_list = await asyncio.gather(
+        *(_get_json(f"pokemon-species/{name}") for name in species_names),
+        return_exceptions=True,
+    )
+    for name, species in zip(species_names, species_list):
+        if isinstance(species, Exception):
+            logger.warning(f"Skipping pokemon-species/{name}: {str(species)}")
+            continue
+        if species is None:
+            continue
+        default = next(
+            (v["pokemon"]["name"] for v in species["varieties"] if v["is_default"]),
+            None,
+        )
+        if default in by_name:
+            by_name[default]["aliases"].extend(species_aliases(species))
+
+    type_listing = await _get_json("type?limit=100")
+    if type_listing is None:
+        raise RuntimeError("Could not list the PokéAPI types")
+    type_records = await asyncio.gather(
+        *(_get_json(f"type/{item['name']}") for item in type_listing["results"]),
+        return_exceptions=True,
+    )
+    types = []
+    for item, record in zip(type_listing["results"], type_records):
+        if isinstance(record, Exception):
+            logger.warning(f"Skipping type/{item['name']}: {str(record)}")
+        elif record is not None:
+            types.append(
+                {"name": record["name"], "damage_relations": record["damage_relations"]}
+            )
+
+    if missing:
+        logger.warning(f"{len(missing)} Pokémon could not be downloaded")
+    return {
+        "entries": entries,
+        "types": types,
+        "complete": limit is None and not missing,
+        "missing": missing,
+    }
+
+
+def build_pokedex(path: str = PATH_POKEDEX, limit: Optional[int] = None) -> int:
+    """
+    Download the dataset and write the snapshot
+
+    Args:
+        path: Destination SQLite file
+        limit: Optional maximum number of Pokémon
+
+    Returns:
+        Number of Pokémon written
+    """
+    dataset = asyncio.run(download_pokedex(limit))
+    return write_pokedex(
+        path, dataset["entries"], dataset["types"], complete=dataset["complete"]
+    )
+
+
+_store: Optional[PokedexStore] = None
+_store_lock = threading.Lock()
+
+
+def get_pokedex() -> PokedexStore:
+    """Get the process-wide Pokédex store (empty if no snapshot has been built)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PokedexStore(PATH_POKEDEX)
+    return _store
+
+
+def main():
+    """Main function to parse arguments and run the requested command"""
+    parser = argparse.ArgumentParser(description="Offline Pokédex snapshot tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="Download the PokéAPI dataset into a local snapshot"
+    )
+    build_parser.add_argument(
+        "--output", "-o", type=str, default=PATH_POKEDEX, help="Snapshot file path"
+    )
+    build_parser.add_argument(
+        "--limit", "-l", type=int, default=None, help="Maximum number of Pokémon"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(f"Building Pokédex snapshot at {args.output}...")
+        try:
+            count = build_pokedex(args.output, args.limit)
+            print(f"Pokédex snapshot built with {count} Pokémon")
+        except Exception as e:
+            print(f"Error building Pokédex snapshot: {str(e)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
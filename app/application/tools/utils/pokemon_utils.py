@@ -1,81 +1,122 @@
-import requests
 from typing import Dict, List, Tuple, Any
 
-# Type effectiveness chart - a mapping of attacking type to a list of types it's super effective against
-TYPE_ADVANTAGES = {
-    "normal": [],
-    "fire": ["grass", "ice", "bug", "steel"],
-    "water": ["fire", "ground", "rock"],
-    "electric": ["water", "flying"],
-    "grass": ["water", "ground", "rock"],
-    "ice": ["grass", "ground", "flying", "dragon"],
-    "fighting": ["normal", "ice", "rock", "dark", "steel"],
-    "poison": ["grass", "fairy"],
-    "ground": ["fire", "electric", "poison", "rock", "steel"],
-    "flying": ["grass", "fighting", "bug"],
-    "psychic": ["fighting", "poison"],
-    "bug": ["grass", "psychic", "dark"],
-    "rock": ["fire", "ice", "flying", "bug"],
-    "ghost": ["psychic", "ghost"],
-    "dragon": ["dragon"],
-    "dark": ["psychic", "ghost"],
-    "steel": ["ice", "rock", "fairy"],
-    "fairy": ["fighting", "dragon", "dark"],
-}
-
-# Type immunities - a mapping of attacking type to a list of types that are immune to it
-TYPE_IMMUNITIES = {
-    "normal": ["ghost"],
-    "electric": ["ground"],
-    "fighting": ["ghost"],
-    "poison": ["steel"],
-    "ground": ["flying"],
-    "psychic": ["dark"],
-    "ghost": ["normal"],
-    "dragon": ["fairy"],
-}
+from app.application.tools.utils.name_resolver import NameResolution, get_name_resolver
+from app.application.tools.utils.pokeapi_client import afetch_resource, fetch_resource
+from app.application.tools.utils.pokedex import get_pokedex
+from app.application.tools.utils.type_chart import type_effectiveness
+
+# Order of the base stats in researcher records and in stat arrays
+STAT_KEYS = (
+    "hp",
+    "attack",
+    "defense",
+    "special_attack",
+    "special_defense",
+    "speed",
+)
+
+
+def numeric_base_stats(pokemon: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Base stats as numbers (researcher records may carry them as strings)
+
+    Args:
+        pokemon: Pokémon data with a 'base_stats' mapping
+
+    Returns:
+        Dictionary of stat name to numeric value
+    """
+    return {key: float(pokemon["base_stats"][key]) for key in STAT_KEYS}
+
+
+def parse_pokemon_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the researcher-facing fields from a raw PokéAPI pokemon record
+
+    Args:
+        data: Raw JSON of the /pokemon/{name} endpoint
+
+    Returns:
+        Dictionary containing name, base stats and types
+    """
+    return {
+        "name": data["name"],
+        "base_stats": {
+            "hp": str(data["stats"][0]["base_stat"]),
+            "attack": str(data["stats"][1]["base_stat"]),
+            "defense": str(data["stats"][2]["base_stat"]),
+            "special_attack": str(data["stats"][3]["base_stat"]),
+            "special_defense": str(data["stats"][4]["base_stat"]),
+            "speed": str(data["stats"][5]["base_stat"]),
+        },
+        "types": [t["type"]["name"] for t in data["types"]],
+    }
+
+
+def not_found_error(pokemon_name: str, resolution: NameResolution) -> Dict[str, Any]:
+    """
+    Error record for a Pokémon neither the snapshot nor the PokéAPI knows
+
+    Args:
+        pokemon_name: Name as requested
+        resolution: Resolution of the name
+
+    Returns:
+        Dictionary with the error and the closest known names, if any
+    """
+    error: Dict[str, Any] = {"error": f"Pokémon '{pokemon_name}' not found."}
+    if resolution.suggestions:
+        error["suggestions"] = resolution.suggestions
+    return error
 
 
 # Fetch Pokémon data from PokéAPI
+async def afetch_pokemon_data(pokemon_name: str) -> Dict[str, Any]:
+    """
+    Fetch Pokémon data from PokéAPI without blocking the event loop
+
+    Args:
+        pokemon_name: Name, alias or national dex id of the Pokémon
+
+    Returns:
+        Dictionary containing Pokémon data
+    """
+    # Canonical PokéAPI name, with forms, aliases and misspellings resolved
+    resolution = get_name_resolver().resolve(pokemon_name)
+    clean_name = resolution.name
+
+    # The offline snapshot answers known names; the network is the fallback
+    data = get_pokedex().get_pokemon(clean_name)
+    if data is None:
+        data = await afetch_resource("pokemon", clean_name)
+    if data is None:
+        return not_found_error(pokemon_name, resolution)
+
+    return parse_pokemon_data(data)
+
+
 def fetch_pokemon_data(pokemon_name: str) -> Dict[str, Any]:
     """
-    Fetch Pokémon data from PokéAPI
+    Fetch Pokémon data from PokéAPI (sync wrapper for CLI and thread callers)
 
     Args:
-        pokemon_name: Name of the Pokémon (lowercase)
+        pokemon_name: Name, alias or national dex id of the Pokémon
 
     Returns:
         Dictionary containing Pokémon data
     """
-    # Clean the pokemon name (lowercase, remove spaces and special characters)
-    clean_name = pokemon_name.lower().strip()
-
-    # Make API request
-    response = requests.get(f"https://pokeapi.co/api/v2/pokemon/{clean_name}")
-
-    # Check if the request was successful
-    if response.status_code == 200:
-        # check if the response is Not Found
-
-        data = response.json()
-
-        # Extract relevant information
-        pokemon_info = {
-            "name": data["name"],
-            "base_stats": {
-                "hp": str(data["stats"][0]["base_stat"]),
-                "attack": str(data["stats"][1]["base_stat"]),
-                "defense": str(data["stats"][2]["base_stat"]),
-                "special_attack": str(data["stats"][3]["base_stat"]),
-                "special_defense": str(data["stats"][4]["base_stat"]),
-                "speed": str(data["stats"][5]["base_stat"]),
-            },
-            "types": [t["type"]["name"] for t in data["types"]],
-        }
-
-        return pokemon_info
-    else:
-        return {"error": f"Pokémon '{pokemon_name}' not found."}
+    # Canonical PokéAPI name, with forms, aliases and misspellings resolved
+    resolution = get_name_resolver().resolve(pokemon_name)
+    clean_name = resolution.name
+
+    # The offline snapshot answers known names; the network is the fallback
+    data = get_pokedex().get_pokemon(clean_name)
+    if data is None:
+        data = fetch_resource("pokemon", clean_name)
+    if data is None:
+        return not_found_error(pokemon_name, resolution)
+
+    return parse_pokemon_data(data)
 
 
 def calculate_type_effectiveness(
@@ -89,24 +130,9 @@ def calculate_type_effectiveness(
         defender_types: List of the defender's types
 
     Returns:
-        Effectiveness multiplier (0, 0.5, 1, 2, or 4)
+        Effectiveness multiplier of the attacker's best type (0, 0.25, 0.5, 1, 2, or 4)
     """
-    # Default effectiveness is neutral (1x)
-    effectiveness = 1.0
-
-    for attacker_type in attacker_types:
-        # Check for immunities first
-        if attacker_type in TYPE_IMMUNITIES:
-            if any(dtype in TYPE_IMMUNITIES[attacker_type] for dtype in defender_types):
-                return 0.0  # Immune, no damage
-
-        # Check for super effectiveness
-        if attacker_type in TYPE_ADVANTAGES:
-            for defender_type in defender_types:
-                if defender_type in TYPE_ADVANTAGES[attacker_type]:
-                    effectiveness *= 2.0  # Super effective
-
-    return effectiveness
+    return type_effectiveness(attacker_types, defender_types)
 
 
 def analyze_pokemon_battle(
@@ -130,33 +156,32 @@ def analyze_pokemon_battle(
         pokemon2["types"], pokemon1["types"]
     )
 
+    stats1 = numeric_base_stats(pokemon1)
+    stats2 = numeric_base_stats(pokemon2)
+
     # Calculate a simple battle score based on stats and type effectiveness
-    p1_attack = pokemon1["base_stats"]["attack"] * p1_type_effectiveness
-    p1_sp_attack = pokemon1["base_stats"]["special_attack"] * p1_type_effectiveness
+    p1_attack = stats1["attack"] * p1_type_effectiveness
+    p1_sp_attack = stats1["special_attack"] * p1_type_effectiveness
     p1_attack_power = max(p1_attack, p1_sp_attack)
 
-    p2_attack = pokemon2["base_stats"]["attack"] * p2_type_effectiveness
-    p2_sp_attack = pokemon2["base_stats"]["special_attack"] * p2_type_effectiveness
+    p2_attack = stats2["attack"] * p2_type_effectiveness
+    p2_sp_attack = stats2["special_attack"] * p2_type_effectiveness
     p2_attack_power = max(p2_attack, p2_sp_attack)
 
     # Calculate effective HP (HP * defense or special defense)
-    p1_defense = (
-        pokemon1["base_stats"]["defense"] + pokemon1["base_stats"]["special_defense"]
-    ) / 2
-    p2_defense = (
-        pokemon2["base_stats"]["defense"] + pokemon2["base_stats"]["special_defense"]
-    ) / 2
+    p1_defense = (stats1["defense"] + stats1["special_defense"]) / 2
+    p2_defense = (stats2["defense"] + stats2["special_defense"]) / 2
 
-    p1_effective_hp = pokemon1["base_stats"]["hp"] * (p1_defense / 100)
-    p2_effective_hp = pokemon2["base_stats"]["hp"] * (p2_defense / 100)
+    p1_effective_hp = stats1["hp"] * (p1_defense / 100)
+    p2_effective_hp = stats2["hp"] * (p2_defense / 100)
 
     # Approximate number of turns to defeat opponent
     p1_turns_to_win = p2_effective_hp / max(p1_attack_power, 1)
     p2_turns_to_win = p1_effective_hp / max(p2_attack_power, 1)
 
     # Speed advantage (who attacks first)
-    p1_speed = pokemon1["base_stats"]["speed"]
-    p2_speed = pokemon2["base_stats"]["speed"]
+    p1_speed = stats1["speed"]
+    p2_speed = stats2["speed"]
 
     # Determine the winner
     reasoning_factors = []
@@ -205,7 +230,7 @@ def analyze_pokemon_battle(
     elif p2_speed > p1_speed:
         winner = pokemon2["name"]
     # If everything is equal, the one with higher HP wins
-    elif pokemon1["base_stats"]["hp"] > pokemon2["base_stats"]["hp"]:
+    elif stats1["hp"] > stats2["hp"]:
         winner = pokemon1["name"]
     else:
         winner = pokemon2["name"]
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _SyncCall:
+    """An in-flight sync call that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    In-flight request coalescing.
+
+    Concurrent callers asking for the same key share one execution of the
+    underlying call and all receive its result (or its exception), so upstream
+    traffic scales with the number of distinct keys instead of callers.
+    """
+
+    def __init__(self):
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self._sync_calls: Dict[Hashable, _SyncCall] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"executions": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` once for all concurrent callers of `key` on this event loop
+
+        Args:
+            key: Deduplication key
+            fn: Coroutine function to execute
+
+        Returns:
+            The shared result
+        """
+        # Tasks can only be awaited from the loop that created them
+        loop_key = (id(asyncio.get_running_loop()), key)
+        task = self._async_calls.get(loop_key)
+        if task is None:
+            # The call runs as its own task, so a caller going away (e.g. a
+            # disconnected client) doesn't cancel it for the others
+            task = asyncio.ensure_future(fn())
+            self._async_calls[loop_key] = task
+            task.add_done_callback(lambda done: self._finish(loop_key, done))
+            with self._lock:
+                self._stats["executions"] += 1
+        else:
+            with self._lock:
+                self._stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, loop_key: Tuple[int, Hashable], task: asyncio.Task) -> None:
+        if self._async_calls.get(loop_key) is task:
+            del self._async_calls[loop_key]
+        # Mark the exception as retrieved when every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def do_sync(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` once for all concurrent threads calling with `key`
+
+        Args:
+            key: Deduplication key
+            fn: Callable to execute
+
+        Returns:
+            The shared result
+        """
+        with self._lock:
+            call = self._sync_calls.get(key)
+            leader = call is None
+            if leader:
+                call = _SyncCall()
+                self._sync_calls[key] = call
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._sync_calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Execution and coalescing counters"""
+        with self._lock:
+            return dict(self._stats)
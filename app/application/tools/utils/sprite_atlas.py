@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Sprite Atlas
+
+Sprite preprocessing (black background removal and resizing) done with NumPy
+on whole images, and a batch builder that preprocesses every sprite variant
+of the offline Pokédex into an on-disk atlas: a raw RGBA pixel file opened
+with memory mapping plus a small JSON index, so rendering a battle never has
+to download or clean up a sprite.
+
+Usage:
+    python -m app.application.tools.utils.sprite_atlas build
+
+    or
+
+    python -m app.application.tools.utils.sprite_atlas build --output data/sprites.bin
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.application.tools.utils.pokeapi_client import get_pokeapi_client
+from app.application.tools.utils.pokedex import PokedexStore
+from app.domain.settings.constants import PATH_POKEDEX, PATH_SPRITE_ATLAS
+
+logger = logging.getLogger(__name__)
+
+SPRITE_SIDES = ("front", "back")
+SPRITE_VARIANTS = ("default", "female", "shiny", "shiny_female")
+
+# Largest sprite side after preprocessing
+SPRITE_MAX_SIZE = (400, 400)
+
+# Channels at or below this value count as black background
+BLACK_THRESHOLD = 10
+
+# Share of edge pixels that must be black for the background to be removed
+BLACK_EDGE_RATIO = 0.7
+
+
+def sprite_key(pokemon_name: str, sprite_side: str, sprite_variant: str) -> str:
+    """Key of a preprocessed sprite in the atlas and the sprite cache"""
+    return f"{pokemon_name}_{sprite_side}_{sprite_variant}"
+
+
+def select_sprite_url(
+    data: Dict[str, Any],
+    form_data: Optional[Dict[str, Any]],
+    sprite_variant: str = "default",
+    is_first_pokemon: bool = False,
+) -> Optional[str]:
+    """
+    Pick the sprite URL of a variant, falling back to the default sprite
+
+    Args:
+        data: /pokemon record
+        form_data: /pokemon-form record, if available
+        sprite_variant: Sprite variant to use (default, female, shiny, shiny_female)
+        is_first_pokemon: Whether this is the first Pokémon (uses back sprite if True)
+
+    Returns:
+        The sprite URL, or None if the Pokémon has no sprite
+    """
+    sprites = data["sprites"]
+
+    if is_first_pokemon:
+        # For the first Pokémon, we want the back sprite
+        if sprite_variant != "default" and sprites.get(f"back_{sprite_variant}"):
+            return sprites[f"back_{sprite_variant}"]
+        if sprites.get("back_default"):
+            return sprites["back_default"]
+        # If no back sprite is available, fall back to front sprite
+        return sprites.get("front_default")
+
+    # For the second Pokémon or if not first Pokemon specified, use front sprites
+    if form_data and "sprites" in form_data:
+        form_sprites = form_data["sprites"]
+        if sprite_variant != "default" and form_sprites.get(f"front_{sprite_variant}"):
+            return form_sprites[f"front_{sprite_variant}"]
+        return form_sprites.get("front_default")
+
+    # Fall back to standard sprites if form data is not available
+    # Try official artwork first, then standard sprite
+    other = sprites.get("other") or {}
+    for source in ("official-artwork", "home"):
+        if (other.get(source) or {}).get("front_default"):
+            return other[source]["front_default"]
+    return sprites.get("front_default")
+
+
+def remove_black_background(pixels: np.ndarray) -> np.ndarray:
+    """
+    Make the black background of an opaque sprite transparent
+
+    Sprites that already use transparency are returned unchanged, as are
+    sprites whose edges are mostly not black (they likely have intended black
+    parts).
+
+    Args:
+        pixels: (H, W, 4) uint8 RGBA array
+
+    Returns:
+        The array, with black pixels cleared if the background was black
+    """
+    if (pixels[..., 3] < 255).any():
+        return pixels
+
+    # Top, bottom, left and right edges (corners count twice)
+    edges = np.concatenate([pixels[0], pixels[-1], pixels[:, 0], pixels[:, -1]])[:, :3]
+    black_edges = np.count_nonzero((edges < BLACK_THRESHOLD).all(axis=1))
+    if black_edges <= len(edges) * BLACK_EDGE_RATIO:
+        return pixels
+
+    pixels = pixels.copy()
+    pixels[(pixels[..., :3] < BLACK_THRESHOLD).all(axis=2)] = 0
+    return pixels
+
+
+def preprocess_sprite(sprite: Image.Image) -> Image.Image:
+    """
+    Convert a downloaded sprite to RGBA, remove its black background and
+    shrink it to fit SPRITE_MAX_SIZE
+
+    Args:
+        sprite: Sprite as downloaded
+
+    Returns:
+        The preprocessed sprite
+    """
+    pixels = remove_black_background(np.asarray(sprite.convert("RGBA")))
+    sprite = Image.fromarray(pixels)
+    # Resize to a reasonable size (preserve aspect ratio)
+    sprite.thumbnail(SPRITE_MAX_SIZE, Image.LANCZOS)
+    return sprite
+
+
+def _index_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".json"
+
+
+class SpriteAtlas:
+    """
+    Memory-mapped view over a sprite atlas.
+
+    Pixels of every sprite are stored back to back in one raw uint8 file; the
+    index maps sprite keys to (offset, height, width). Variants that fall back
+    to the same image share their pixels.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._pixels: Optional[np.ndarray] = None
+
+        if path and os.path.exists(path) and os.path.exists(_index_path(path)):
+            with open(_index_path(path)) as f:
+                self._index = {key: tuple(entry) for key, entry in json.load(f).items()}
+            if os.path.getsize(path) > 0:
+                self._pixels = np.memmap(path, dtype=np.uint8, mode="r")
+            logger.info(f"Sprite atlas loaded: {len(self._index)} sprites")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def get(self, key: str) -> Optional[Image.Image]:
+        """
+        Get a preprocessed sprite
+
+        Args:
+            key: Key built with sprite_key
+
+        Returns:
+            The sprite, or None if the atlas doesn't have it
+        """
+        entry = self._index.get(key)
+        if entry is None or self._pixels is None:
+            return None
+        offset, height, width = entry
+        pixels = self._pixels[offset : offset + height * width * 4]
+        return Image.fromarray(pixels.reshape(height, width, 4))
+
+
+def write_sprite_atlas(
+    path: str, sprites: Dict[str, Optional[str]], images: Dict[str, Image.Image]
+) -> int:
+    """
+    Write a sprite atlas atomically
+
+    Args:
+        path: Destination pixel file (the index is written next to it)
+        sprites: Sprite key -> URL of its image
+        images: URL -> preprocessed image
+
+    Returns:
+        Number of sprites indexed
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    offsets: Dict[str, Tuple[int, int, int]] = {}
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".bin.tmp")
+    tmp_index_path = None
+    try:
+        offset = 0
+        with os.fdopen(fd, "wb") as f:
+            for url, image in images.items():
+                pixels = np.ascontiguousarray(np.asarray(image.convert("RGBA")))
+                f.write(pixels.tobytes())
+                offsets[url] = (offset, pixels.shape[0], pixels.shape[1])
+                offset += pixels.nbytes
+
+        index = {key: offsets[url] for key, url in sprites.items() if url in offsets}
+        fd, tmp_index_path = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
+        os.replace(tmp_index_path, _index_path(path))
+    except Exception:
+        for leftover in (tmp_path, tmp_index_path):
+            if leftover and os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+    return len(index)
+
+
+async def download_sprites(urls: List[str]) -> Dict[str, Image.Image]:
+    """
+    Download and preprocess sprites
+
+    Args:
+        urls: Sprite URLs
+
+    Returns:
+        URL -> preprocessed image, for every URL that could be downloaded
+    """
+
+    async def load(url: str) -> Optional[Image.Image]:
+        # One failed sprite leaves a gap in the atlas instead of aborting the build
+        try:
+            response = await get_pokeapi_client().get(url)
+            if response.status_code != 200:
+                logger.warning(f"Skipping {url}: HTTP {response.status_code}")
+                return None
+            return preprocess_sprite(Image.open(io.BytesIO(response.content)))
+        except Exception as e:
+            logger.warning(f"Skipping {url}: {str(e)}")
+            return None
+
+    # Concurrency is bounded by the shared client's semaphore
+    loaded = await asyncio.gather(*(load(url) for url in urls))
+    return {url: image for url, image in zip(urls, loaded) if image is not None}
+
+
+def build_sprite_atlas(
+    path: str = PATH_SPRITE_ATLAS, pokedex_path: str = PATH_POKEDEX
+) -> int:
+    """
+    Preprocess every sprite variant (front/back, shiny, female) of the
+    offline Pokédex into an atlas
+
+    Args:
+        path: Destination pixel file
+        pokedex_path: Pokédex snapshot to read
+
+    Returns:
+        Number of sprites indexed
+    """
+    store = PokedexStore(pokedex_path)
+    if len(store) == 0:
+        raise ValueError(
+            f"No Pokédex snapshot at {pokedex_path}, build it first with "
+            "`python -m app.application.tools.utils.pokedex build`"
+        )
+
+    sprites = {}
+    for name in store.names():
+        data = store.get_pokemon(name)
+        form_data = store.get_form(name)
+        for side in SPRITE_SIDES:
+            for variant in SPRITE_VARIANTS:
+                sprites[sprite_key(name, side, variant)] = select_sprite_url(
+                    data, form_data, variant, is_first_pokemon=side == "back"
+                )
+
+    urls = sorted({url for url in sprites.values() if url})
+    images = asyncio.run(download_sprites(urls))
+    return write_sprite_atlas(path, sprites, images)
+
+
+_atlas: Optional[SpriteAtlas] = None
+_atlas_lock = threading.Lock()
+
+
+def get_sprite_atlas() -> SpriteAtlas:
+    """Get the process-wide sprite atlas (empty if it has not been built)"""
+    global _atlas
+    if _atlas is None:
+        with _atlas_lock:
+            if _atlas is None:
+                _atlas = SpriteAtlas(PATH_SPRITE_ATLAS)
+    return _atlas
+
+
+def main():
+    """Main function to parse arguments and run the requested command"""
+    parser = argparse.ArgumentParser(description="Sprite atlas tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="Download and preprocess every sprite of the offline Pokédex"
+    )
+    build_parser.add_argument(
+        "--output", "-o", type=str, default=PATH_SPRITE_ATLAS, help="Atlas file path"
+    )
+    build_parser.add_argument(
+        "--pokedex", "-p", type=str, default=PATH_POKEDEX, help="Pokédex snapshot path"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(f"Building sprite atlas at {args.output}...")
+        try:
+            count = build_sprite_atlas(args.output, args.pokedex)
+            print(f"Sprite atlas built with {count} sprites")
+        except Exception as e:
+            print(f"Error building sprite atlas: {str(e)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
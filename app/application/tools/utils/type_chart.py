@@ -0,0 +1,270 @@
+"""
+Type chart shared by the battle analysis and the battle renderer.
+
+The 18x18 attacker x defender matrix and the table of every defender type
+combination (18 single types + 153 dual types = 171) are built once at import,
+so any single or dual-type multiplier is one indexed lookup.
+"""
+
+from itertools import combinations_with_replacement
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+TYPES: Tuple[str, ...] = (
+    "normal",
+    "fire",
+    "water",
+    "electric",
+    "grass",
+    "ice",
+    "fighting",
+    "poison",
+    "ground",
+    "flying",
+    "psychic",
+    "bug",
+    "rock",
+    "ghost",
+    "dragon",
+    "dark",
+    "steel",
+    "fairy",
+)
+
+TYPE_INDEX: Dict[str, int] = {name: i for i, name in enumerate(TYPES)}
+
+# Format: attacking -> defending -> effectiveness (only non-neutral matchups)
+_CHART: Dict[str, Dict[str, float]] = {
+    "normal": {"rock": 0.5, "ghost": 0, "steel": 0.5},
+    "fire": {
+        "fire": 0.5,
+        "water": 0.5,
+        "grass": 2,
+        "ice": 2,
+        "bug": 2,
+        "rock": 0.5,
+        "dragon": 0.5,
+        "steel": 2,
+    },
+    "water": {
+        "fire": 2,
+        "water": 0.5,
+        "grass": 0.5,
+        "ground": 2,
+        "rock": 2,
+        "dragon": 0.5,
+    },
+    "electric": {
+        "water": 2,
+        "electric": 0.5,
+        "grass": 0.5,
+        "ground": 0,
+        "flying": 2,
+        "dragon": 0.5,
+    },
+    "grass": {
+        "fire": 0.5,
+        "water": 2,
+        "grass": 0.5,
+        "poison": 0.5,
+        "ground": 2,
+        "flying": 0.5,
+        "bug": 0.5,
+        "rock": 2,
+        "dragon": 0.5,
+        "steel": 0.5,
+    },
+    "ice": {
+        "fire": 0.5,
+        "water": 0.5,
+        "grass": 2,
+        "ice": 0.5,
+        "ground": 2,
+        "flying": 2,
+        "dragon": 2,
+        "steel": 0.5,
+    },
+    "fighting": {
+        "normal": 2,
+        "ice": 2,
+        "poison": 0.5,
+        "flying": 0.5,
+        "psychic": 0.5,
+        "bug": 0.5,
+        "rock": 2,
+        "ghost": 0,
+        "dark": 2,
+        "steel": 2,
+        "fairy": 0.5,
+    },
+    "poison": {
+        "grass": 2,
+        "poison": 0.5,
+        "ground": 0.5,
+        "rock": 0.5,
+        "ghost": 0.5,
+        "steel": 0,
+        "fairy": 2,
+    },
+    "ground": {
+        "fire": 2,
+        "electric": 2,
+        "grass": 0.5,
+        "poison": 2,
+        "flying": 0,
+        "bug": 0.5,
+        "rock": 2,
+        "steel": 2,
+    },
+    "flying": {
+        "electric": 0.5,
+        "grass": 2,
+        "fighting": 2,
+        "bug": 2,
+        "rock": 0.5,
+        "steel": 0.5,
+    },
+    "psychic": {
+        "fighting": 2,
+        "poison": 2,
+        "psychic": 0.5,
+        "dark": 0,
+        "steel": 0.5,
+    },
+    "bug": {
+        "fire": 0.5,
+        "grass": 2,
+        "fighting": 0.5,
+        "poison": 0.5,
+        "flying": 0.5,
+        "psychic": 2,
+        "ghost": 0.5,
+        "dark": 2,
+        "steel": 0.5,
+        "fairy": 0.5,
+    },
+    "rock": {
+        "fire": 2,
+        "ice": 2,
+        "fighting": 0.5,
+        "ground": 0.5,
+        "flying": 2,
+        "bug": 2,
+        "steel": 0.5,
+    },
+    "ghost": {"normal": 0, "psychic": 2, "ghost": 2, "dark": 0.5},
+    "dragon": {"dragon": 2, "steel": 0.5, "fairy": 0},
+    "dark": {"fighting": 0.5, "psychic": 2, "ghost": 2, "dark": 0.5, "fairy": 0.5},
+    "steel": {
+        "fire": 0.5,
+        "water": 0.5,
+        "electric": 0.5,
+        "ice": 2,
+        "rock": 2,
+        "steel": 0.5,
+        "fairy": 2,
+    },
+    "fairy": {
+        "fire": 0.5,
+        "fighting": 2,
+        "poison": 0.5,
+        "dragon": 2,
+        "dark": 2,
+        "steel": 0.5,
+    },
+}
+
+
+def _build_matrix() -> np.ndarray:
+    matrix = np.ones((len(TYPES), len(TYPES)), dtype=np.float64)
+    for attacker, row in _CHART.items():
+        for defender, value in row.items():
+            matrix[TYPE_INDEX[attacker], TYPE_INDEX[defender]] = value
+    matrix.flags.writeable = False
+    return matrix
+
+
+# EFFECTIVENESS_MATRIX[attacker, defender]
+EFFECTIVENESS_MATRIX: np.ndarray = _build_matrix()
+
+# Every defender type combination; single types are stored as (i, i)
+DEFENDER_COMBOS: List[Tuple[int, int]] = list(
+    combinations_with_replacement(range(len(TYPES)), 2)
+)
+COMBO_INDEX: Dict[Tuple[int, int], int] = {}
+for _k, (_i, _j) in enumerate(DEFENDER_COMBOS):
+    COMBO_INDEX[(_i, _j)] = _k
+    COMBO_INDEX[(_j, _i)] = _k
+
+
+def _build_defender_table() -> np.ndarray:
+    first = np.array([i for i, _ in DEFENDER_COMBOS])
+    second = np.array([j for _, j in DEFENDER_COMBOS])
+    table = EFFECTIVENESS_MATRIX[:, first] * np.where(
+        first == second, 1.0, EFFECTIVENESS_MATRIX[:, second]
+    )
+    table.flags.writeable = False
+    return table
+
+
+# DEFENDER_TABLE[attacking type, defender combo]
+DEFENDER_TABLE: np.ndarray = _build_defender_table()
+
+
+def type_indices(types: List[str]) -> List[int]:
+    """Indices of the known types in a type list (unknown types are ignored)"""
+    return [TYPE_INDEX[t] for t in types if t in TYPE_INDEX]
+
+
+def defender_combo_index(types: List[str]) -> Optional[int]:
+    """
+    Index of a defender's type combination in DEFENDER_TABLE
+
+    Args:
+        types: One or two type names
+
+    Returns:
+        Combination index, or None if no known type is given
+    """
+    indices = type_indices(types)
+    if not indices:
+        return None
+    first = indices[0]
+    second = indices[1] if len(indices) > 1 else first
+    return COMBO_INDEX[(first, second)]
+
+
+def type_multiplier(attack_type: str, defender_types: List[str]) -> float:
+    """
+    Multiplier of a single attacking type against a (dual-type) defender
+
+    Args:
+        attack_type: Attacking move type
+        defender_types: Defender's types
+
+    Returns:
+        Multiplier (0, 0.25, 0.5, 1, 2 or 4)
+    """
+    combo = defender_combo_index(defender_types)
+    if attack_type not in TYPE_INDEX or combo is None:
+        return 1.0
+    return float(DEFENDER_TABLE[TYPE_INDEX[attack_type], combo])
+
+
+def type_effectiveness(attacker_types: List[str], defender_types: List[str]) -> float:
+    """
+    Best multiplier an attacker can get from its own types against a defender
+
+    Args:
+        attacker_types: Attacker's types
+        defender_types: Defender's types
+
+    Returns:
+        Multiplier (0, 0.25, 0.5, 1, 2 or 4)
+    """
+    attackers = type_indices(attacker_types)
+    combo = defender_combo_index(defender_types)
+    if not attackers or combo is None:
+        return 1.0
+    return float(DEFENDER_TABLE[attackers, combo].max())
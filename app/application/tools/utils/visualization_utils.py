@@ -1,19 +1,40 @@
 import os
 import io
-import requests
 from PIL import Image, ImageDraw, ImageFont
-import imageio
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterator, List, Tuple, Optional
 import random
 import numpy as np
-import time
-import json
 from functools import lru_cache
 
-# Simple file-based cache for PokeAPI responses
-CACHE_DIR = os.path.join(os.environ.get("TEMP_DIR", "/tmp"), "pokeapi_cache")
+from app.application.tools.utils.name_resolver import resolve_pokemon_name
+from app.application.tools.utils.pokeapi_client import (
+    afetch_resource,
+    fetch_resource,
+    get_pokeapi_client,
+)
+from app.application.tools.utils.pokedex import get_pokedex
+from app.application.tools.utils.animation_encoder import encode_animation
+from app.application.tools.utils.cache import (
+    battle_animation_key,
+    get_battle_animation_cache,
+    get_pokeapi_cache,
+)
+from app.application.tools.utils.sprite_atlas import (
+    get_sprite_atlas,
+    preprocess_sprite,
+    select_sprite_url,
+    sprite_key,
+)
+from app.application.tools.utils.type_chart import type_effectiveness
+from app.domain.settings.constants import BATTLE_ANIMATION_FORMAT, CACHE_DIR
+
+# Sprite images are cached as PNG files; JSON responses go through the shared
+# two-tier cache used by every PokéAPI caller
 os.makedirs(CACHE_DIR, exist_ok=True)
 
+# Sprites decoded ahead of time by preload_sprites, keyed like the atlas
+_preloaded_sprites: Dict[str, Image.Image] = {}
+
 
 def get_cached_data(cache_key: str) -> Optional[Dict[str, Any]]:
     """
@@ -25,14 +46,7 @@ def get_cached_data(cache_key: str) -> Optional[Dict[str, Any]]:
     Returns:
         Cached data or None if not found
     """
-    cache_file = os.path.join(CACHE_DIR, f"{cache_key}.json")
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, "r") as f:
-                return json.load(f)
-        except Exception:
-            return None
-    return None
+    return get_pokeapi_cache().get(cache_key)
 
 
 def save_cached_data(cache_key: str, data: Dict[str, Any]) -> None:
@@ -43,12 +57,7 @@ def save_cached_data(cache_key: str, data: Dict[str, Any]) -> None:
         cache_key: Cache key to save under
         data: Data to cache
     """
-    cache_file = os.path.join(CACHE_DIR, f"{cache_key}.json")
-    try:
-        with open(cache_file, "w") as f:
-            json.dump(data, f)
-    except Exception:
-        pass
+    get_pokeapi_cache().set(cache_key, data)
 
 
 def get_cached_image(cache_key: str) -> Optional[Image.Image]:
@@ -85,6 +94,18 @@ def save_cached_image(cache_key: str, img: Image.Image) -> None:
         pass
 
 
+def _missing_pokemon_data(pokemon_name: str) -> Dict[str, Any]:
+    """Minimal data structure returned when a Pokémon can't be fetched"""
+    return {
+        "name": pokemon_name,
+        "missing": True,
+        "sprites": {
+            "front_default": None,
+            "other": {"official-artwork": {"front_default": None}},
+        },
+    }
+
+
 def get_pokemon_data(pokemon_name: str) -> Dict[str, Any]:
     """
     Get Pokémon data from the PokéAPI with caching
@@ -95,37 +116,56 @@ def get_pokemon_data(pokemon_name: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing Pokémon data
     """
-    # Normalize the Pokémon name for consistent caching
-    pokemon_name = (
-        pokemon_name.lower().replace(" ", "-").replace(".", "").replace("'", "")
-    )
+    # Resolve the canonical PokéAPI name for consistent caching
+    pokemon_name = resolve_pokemon_name(pokemon_name)
+
+    # The offline snapshot answers known names without touching the network
+    snapshot_data = get_pokedex().get_pokemon(pokemon_name)
+    if snapshot_data:
+        return snapshot_data
+
+    # Fetch through the shared two-tier cache
+    try:
+        data = fetch_resource("pokemon", pokemon_name)
+        if data is None:
+            raise ValueError("not found")
+
+        return data
+    except Exception as e:
+        print(f"Error fetching Pokemon data for {pokemon_name}: {str(e)}")
+        # Return minimal data structure to avoid downstream errors
+        return _missing_pokemon_data(pokemon_name)
+
+
+async def aget_pokemon_data(pokemon_name: str) -> Dict[str, Any]:
+    """
+    Get Pokémon data from the PokéAPI with caching, without blocking the event loop
 
-    # Check cache first
-    cache_key = f"pokemon_{pokemon_name}"
-    cached_data = get_cached_data(cache_key)
-    if cached_data:
-        return cached_data
+    Args:
+        pokemon_name: Name of the Pokémon
+
+    Returns:
+        Dictionary containing Pokémon data
+    """
+    # Resolve the canonical PokéAPI name for consistent caching
+    pokemon_name = resolve_pokemon_name(pokemon_name)
+
+    # The offline snapshot answers known names without touching the network
+    snapshot_data = get_pokedex().get_pokemon(pokemon_name)
+    if snapshot_data:
+        return snapshot_data
 
-    # If not in cache, fetch from API
+    # Fetch through the shared two-tier cache
     try:
-        url = f"https://pokeapi.co/api/v2/pokemon/{pokemon_name}"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = await afetch_resource("pokemon", pokemon_name)
+        if data is None:
+            raise ValueError("not found")
 
-        # Cache the data
-        save_cached_data(cache_key, data)
         return data
     except Exception as e:
         print(f"Error fetching Pokemon data for {pokemon_name}: {str(e)}")
         # Return minimal data structure to avoid downstream errors
-        return {
-            "name": pokemon_name,
-            "sprites": {
-                "front_default": None,
-                "other": {"official-artwork": {"front_default": None}},
-            },
-        }
+        return _missing_pokemon_data(pokemon_name)
 
 
 def get_pokemon_sprite(
@@ -142,145 +182,48 @@ def get_pokemon_sprite(
     Returns:
         PIL Image object of the Pokémon sprite
     """
-    # Normalize the Pokémon name for consistent caching
-    pokemon_name = (
-        pokemon_name.lower().replace(" ", "-").replace(".", "").replace("'", "")
-    )
+    # Resolve the canonical PokéAPI name for consistent caching
+    pokemon_name = resolve_pokemon_name(pokemon_name)
 
     # Define the sprite side (back for first Pokémon, front for second)
     sprite_side = "back" if is_first_pokemon else "front"
 
+    # The prebuilt atlas has every variant already preprocessed
+    key = sprite_key(pokemon_name, sprite_side, sprite_variant)
+    preloaded = _preloaded_sprites.get(key)
+    if preloaded is not None:
+        return preloaded
+
+    atlas_sprite = get_sprite_atlas().get(key)
+    if atlas_sprite is not None:
+        return atlas_sprite
+
     # Check sprite cache first
-    cache_key = f"sprite_{pokemon_name}_{sprite_side}_{sprite_variant}"
+    cache_key = f"sprite_{key}"
     cached_sprite = get_cached_image(cache_key)
     if cached_sprite:
         return cached_sprite
 
     try:
-        # First try to get the form data which has better sprite options
-        form_data = get_pokemon_form_data(pokemon_name)
         data = get_pokemon_data(pokemon_name)
+        if data.get("missing"):
+            # Unknown Pokémon: don't ask the PokéAPI for its form or sprite
+            raise ValueError("Pokémon not found")
 
-        # Try different sprite sources in order of preference
-        sprite_url = None
-
-        # Determine the appropriate sprite URL based on variant and whether it's the first Pokemon
-        if is_first_pokemon:
-            # For the first Pokémon, we want the back sprite
-            if (
-                sprite_variant == "female"
-                and "back_female" in data["sprites"]
-                and data["sprites"]["back_female"]
-            ):
-                sprite_url = data["sprites"]["back_female"]
-            elif (
-                sprite_variant == "shiny"
-                and "back_shiny" in data["sprites"]
-                and data["sprites"]["back_shiny"]
-            ):
-                sprite_url = data["sprites"]["back_shiny"]
-            elif (
-                sprite_variant == "shiny_female"
-                and "back_shiny_female" in data["sprites"]
-                and data["sprites"]["back_shiny_female"]
-            ):
-                sprite_url = data["sprites"]["back_shiny_female"]
-            elif "back_default" in data["sprites"] and data["sprites"]["back_default"]:
-                sprite_url = data["sprites"]["back_default"]
-            else:
-                # If no back sprite is available, fall back to front sprite
-                sprite_url = data["sprites"]["front_default"]
-        else:
-            # For the second Pokémon or if not first Pokemon specified, use front sprites
-            if form_data and "sprites" in form_data:
-                sprites = form_data["sprites"]
-
-                # Select the appropriate sprite based on the variant
-                if sprite_variant == "female" and sprites.get("front_female"):
-                    sprite_url = sprites["front_female"]
-                elif sprite_variant == "shiny" and sprites.get("front_shiny"):
-                    sprite_url = sprites["front_shiny"]
-                elif sprite_variant == "shiny_female" and sprites.get(
-                    "front_shiny_female"
-                ):
-                    sprite_url = sprites["front_shiny_female"]
-                else:
-                    # Default to front_default
-                    sprite_url = sprites.get("front_default")
-            else:
-                # Fall back to standard sprites if form data is not available
-                # Try official artwork first, then standard sprite
-                if data["sprites"]["other"]["official-artwork"]["front_default"]:
-                    sprite_url = data["sprites"]["other"]["official-artwork"][
-                        "front_default"
-                    ]
-                elif (
-                    "home" in data["sprites"]["other"]
-                    and data["sprites"]["other"]["home"]["front_default"]
-                ):
-                    sprite_url = data["sprites"]["other"]["home"]["front_default"]
-                elif data["sprites"]["front_default"]:
-                    sprite_url = data["sprites"]["front_default"]
+        # The form data has better sprite options
+        form_data = get_pokemon_form_data(pokemon_name)
+
+        sprite_url = select_sprite_url(
+            data, form_data, sprite_variant, is_first_pokemon
+        )
 
         if sprite_url:
-            # Get the sprite image
-            response = requests.get(sprite_url)
+            # Get the sprite image through the shared pooled client
+            response = get_pokeapi_client().get_sync(sprite_url)
             response.raise_for_status()
 
-            # Convert to PIL Image
-            sprite = Image.open(io.BytesIO(response.content))
-
-            # Ensure transparency
-            if sprite.mode != "RGBA":
-                sprite = sprite.convert("RGBA")
-
-            # Create a mask for the sprite to maintain transparency
-            # This helps eliminate any black backgrounds
-            # Pixels with RGB values close to black are made transparent
-            data = sprite.getdata()
-            new_data = []
-
-            # Check if the image already has transparency
-            has_transparency = sprite.mode == "RGBA" and any(
-                item[3] < 255 for item in data
-            )
-
-            # Only process if the image doesn't already have transparency
-            if not has_transparency:
-                # Check outer edges for background color (usually black in Pokemon sprites)
-                width, height = sprite.size
-                edge_pixels = []
-
-                # Sample pixels from the edges of the image
-                for x in range(width):
-                    edge_pixels.append(data[x])  # Top edge
-                    edge_pixels.append(data[(height - 1) * width + x])  # Bottom edge
-
-                for y in range(height):
-                    edge_pixels.append(data[y * width])  # Left edge
-                    edge_pixels.append(data[y * width + width - 1])  # Right edge
-
-                # Count black and near-black pixels on the edges
-                bg_color_count = sum(
-                    1 for p in edge_pixels if p[0] < 10 and p[1] < 10 and p[2] < 10
-                )
-
-                # If most edge pixels are black, we should remove the black background
-                if bg_color_count > len(edge_pixels) * 0.7:
-                    for item in data:
-                        # More conservative approach: only make pixels transparent if they're very black
-                        # and based on alpha if available
-                        if item[0] < 10 and item[1] < 10 and item[2] < 10:
-                            # Very black pixel - make transparent
-                            new_data.append((0, 0, 0, 0))
-                        else:
-                            # Keep the original pixel
-                            new_data.append(item)
-                    sprite.putdata(new_data)
-                # Otherwise, keep the image as is (it likely has intended black parts)
-
-            # Resize to a reasonable size (preserve aspect ratio)
-            sprite.thumbnail((400, 400), Image.LANCZOS)
+            # Remove black backgrounds and resize
+            sprite = preprocess_sprite(Image.open(io.BytesIO(response.content)))
 
             # Cache the processed sprite
             save_cached_image(cache_key, sprite)
@@ -306,26 +249,50 @@ def get_pokemon_form_data(pokemon_name: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing Pokémon form data
     """
-    # Normalize the Pokémon name for consistent caching
-    pokemon_name = (
-        pokemon_name.lower().replace(" ", "-").replace(".", "").replace("'", "")
-    )
+    # Resolve the canonical PokéAPI name for consistent caching
+    pokemon_name = resolve_pokemon_name(pokemon_name)
 
-    # Check cache first
-    cache_key = f"pokemon_form_{pokemon_name}"
-    cached_data = get_cached_data(cache_key)
-    if cached_data:
-        return cached_data
+    # The offline snapshot answers known names without touching the network
+    snapshot_data = get_pokedex().get_form(pokemon_name)
+    if snapshot_data:
+        return snapshot_data
 
-    # If not in cache, fetch from API
+    # Fetch through the shared two-tier cache
     try:
-        url = f"https://pokeapi.co/api/v2/pokemon-form/{pokemon_name}"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = fetch_resource("pokemon-form", pokemon_name)
+        if data is None:
+            raise ValueError("not found")
+
+        return data
+    except Exception as e:
+        print(f"Error fetching Pokemon form data for {pokemon_name}: {str(e)}")
+        return None
+
+
+async def aget_pokemon_form_data(pokemon_name: str) -> Dict[str, Any]:
+    """
+    Get Pokémon form data from the PokéAPI with caching, without blocking the event loop
+
+    Args:
+        pokemon_name: Name of the Pokémon
+
+    Returns:
+        Dictionary containing Pokémon form data
+    """
+    # Resolve the canonical PokéAPI name for consistent caching
+    pokemon_name = resolve_pokemon_name(pokemon_name)
+
+    # The offline snapshot answers known names without touching the network
+    snapshot_data = get_pokedex().get_form(pokemon_name)
+    if snapshot_data:
+        return snapshot_data
+
+    # Fetch through the shared two-tier cache
+    try:
+        data = await afetch_resource("pokemon-form", pokemon_name)
+        if data is None:
+            raise ValueError("not found")
 
-        # Cache the data
-        save_cached_data(cache_key, data)
         return data
     except Exception as e:
         print(f"Error fetching Pokemon form data for {pokemon_name}: {str(e)}")
@@ -370,6 +337,192 @@ def create_health_bar(
     return bar
 
 
+FRAME_SIZE = (800, 500)
+
+# Layout of the battle scene
+PLATFORM1 = (200, 340)
+PLATFORM2 = (600, 290)
+NAME_BOX1 = (50, 50)
+NAME_BOX2 = (550, 50)
+NAME_BOX_SIZE = (180, 70)
+HEALTH_BAR_OFFSET = (10, 40)
+HEALTH_BAR_WIDTH = 160
+MESSAGE_BOX = (10, 400)
+MESSAGE_BOX_SIZE = (780, 90)
+MESSAGE_LINE_WIDTH = 60  # characters per line
+
+
+@lru_cache(maxsize=1)
+def get_battle_fonts() -> Tuple[ImageFont.ImageFont, ImageFont.ImageFont]:
+    """
+    Load the name and message fonts once per process
+
+    Returns:
+        Tuple of (name font, message font), PIL's default font if Arial is missing
+    """
+    try:
+        return ImageFont.truetype("arial.ttf", 22), ImageFont.truetype("arial.ttf", 18)
+    except IOError:
+        return ImageFont.load_default(), ImageFont.load_default()
+
+
+@lru_cache(maxsize=1)
+def get_sky_background() -> Image.Image:
+    """
+    Sky gradient and ground of the battle field, built once with NumPy
+
+    Returns:
+        PIL Image of the empty battle field (treat as read-only)
+    """
+    width, height = FRAME_SIZE
+    y = np.arange(height) / height
+    row = np.stack(
+        [
+            (176 + y * 64).astype(np.uint8),
+            (224 + y * 31).astype(np.uint8),
+            (230 + y * 25).astype(np.uint8),
+        ],
+        axis=-1,
+    )
+    field = Image.fromarray(
+        np.ascontiguousarray(np.broadcast_to(row[:, None, :], (height, width, 3)))
+    )
+
+    draw = ImageDraw.Draw(field)
+    # Green ground
+    draw.rectangle([(0, 380), (800, 500)], fill=(76, 187, 23))
+    # Dividing line
+    draw.line([(0, 380), (800, 380)], fill=(50, 50, 50), width=2)
+    return field
+
+
+def _name_box(pokemon_name: str) -> Image.Image:
+    font, _ = get_battle_fonts()
+    name_box = Image.new("RGBA", NAME_BOX_SIZE, (255, 255, 255, 180))
+    name_draw = ImageDraw.Draw(name_box)
+    name_draw.rectangle(
+        [(0, 0), (NAME_BOX_SIZE[0] - 1, NAME_BOX_SIZE[1] - 1)], outline=(0, 0, 0)
+    )
+    name_draw.text((10, 10), pokemon_name.capitalize(), fill=(0, 0, 0), font=font)
+    return name_box
+
+
+class BattleScene:
+    """
+    Layered battle renderer.
+
+    The background, field decorations, shadows, sprites, name boxes and the
+    empty message box are composited once per battle; each frame is a copy of
+    that base with only the health bars and the message text drawn on top.
+    """
+
+    def __init__(
+        self,
+        pokemon1_sprite: Image.Image,
+        pokemon2_sprite: Image.Image,
+        pokemon1_name: str,
+        pokemon2_name: str,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Build the static layers of a battle
+
+        Args:
+            pokemon1_sprite: Sprite of the first Pokémon
+            pokemon2_sprite: Sprite of the second Pokémon
+            pokemon1_name: Name of the first Pokémon
+            pokemon2_name: Name of the second Pokémon
+            rng: Random generator for the decorations (the random module by default)
+        """
+        rng = rng if rng is not None else random
+        base = get_sky_background().copy()
+        draw = ImageDraw.Draw(base)
+
+        # Add some details to the battlefield
+        # Add small circles for decoration
+        for i in range(10):
+            x = rng.randint(50, 750)
+            y = rng.randint(400, 480)
+            size = rng.randint(5, 15)
+            color = (
+                rng.randint(50, 100),
+                rng.randint(160, 200),
+                rng.randint(20, 50),
+            )
+            draw.ellipse([(x - size, y - size), (x + size, y + size)], fill=color)
+
+        for sprite, (platform_x, platform_y) in (
+            (pokemon1_sprite, PLATFORM1),
+            (pokemon2_sprite, PLATFORM2),
+        ):
+            # Shadow on the ground, sprite centered above it; larger sprites
+            # need more vertical offset
+            shadow = create_pokemon_shadow(sprite)
+            base.paste(shadow, (platform_x - shadow.width // 2, platform_y - 5), shadow)
+            y_offset = int(sprite.height / 2.5)
+            base.paste(
+                sprite,
+                (platform_x - sprite.width // 2, platform_y - sprite.height + y_offset),
+                sprite,
+            )
+
+        for name, position in ((pokemon1_name, NAME_BOX1), (pokemon2_name, NAME_BOX2)):
+            name_box = _name_box(name)
+            base.paste(name_box, position, name_box)
+
+        message_box = Image.new("RGBA", MESSAGE_BOX_SIZE, (255, 255, 255, 220))
+        message_draw = ImageDraw.Draw(message_box)
+        message_draw.rectangle(
+            [(0, 0), (MESSAGE_BOX_SIZE[0] - 1, MESSAGE_BOX_SIZE[1] - 1)],
+            outline=(0, 0, 0),
+            width=2,
+        )
+        base.paste(message_box, MESSAGE_BOX, message_box)
+
+        self.base = base
+
+    def render(
+        self, pokemon1_health: float, pokemon2_health: float, message: str = ""
+    ) -> Image.Image:
+        """
+        Render one frame
+
+        Args:
+            pokemon1_health: Health percentage of the first Pokémon (0.0 to 1.0)
+            pokemon2_health: Health percentage of the second Pokémon (0.0 to 1.0)
+            message: Battle message to display
+
+        Returns:
+            PIL Image of the battle frame
+        """
+        frame = self.base.copy()
+
+        for health, (box_x, box_y) in (
+            (pokemon1_health, NAME_BOX1),
+            (pokemon2_health, NAME_BOX2),
+        ):
+            health_bar = create_health_bar(health, width=HEALTH_BAR_WIDTH)
+            frame.paste(
+                health_bar,
+                (box_x + HEALTH_BAR_OFFSET[0], box_y + HEALTH_BAR_OFFSET[1]),
+                health_bar,
+            )
+
+        _, small_font = get_battle_fonts()
+        draw = ImageDraw.Draw(frame)
+        y_position = MESSAGE_BOX[1] + 10
+        for i in range(0, len(message), MESSAGE_LINE_WIDTH):
+            draw.text(
+                (MESSAGE_BOX[0] + 20, y_position),
+                message[i : i + MESSAGE_LINE_WIDTH],
+                fill=(0, 0, 0),
+                font=small_font,
+            )
+            y_position += 24
+
+        return frame
+
+
 def create_battle_frame(
     pokemon1_sprite: Image.Image,
     pokemon2_sprite: Image.Image,
@@ -380,7 +533,7 @@ def create_battle_frame(
     message: str = "",
 ) -> Image.Image:
     """
-    Create a battle frame
+    Create a single battle frame (use BattleScene to render several frames)
 
     Args:
         pokemon1_sprite: Sprite of the first Pokémon
@@ -394,144 +547,29 @@ def create_battle_frame(
     Returns:
         PIL Image of the battle frame
     """
-    # Create a new image with a gradient background for more visual appeal
-    frame = Image.new("RGB", (800, 500), (240, 248, 255))
-    draw = ImageDraw.Draw(frame)
-
-    # Create a gradient background
-    for y in range(500):
-        # Create a blue to light blue gradient
-        r = int(176 + (y / 500) * 64)
-        g = int(224 + (y / 500) * 31)
-        b = int(230 + (y / 500) * 25)
-        for x in range(800):
-            draw.point((x, y), fill=(r, g, b))
-
-    # Draw a simple battle field
-    # Green ground
-    draw.rectangle([(0, 380), (800, 500)], fill=(76, 187, 23))
-
-    # Draw dividing line
-    draw.line([(0, 380), (800, 380)], fill=(50, 50, 50), width=2)
-
-    # Add some details to the battlefield
-    # Add small circles for decoration
-    for i in range(10):
-        x = random.randint(50, 750)
-        y = random.randint(400, 480)
-        size = random.randint(5, 15)
-        color = (
-            random.randint(50, 100),
-            random.randint(160, 200),
-            random.randint(20, 50),
-        )
-        draw.ellipse([(x - size, y - size), (x + size, y + size)], fill=color)
-
-    # Load a font (using default if custom font fails)
-    try:
-        font = ImageFont.truetype("arial.ttf", 22)
-        small_font = ImageFont.truetype("arial.ttf", 18)
-    except IOError:
-        font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
-
-    # Add a platform for each Pokémon
-    # Platform for Pokémon 1
-    platform1_x = 200  # Moved more to the left
-    platform1_y = 340  # Slightly higher on battlefield
-
-    # Platform for Pokémon 2
-    platform2_x = 600  # Keep this position
-    platform2_y = 290  # Slightly higher on battlefield
-
-    # Draw Pokémon sprites with shadows
-    # Shadow for Pokémon 1
-    shadow1 = create_pokemon_shadow(pokemon1_sprite)
-    # Position the shadow at the bottom of where the sprite will be
-    shadow1_pos_x = platform1_x - shadow1.width // 2
-    shadow1_pos_y = platform1_y - 5  # Place shadow on the ground
-    frame.paste(shadow1, (shadow1_pos_x, shadow1_pos_y), shadow1)
-
-    # Shadow for Pokémon 2
-    shadow2 = create_pokemon_shadow(pokemon2_sprite)
-    # Position the shadow at the bottom of where the sprite will be
-    shadow2_pos_x = platform2_x - shadow2.width // 2
-    shadow2_pos_y = platform2_y - 5  # Place shadow on the ground
-    frame.paste(shadow2, (shadow2_pos_x, shadow2_pos_y), shadow2)
-
-    # Calculate vertical offset based on sprite height - larger sprites need more offset
-    pokemon1_y_offset = int(
-        pokemon1_sprite.height / 2.5
-    )  # Using regular division then converting to int
-    pokemon2_y_offset = int(
-        pokemon2_sprite.height / 2.5
-    )  # Using regular division then converting to int
-
-    # Pokemon 1 (left side) - Ensure it's directly centered over the shadow
-    pokemon1_pos_x = platform1_x - pokemon1_sprite.width // 2  # Center on platform
-    pokemon1_pos_y = platform1_y - pokemon1_sprite.height + pokemon1_y_offset
-    frame.paste(pokemon1_sprite, (pokemon1_pos_x, pokemon1_pos_y), pokemon1_sprite)
-
-    # Pokemon 2 (right side) - Position directly above shadow center
-    pokemon2_pos_x = platform2_x - pokemon2_sprite.width // 2  # Center on platform
-    pokemon2_pos_y = platform2_y - pokemon2_sprite.height + pokemon2_y_offset
-    frame.paste(pokemon2_sprite, (pokemon2_pos_x, pokemon2_pos_y), pokemon2_sprite)
-
-    # Create nicer name displays with health bars
-    # Name display for Pokémon 1
-    name_bg1 = Image.new("RGBA", (180, 70), (255, 255, 255, 180))
-    name_draw1 = ImageDraw.Draw(name_bg1)
-    name_draw1.rectangle([(0, 0), (179, 69)], outline=(0, 0, 0))
-    name_draw1.text((10, 10), pokemon1_name.capitalize(), fill=(0, 0, 0), font=font)
-
-    # Health bar for Pokémon 1
-    health_bar1 = create_health_bar(pokemon1_health, width=160)
-    name_bg1.paste(health_bar1, (10, 40), health_bar1)
-    frame.paste(name_bg1, (50, 50), name_bg1)
-
-    # Name display for Pokémon 2
-    name_bg2 = Image.new("RGBA", (180, 70), (255, 255, 255, 180))
-    name_draw2 = ImageDraw.Draw(name_bg2)
-    name_draw2.rectangle([(0, 0), (179, 69)], outline=(0, 0, 0))
-    name_draw2.text((10, 10), pokemon2_name.capitalize(), fill=(0, 0, 0), font=font)
-
-    # Health bar for Pokémon 2
-    health_bar2 = create_health_bar(pokemon2_health, width=160)
-    name_bg2.paste(health_bar2, (10, 40), health_bar2)
-    frame.paste(name_bg2, (550, 50), name_bg2)
-
-    # Draw battle message in a more appealing dialog box
-    max_width = 60  # characters per line
-    lines = []
-    for i in range(0, len(message), max_width):
-        lines.append(message[i : i + max_width])
-
-    message_box = Image.new("RGBA", (780, 90), (255, 255, 255, 220))
-    message_draw = ImageDraw.Draw(message_box)
-    message_draw.rectangle([(0, 0), (779, 89)], outline=(0, 0, 0), width=2)
-
-    y_position = 10
-    for line in lines:
-        message_draw.text((20, y_position), line, fill=(0, 0, 0), font=small_font)
-        y_position += 24
-
-    frame.paste(message_box, (10, 400), message_box)
-
-    return frame
+    scene = BattleScene(pokemon1_sprite, pokemon2_sprite, pokemon1_name, pokemon2_name)
+    return scene.render(pokemon1_health, pokemon2_health, message)
 
 
 def create_pokemon_shadow(pokemon_sprite: Image.Image) -> Image.Image:
     """
     Create an elliptical shadow for a Pokémon sprite (game-style)
 
+    Shadows only depend on the sprite size, so they are built once per size.
+
     Args:
         pokemon_sprite: The Pokémon sprite image
 
     Returns:
-        Shadow image with transparency
+        Shadow image with transparency (treat as read-only)
     """
+    return _shadow_for_size(pokemon_sprite.size)
+
+
+@lru_cache(maxsize=256)
+def _shadow_for_size(size: Tuple[int, int]) -> Image.Image:
     # Get dimensions
-    width, height = pokemon_sprite.size
+    width, height = size
 
     # Create a new blank image for the shadow
     shadow = Image.new("RGBA", (width, int(height * 0.3)), (0, 0, 0, 0))
@@ -565,30 +603,122 @@ def create_pokemon_shadow(pokemon_sprite: Image.Image) -> Image.Image:
     return shadow
 
 
+def preload_sprites(
+    pokemon_names: List[str], variants: Tuple[str, ...] = ("default",)
+) -> int:
+    """
+    Decode sprites (and their shadows) ahead of time so battles between
+    these Pokémon don't touch the atlas or the sprite cache
+
+    Only sprites already in the atlas or the sprite cache are loaded; nothing
+    is downloaded.
+
+    Args:
+        pokemon_names: Pokémon to preload, front and back sprites
+        variants: Sprite variants to preload
+
+    Returns:
+        Number of sprites preloaded
+    """
+    atlas = get_sprite_atlas()
+    for pokemon_name in pokemon_names:
+        pokemon_name = resolve_pokemon_name(pokemon_name)
+        for sprite_side in ("front", "back"):
+            for sprite_variant in variants:
+                key = sprite_key(pokemon_name, sprite_side, sprite_variant)
+                if key in _preloaded_sprites:
+                    continue
+                sprite = atlas.get(key)
+                if sprite is None:
+                    sprite = get_cached_image(f"sprite_{key}")
+                if sprite is None:
+                    continue
+                sprite.load()
+                create_pokemon_shadow(sprite)
+                _preloaded_sprites[key] = sprite
+    return len(_preloaded_sprites)
+
+
 def generate_battle_animation(
     pokemon1_data: Dict[str, Any],
     pokemon2_data: Dict[str, Any],
     battle_result: Dict[str, Any],
     output_path: str = "battle.gif",
     use_shiny: bool = False,
+    output_format: str = BATTLE_ANIMATION_FORMAT,
 ) -> str:
     """
     Generate a Pokémon battle animation GIF
 
+    GIFs are content-addressed by battle_animation_key and all randomness is
+    seeded from the key, so a battle that was already rendered is served from
+    the battle animation cache without rendering it again.
+
     Args:
         pokemon1_data: Data for the first Pokémon
         pokemon2_data: Data for the second Pokémon
         battle_result: Battle result with winner and reasoning
-        output_path: Path to save the resulting GIF
+        output_path: Unused, GIFs are stored in the battle animation cache
         use_shiny: Whether to use shiny sprites
+        output_format: 'gif', 'webp' or 'apng'
 
     Returns:
-        Path to the generated GIF
+        Path to the generated animation
+    """
+    key = battle_animation_key(
+        pokemon1_data["name"],
+        pokemon2_data["name"],
+        battle_result.get("winner", ""),
+        battle_result.get("reasoning", "Battle concluded!"),
+        use_shiny,
+    )
+    cache = get_battle_animation_cache(output_format)
+    cached_path = cache.get(key)
+    if cached_path is not None:
+        return cached_path
+
+    frames, durations = zip(
+        *generate_battle_frames(pokemon1_data, pokemon2_data, battle_result, use_shiny)
+    )
+    return cache.put(
+        key, lambda path: encode_animation(frames, durations, path, output_format)
+    )
+
+
+def generate_battle_frames(
+    pokemon1_data: Dict[str, Any],
+    pokemon2_data: Dict[str, Any],
+    battle_result: Dict[str, Any],
+    use_shiny: bool = False,
+) -> Iterator[Tuple[Image.Image, float]]:
+    """
+    Render the frames of a battle one at a time
+
+    Frames are produced lazily, so callers that stream them never hold the
+    whole animation. The randomness is seeded like generate_battle_animation,
+    so both show the same battle.
+
+    Args:
+        pokemon1_data: Data for the first Pokémon
+        pokemon2_data: Data for the second Pokémon
+        battle_result: Battle result with winner and reasoning
+        use_shiny: Whether to use shiny sprites
+
+    Yields:
+        Tuples of (frame, display time in milliseconds)
     """
+    # Determine winner and extract data
+    winner_name = battle_result.get("winner", "").lower()
+    reasoning = battle_result.get("reasoning", "Battle concluded!")
+    key = battle_animation_key(
+        pokemon1_data["name"], pokemon2_data["name"], winner_name, reasoning, use_shiny
+    )
+    rng = random.Random(key)
+
     # Get sprites with appropriate variants
     # Randomly decide if we should use female sprites when available
-    use_female1 = random.random() < 0.3  # 30% chance for female sprite if available
-    use_female2 = random.random() < 0.3
+    use_female1 = rng.random() < 0.3  # 30% chance for female sprite if available
+    use_female2 = rng.random() < 0.3
 
     # Determine sprite variants
     sprite_variant1 = "default"
@@ -615,37 +745,36 @@ def generate_battle_animation(
         pokemon2_data["name"], sprite_variant2, is_first_pokemon=False
     )
 
-    # Determine winner and extract data
-    winner_name = battle_result.get("winner", "").lower()
-    reasoning = battle_result.get("reasoning", "Battle concluded!")
-
     # Determine type effectiveness and adjust battle accordingly
     type_effectiveness = get_type_effectiveness(pokemon1_data, pokemon2_data)
 
-    # Create frames
-    frames = []
+    # Static layers are built once; frames only add health bars and messages
+    scene = BattleScene(
+        pokemon1_sprite,
+        pokemon2_sprite,
+        pokemon1_data["name"],
+        pokemon2_data["name"],
+        rng=rng,
+    )
 
     # Initial frame
-    frames.append(
-        create_battle_frame(
-            pokemon1_sprite,
-            pokemon2_sprite,
-            pokemon1_data["name"],
-            pokemon2_data["name"],
+    yield (
+        scene.render(
             1.0,
             1.0,
             f"Battle begins! {pokemon1_data['name'].capitalize()} vs {pokemon2_data['name'].capitalize()}",
-        )
+        ),
+        1000.0,
     )
 
     # Simulate battle with more frames for smoother animation
-    num_frames = random.randint(
+    num_frames = rng.randint(
         12, 15
     )  # Increased from 6-8 to 12-15 frames for smoother animation
 
     # Generate battle messages based on Pokémon types and stats
     messages = generate_battle_messages(
-        pokemon1_data, pokemon2_data, type_effectiveness
+        pokemon1_data, pokemon2_data, type_effectiveness, rng=rng
     )
 
     p1_health = 1.0
@@ -657,12 +786,9 @@ def generate_battle_animation(
 
     # Generate smoother health decreases that reflect type effectiveness
     p1_decreases, p2_decreases = generate_health_decreases(
-        num_frames, p1_final_health, p2_final_health, type_effectiveness
+        num_frames, p1_final_health, p2_final_health, type_effectiveness, rng=rng
     )
 
-    # For each battle message, create multiple frames to make the text stay longer
-    # This effectively slows down the battle animation
-    battle_frames = []
     for i in range(num_frames):
         p1_health = max(0, 1.0 - p1_decreases[i])
         p2_health = max(0, 1.0 - p2_decreases[i])
@@ -692,60 +818,19 @@ def generate_battle_animation(
                     message = f"{pokemon2_data['name'].capitalize()} has fainted!"
                     break
 
-        # Create the frame
-        frame = create_battle_frame(
-            pokemon1_sprite,
-            pokemon2_sprite,
-            pokemon1_data["name"],
-            pokemon2_data["name"],
-            p1_health,
-            p2_health,
-            message,
-        )
-
-        # Add the frame to our list
-        battle_frames.append(frame)
-
-        # For each message, create a duplicate frame to make it stay longer
-        # This effectively doubles the time each message is shown
-        battle_frames.append(frame)
-
-    # Add all battle frames to the main frames list
-    frames.extend(battle_frames)
-
-    # Final frame with winner
-    final_frame = create_battle_frame(
-        pokemon1_sprite,
-        pokemon2_sprite,
-        pokemon1_data["name"],
-        pokemon2_data["name"],
-        p1_final_health,
-        p2_final_health,
-        f"{winner_name.capitalize()} wins the battle! {reasoning[:100]}{'...' if len(reasoning) > 100 else ''}",
+        # Create the frame, messages stay on screen for two seconds
+        yield scene.render(p1_health, p2_health, message), 2000.0
+
+    # Final frame with winner, it stays even longer for emphasis
+    yield (
+        scene.render(
+            p1_final_health,
+            p2_final_health,
+            f"{winner_name.capitalize()} wins the battle! {reasoning[:100]}{'...' if len(reasoning) > 100 else ''}",
+        ),
+        3000.0,
     )
 
-    # Add the final frame multiple times to make it stay even longer
-    frames.append(final_frame)
-    frames.append(final_frame)  # Adding it twice more for emphasis
-    frames.append(final_frame)
-
-    # Save as GIF
-    output_filename = f"battle_{int(time.time())}.gif"
-    output_filepath = os.path.join(os.environ.get("TEMP_DIR", "/tmp"), output_filename)
-
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
-
-    # Create a list of durations for each frame (in seconds)
-    durations = [1000.0]  # First frame (intro)
-    durations.extend([1000.0] * (len(frames) - 4))  # Battle frames
-    durations.extend([1000.0, 1000.0, 1000.0])  # Final frames
-
-    # Save GIF with appropriate durations
-    imageio.mimsave(output_filepath, frames, duration=durations, loop=0)
-
-    return output_filepath
-
 
 def get_type_effectiveness(
     pokemon1_data: Dict[str, Any], pokemon2_data: Dict[str, Any]
@@ -760,171 +845,13 @@ def get_type_effectiveness(
     Returns:
         Dictionary with effectiveness multipliers
     """
-    # This is a simplified version - in a full implementation you would use the actual type chart
-    type_chart = {
-        # Format: attacking -> defending -> effectiveness
-        "normal": {"rock": 0.5, "ghost": 0, "steel": 0.5},
-        "fire": {
-            "fire": 0.5,
-            "water": 0.5,
-            "grass": 2,
-            "ice": 2,
-            "bug": 2,
-            "rock": 0.5,
-            "dragon": 0.5,
-            "steel": 2,
-        },
-        "water": {
-            "fire": 2,
-            "water": 0.5,
-            "grass": 0.5,
-            "ground": 2,
-            "rock": 2,
-            "dragon": 0.5,
-        },
-        "electric": {
-            "water": 2,
-            "electric": 0.5,
-            "grass": 0.5,
-            "ground": 0,
-            "flying": 2,
-            "dragon": 0.5,
-        },
-        "grass": {
-            "fire": 0.5,
-            "water": 2,
-            "grass": 0.5,
-            "poison": 0.5,
-            "ground": 2,
-            "flying": 0.5,
-            "bug": 0.5,
-            "rock": 2,
-            "dragon": 0.5,
-            "steel": 0.5,
-        },
-        "ice": {
-            "fire": 0.5,
-            "water": 0.5,
-            "grass": 2,
-            "ice": 0.5,
-            "ground": 2,
-            "flying": 2,
-            "dragon": 2,
-            "steel": 0.5,
-        },
-        "fighting": {
-            "normal": 2,
-            "ice": 2,
-            "poison": 0.5,
-            "flying": 0.5,
-            "psychic": 0.5,
-            "bug": 0.5,
-            "rock": 2,
-            "ghost": 0,
-            "dark": 2,
-            "steel": 2,
-            "fairy": 0.5,
-        },
-        "poison": {
-            "grass": 2,
-            "poison": 0.5,
-            "ground": 0.5,
-            "rock": 0.5,
-            "ghost": 0.5,
-            "steel": 0,
-            "fairy": 2,
-        },
-        "ground": {
-            "fire": 2,
-            "electric": 2,
-            "grass": 0.5,
-            "poison": 2,
-            "flying": 0,
-            "bug": 0.5,
-            "rock": 2,
-            "steel": 2,
-        },
-        "flying": {
-            "electric": 0.5,
-            "grass": 2,
-            "fighting": 2,
-            "bug": 2,
-            "rock": 0.5,
-            "steel": 0.5,
-        },
-        "psychic": {
-            "fighting": 2,
-            "poison": 2,
-            "psychic": 0.5,
-            "dark": 0,
-            "steel": 0.5,
-        },
-        "bug": {
-            "fire": 0.5,
-            "grass": 2,
-            "fighting": 0.5,
-            "poison": 0.5,
-            "flying": 0.5,
-            "psychic": 2,
-            "ghost": 0.5,
-            "dark": 2,
-            "steel": 0.5,
-            "fairy": 0.5,
-        },
-        "rock": {
-            "fire": 2,
-            "ice": 2,
-            "fighting": 0.5,
-            "ground": 0.5,
-            "flying": 2,
-            "bug": 2,
-            "steel": 0.5,
-        },
-        "ghost": {"normal": 0, "psychic": 2, "ghost": 2, "dark": 0.5},
-        "dragon": {"dragon": 2, "steel": 0.5, "fairy": 0},
-        "dark": {"fighting": 0.5, "psychic": 2, "ghost": 2, "dark": 0.5, "fairy": 0.5},
-        "steel": {
-            "fire": 0.5,
-            "water": 0.5,
-            "electric": 0.5,
-            "ice": 2,
-            "rock": 2,
-            "steel": 0.5,
-            "fairy": 2,
-        },
-        "fairy": {
-            "fighting": 2,
-            "poison": 0.5,
-            "bug": 0.5,
-            "dragon": 2,
-            "dark": 2,
-            "steel": 0.5,
-        },
-    }
-
-    # Calculate base effectiveness
-    p1_effectiveness = 1.0
-    p2_effectiveness = 1.0
-
     # Get types
     p1_types = pokemon1_data.get("types", [])
     p2_types = pokemon2_data.get("types", [])
 
-    # Calculate P1's effectiveness against P2
-    for attack_type in p1_types:
-        for defend_type in p2_types:
-            if attack_type in type_chart and defend_type in type_chart.get(
-                attack_type, {}
-            ):
-                p1_effectiveness *= type_chart[attack_type][defend_type]
-
-    # Calculate P2's effectiveness against P1
-    for attack_type in p2_types:
-        for defend_type in p1_types:
-            if attack_type in type_chart and defend_type in type_chart.get(
-                attack_type, {}
-            ):
-                p2_effectiveness *= type_chart[attack_type][defend_type]
+    # Same precomputed chart as the battle analysis
+    p1_effectiveness = type_effectiveness(p1_types, p2_types)
+    p2_effectiveness = type_effectiveness(p2_types, p1_types)
 
     return {"p1_against_p2": p1_effectiveness, "p2_against_p1": p2_effectiveness}
 
@@ -933,6 +860,7 @@ def generate_battle_messages(
     pokemon1_data: Dict[str, Any],
     pokemon2_data: Dict[str, Any],
     type_effectiveness: Dict[str, float],
+    rng: Optional[random.Random] = None,
 ) -> List[str]:
     """
     Generate appropriate battle messages based on Pokémon types and stats
@@ -941,6 +869,7 @@ def generate_battle_messages(
         pokemon1_data: Data for the first Pokémon
         pokemon2_data: Data for the second Pokémon
         type_effectiveness: Type effectiveness data
+        rng: Random generator for the order (the random module by default)
 
     Returns:
         List of battle messages
@@ -1120,7 +1049,7 @@ def generate_battle_messages(
     )
 
     # Shuffle the messages to get a random order
-    random.shuffle(messages)
+    (rng if rng is not None else random).shuffle(messages)
 
     return messages
 
@@ -1130,6 +1059,7 @@ def generate_health_decreases(
     p1_final_health: float,
     p2_final_health: float,
     type_effectiveness: Dict[str, float],
+    rng: Optional[random.Random] = None,
 ) -> Tuple[List[float], List[float]]:
     """
     Generate health decrease patterns that reflect type effectiveness
@@ -1139,6 +1069,7 @@ def generate_health_decreases(
         p1_final_health: Final health for Pokémon 1
         p2_final_health: Final health for Pokémon 2
         type_effectiveness: Type effectiveness data
+        rng: Random generator for the damage frames (the random module by default)
 
     Returns:
         Tuple of (p1_decreases, p2_decreases) lists
@@ -1152,8 +1083,9 @@ def generate_health_decreases(
     p2_rate = min(2.0, max(0.5, type_effectiveness["p1_against_p2"]))
 
     # Generate some random points where damage occurs
-    p1_damage_frames = sorted(random.sample(range(num_frames), min(4, num_frames)))
-    p2_damage_frames = sorted(random.sample(range(num_frames), min(4, num_frames)))
+    rng = rng if rng is not None else random
+    p1_damage_frames = sorted(rng.sample(range(num_frames), min(4, num_frames)))
+    p2_damage_frames = sorted(rng.sample(range(num_frames), min(4, num_frames)))
 
     # Apply damage at those frames
     for frame in p1_damage_frames:
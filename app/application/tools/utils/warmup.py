@@ -0,0 +1,66 @@
+"""
+Startup Warm-up
+
+Loads ahead of time what the first requests of a fresh process would
+otherwise load lazily.
+
+- warm_up_api runs in the API process at import time. Under gunicorn with
+  `preload_app` that is the master, before it forks the workers, so the
+  Pokédex index, the counters index, the name extractor and resolver and the
+  most popular Pokémon records are shared copy-on-write by every worker.
+- warm_up_renderer runs in every render worker as it starts. Render workers
+  are spawned, not forked, so they can't inherit the master's memory; they
+  load the fonts, the battle field background and the most popular sprites
+  themselves, and the sprite atlas pages are shared between all of them
+  through the OS page cache.
+"""
+
+import logging
+import time
+
+from app.domain.settings.constants import POPULAR_POKEMON, WARMUP_SPRITES
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_api() -> None:
+    """
+    Load the Pokédex, counters and name indexes and the most popular Pokémon
+    records
+    """
+    from app.application.tools.utils.counters_index import get_counters_index
+    from app.application.tools.utils.name_extractor import get_name_extractor
+    from app.application.tools.utils.name_resolver import get_name_resolver
+    from app.application.tools.utils.pokedex import get_pokedex
+
+    start = time.perf_counter()
+    pokedex = get_pokedex()
+    counters = get_counters_index()
+    get_name_extractor()
+    get_name_resolver()
+    for name in POPULAR_POKEMON[:WARMUP_SPRITES]:
+        pokedex.get_pokemon(name)
+        pokedex.get_form(name)
+    logger.info(
+        f"API warm-up done in {time.perf_counter() - start:.2f}s "
+        f"({len(pokedex)} Pokémon, {len(counters)} counters)"
+    )
+
+
+def warm_up_renderer() -> None:
+    """Load the battle fonts, the battle field background and the most popular sprites"""
+    # Imported here so the API process doesn't pay for PIL
+    from app.application.tools.utils.visualization_utils import (
+        get_battle_fonts,
+        get_sky_background,
+        preload_sprites,
+    )
+
+    start = time.perf_counter()
+    get_battle_fonts()
+    get_sky_background()
+    sprites = preload_sprites(POPULAR_POKEMON[:WARMUP_SPRITES])
+    logger.info(
+        f"Renderer warm-up done in {time.perf_counter() - start:.2f}s "
+        f"({sprites} sprites)"
+    )
@@ -1,10 +1,24 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from langchain.schema import BaseMessage
-from app.application.tools.tools import fetch_pokemon_info
-
-
-RESEARCHER_TOOLS = [fetch_pokemon_info]
+from langchain_core.tools import StructuredTool
+from app.application.tools.tools import (
+    afetch_pokemon_info,
+    afetch_pokemon_infos,
+    fetch_pokemon_info,
+    fetch_pokemon_infos,
+)
+
+
+# The coroutine is used from the async LangGraph loop, the sync function elsewhere
+RESEARCHER_TOOLS = [
+    StructuredTool.from_function(
+        func=fetch_pokemon_infos, coroutine=afetch_pokemon_infos
+    ),
+    StructuredTool.from_function(
+        func=fetch_pokemon_info, coroutine=afetch_pokemon_info
+    ),
+]
 
 
 class PokemonBaseStats(BaseModel):
@@ -1,8 +1,12 @@
 from pydantic import BaseModel, Field
 
-from typing import List, Optional
+from enum import Enum
+from typing import Dict, List, Optional
 
 from app.infrastructure.entities.base_agent import LangpifyBaseAgent
+from app.domain.agents.pokemon_expert.pokemon_expert_models import (
+    PokemonExpertResponse,
+)
 
 
 class AgentTemplateModel(BaseModel):
@@ -14,6 +18,7 @@ class AgentModel(BaseModel):
     aid: str
     role_name: Optional[str]
     status: Optional[str]
+    type: Optional[str] = None
 
 
 class ListAgentTemplatesResponse(BaseModel):
@@ -40,3 +45,88 @@ class InitEnvironmentResponse(BaseModel):
 
 class ListAgentsResponse(BaseModel):
     agents: List[AgentModel] = Field(default=None, description="List of agents created")
+
+
+class CounterModel(BaseModel):
+    name: str
+    margin: float = Field(
+        description="Opponent turns-to-win minus the counter's turns-to-win"
+    )
+    turns_to_win: float
+    opponent_turns_to_win: float
+
+
+class CountersResponse(BaseModel):
+    pokemon: str = Field(description="Canonical name of the countered Pokémon")
+    counters: List[CounterModel] = Field(
+        default=None, description="Best counters, widest winning margin first"
+    )
+
+
+class BattleMode(str, Enum):
+    FAST = "fast"
+    AGENTS = "agents"
+
+
+class FastBattleResponse(PokemonExpertResponse):
+    narration_id: Optional[str] = Field(
+        default=None,
+        description="Id to poll at /agents/system/battle/narration/{narration_id}",
+    )
+
+
+class NarrationResponse(BaseModel):
+    status: str = Field(description="pending, done or error")
+    narration: Optional[str] = Field(default=None, description="Narrated battle")
+
+
+class AnimationFormat(str, Enum):
+    GIF = "gif"
+    WEBP = "webp"
+    APNG = "apng"
+
+
+class RenderJobResponse(BaseModel):
+    job_id: str
+    status: str = Field(description="queued, running, done or failed")
+    error: Optional[str] = Field(default=None, description="Failure reason")
+    result_url: Optional[str] = Field(
+        default=None, description="Where to download the animation once done"
+    )
+
+
+class QueryRouterMetrics(BaseModel):
+    queries: int = Field(description="Supervisor queries classified")
+    direct: int = Field(description="Queries answered without the supervisor")
+    supervisor: int = Field(description="Queries sent to the supervisor")
+    hit_rate: float = Field(description="Share of queries answered directly")
+    dispatch_errors: int = Field(
+        description="Direct dispatches that failed and went to the supervisor"
+    )
+    decisions: Dict[str, int] = Field(description="Queries by pathway (A-E)")
+    direct_by_pathway: Dict[str, int] = Field(
+        description="Queries answered directly, by pathway"
+    )
+
+
+class PrefetchMetrics(BaseModel):
+    questions: int = Field(description="Questions scanned for Pokémon names")
+    pokemon: int = Field(description="Pokémon prefetched")
+    errors: int = Field(description="Prefetches that failed")
+
+
+class NegativeCacheMetrics(BaseModel):
+    hits: int = Field(description="Lookups answered as not found without the PokéAPI")
+    writes: int = Field(description="PokéAPI 404s remembered")
+    evictions: int = Field(description="Entries evicted to stay within the size bound")
+    circuit_opens: int = Field(
+        description="Times a name was held longer after repeated misses"
+    )
+    entries: int = Field(description="Names currently remembered")
+    open_circuits: int = Field(description="Names currently held after repeated misses")
+
+
+class MetricsResponse(BaseModel):
+    query_router: QueryRouterMetrics
+    prefetch: PrefetchMetrics
+    pokeapi_negative_cache: NegativeCacheMetrics
@@ -1,2 +1,132 @@
+import os
+
 # Ruta absoluta o relativa al archivo de configuración de IA
 PATH_AI_CONFIG = "app/domain/settings/ai_config.yaml"
+
+# PokéAPI HTTP client settings
+POKEAPI_BASE_URL = os.environ.get("POKEAPI_BASE_URL", "https://pokeapi.co/api/v2")
+POKEAPI_TIMEOUT = float(os.environ.get("POKEAPI_TIMEOUT", "10.0"))
+POKEAPI_CONNECT_TIMEOUT = float(os.environ.get("POKEAPI_CONNECT_TIMEOUT", "3.0"))
+POKEAPI_MAX_CONNECTIONS = int(os.environ.get("POKEAPI_MAX_CONNECTIONS", "20"))
+POKEAPI_MAX_KEEPALIVE = int(os.environ.get("POKEAPI_MAX_KEEPALIVE", "10"))
+POKEAPI_MAX_CONCURRENCY = int(os.environ.get("POKEAPI_MAX_CONCURRENCY", "10"))
+
+# Offline Pokédex snapshot (built with `python -m app.application.tools.utils.pokedex build`)
+PATH_POKEDEX = os.environ.get("POKEDEX_PATH", "data/pokedex.sqlite")
+
+# Two-tier (memory + disk) cache for PokéAPI JSON responses
+CACHE_DIR = os.path.join(os.environ.get("TEMP_DIR", "/tmp"), "pokeapi_cache")
+POKEAPI_CACHE_DIR = os.path.join(CACHE_DIR, "json")
+POKEAPI_CACHE_MAX_ENTRIES = int(os.environ.get("POKEAPI_CACHE_MAX_ENTRIES", "2048"))
+POKEAPI_CACHE_MAX_DISK_MB = int(os.environ.get("POKEAPI_CACHE_MAX_DISK_MB", "256"))
+POKEAPI_CACHE_TTL = float(os.environ.get("POKEAPI_CACHE_TTL", str(7 * 24 * 3600)))
+POKEAPI_CACHE_STALE_TTL = float(
+    os.environ.get("POKEAPI_CACHE_STALE_TTL", str(30 * 24 * 3600))
+)
+# Negative tier: names the PokéAPI answered 404 for, and the per-name circuit
+# that holds them longer after repeated misses
+POKEAPI_NEGATIVE_CACHE_TTL = float(os.environ.get("POKEAPI_NEGATIVE_CACHE_TTL", "300"))
+POKEAPI_NEGATIVE_CACHE_MAX_ENTRIES = int(
+    os.environ.get("POKEAPI_NEGATIVE_CACHE_MAX_ENTRIES", "4096")
+)
+POKEAPI_NEGATIVE_CIRCUIT_MISSES = int(
+    os.environ.get("POKEAPI_NEGATIVE_CIRCUIT_MISSES", "3")
+)
+POKEAPI_NEGATIVE_CIRCUIT_TTL = float(
+    os.environ.get("POKEAPI_NEGATIVE_CIRCUIT_TTL", str(3600))
+)
+
+# Precomputed "best counters" index (built with `python -m app.application.tools.utils.counters_index build`)
+PATH_COUNTERS_INDEX = os.environ.get("COUNTERS_INDEX_PATH", "data/counters.npz")
+COUNTERS_TOP_K = int(os.environ.get("COUNTERS_TOP_K", "20"))
+
+# Preprocessed sprites of every Pokémon (built with `python -m app.application.tools.utils.sprite_atlas build`)
+PATH_SPRITE_ATLAS = os.environ.get("SPRITE_ATLAS_PATH", "data/sprites.bin")
+
+# Battle route: "fast" answers with analyze_pokemon_battle only, "agents" runs
+# the supervisor -> researcher -> expert workflow
+BATTLE_DEFAULT_MODE = os.environ.get("BATTLE_DEFAULT_MODE", "agents")
+if BATTLE_DEFAULT_MODE not in ("fast", "agents"):
+    raise ValueError(
+        f"BATTLE_DEFAULT_MODE must be 'fast' or 'agents', not {BATTLE_DEFAULT_MODE!r}"
+    )
+# Narrations of fast battles, stored on disk so any worker can serve the polls
+BATTLE_NARRATION_DIR = os.path.join(CACHE_DIR, "narrations")
+BATTLE_NARRATION_MAX_DISK_MB = int(os.environ.get("BATTLE_NARRATION_MAX_DISK_MB", "16"))
+BATTLE_NARRATION_TTL = float(os.environ.get("BATTLE_NARRATION_TTL", "3600"))
+
+# Cache of agent responses keyed by aid, normalized question and manifest fingerprint
+AGENT_CACHE_DIR = os.path.join(CACHE_DIR, "agents")
+AGENT_CACHE_DISK = os.environ.get("AGENT_CACHE_DISK", "true").lower() == "true"
+AGENT_CACHE_MAX_ENTRIES = int(os.environ.get("AGENT_CACHE_MAX_ENTRIES", "512"))
+AGENT_CACHE_MAX_DISK_MB = int(os.environ.get("AGENT_CACHE_MAX_DISK_MB", "128"))
+AGENT_CACHE_TTL = float(os.environ.get("AGENT_CACHE_TTL", str(24 * 3600)))
+
+# Built agents (LLM clients and compiled workflows) kept by manifest fingerprint
+AGENT_FACTORY_MAX_AGENTS = int(os.environ.get("AGENT_FACTORY_MAX_AGENTS", "32"))
+
+# Supervisor queries classified locally with at least this confidence skip the
+# supervisor LLM and run the researcher/expert workflows directly
+QUERY_ROUTER_ENABLED = os.environ.get("QUERY_ROUTER_ENABLED", "true").lower() == "true"
+QUERY_ROUTER_MIN_CONFIDENCE = float(
+    os.environ.get("QUERY_ROUTER_MIN_CONFIDENCE", "0.8")
+)
+
+# Pokémon named in a question are fetched in the background while the agents think
+PREFETCH_ENABLED = os.environ.get("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_SPRITES = os.environ.get("PREFETCH_SPRITES", "false").lower() == "true"
+PREFETCH_MAX_NAMES = int(os.environ.get("PREFETCH_MAX_NAMES", "6"))
+
+# Battle GIF rendering on a process pool; under gunicorn one broker process,
+# reached by every API worker over RENDER_SOCKET, owns the pool and the queue
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+RENDER_MAX_QUEUE = int(os.environ.get("RENDER_MAX_QUEUE", "16"))
+RENDER_TIMEOUT = float(os.environ.get("RENDER_TIMEOUT", "60.0"))
+RENDER_MAX_JOBS = int(os.environ.get("RENDER_MAX_JOBS", "256"))
+RENDER_SOCKET = os.environ.get("RENDER_SOCKET", os.path.join(CACHE_DIR, "render.sock"))
+# Frames a streaming render may draw ahead of the client
+RENDER_STREAM_BUFFER = int(os.environ.get("RENDER_STREAM_BUFFER", "4"))
+
+# Rendered battle GIFs, content-addressed by matchup and result
+BATTLE_ANIMATION_CACHE_DIR = os.path.join(CACHE_DIR, "battles")
+BATTLE_ANIMATION_CACHE_MAX_DISK_MB = int(
+    os.environ.get("BATTLE_ANIMATION_CACHE_MAX_DISK_MB", "256")
+)
+# Animation formats -> (file suffix, media type), and the default one
+BATTLE_ANIMATION_FORMATS = {
+    "gif": (".gif", "image/gif"),
+    "webp": (".webp", "image/webp"),
+    "apng": (".png", "image/apng"),
+}
+BATTLE_ANIMATION_FORMAT = os.environ.get("BATTLE_ANIMATION_FORMAT", "gif")
+if BATTLE_ANIMATION_FORMAT not in BATTLE_ANIMATION_FORMATS:
+    raise ValueError(
+        f"BATTLE_ANIMATION_FORMAT must be one of {sorted(BATTLE_ANIMATION_FORMATS)}, "
+        f"not {BATTLE_ANIMATION_FORMAT!r}"
+    )
+
+# Startup warm-up: indexes are loaded before gunicorn forks its workers, and
+# each render worker preloads fonts, backgrounds and the most popular sprites
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_SPRITES = int(os.environ.get("WARMUP_SPRITES", "32"))
+POPULAR_POKEMON = os.environ.get(
+    "POPULAR_POKEMON",
+    "pikachu,charizard,mewtwo,gengar,lucario,eevee,bulbasaur,squirtle,"
+    "charmander,snorlax,gyarados,dragonite,blastoise,venusaur,greninja,mew,"
+    "garchomp,rayquaza,umbreon,sylveon,jigglypuff,psyduck,arcanine,lapras,"
+    "tyranitar,gardevoir,blaziken,infernape,mimikyu,metagross,alakazam,machamp",
+).split(",")
+
+# LLM gateway defaults, overridden by the `gateway` block of a manifest's language.llm
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", "30.0"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "1"))
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "20"))
+LLM_CIRCUIT_FAILURE_RATE = float(os.environ.get("LLM_CIRCUIT_FAILURE_RATE", "0.5"))
+LLM_CIRCUIT_WINDOW = int(os.environ.get("LLM_CIRCUIT_WINDOW", "20"))
+LLM_CIRCUIT_MIN_CALLS = int(os.environ.get("LLM_CIRCUIT_MIN_CALLS", "5"))
+LLM_CIRCUIT_RECOVERY_TIMEOUT = float(
+    os.environ.get("LLM_CIRCUIT_RECOVERY_TIMEOUT", "30.0")
+)
+# Successful calls remembered per model, and needed before hedging starts
+LLM_LATENCY_WINDOW = int(os.environ.get("LLM_LATENCY_WINDOW", "100"))
+LLM_HEDGE_MIN_SAMPLES = int(os.environ.get("LLM_HEDGE_MIN_SAMPLES", "20"))
@@ -0,0 +1,16 @@
+from fastapi import FastAPI
+from app.application.tools.utils.pokeapi_client import get_pokeapi_client
+from app.domain.utils.llm_gateway import close_provider_http_clients
+
+
+def setup_http_clients(app: FastAPI):
+    """
+    Shared outbound HTTP clients.
+    Connection pools are created lazily on first use and released on shutdown.
+    """
+
+    async def close_http_clients():
+        await get_pokeapi_client().aclose()
+        await close_provider_http_clients()
+
+    app.router.add_event_handler("shutdown", close_http_clients)
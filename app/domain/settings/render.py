@@ -0,0 +1,21 @@
+from fastapi import FastAPI
+from app.domain.settings.constants import WARMUP_ENABLED
+
+
+def setup_render(app: FastAPI):
+    """
+    Battle render worker processes.
+    The pool is started with the app when warm-up is enabled (on the first
+    render otherwise) and stopped on shutdown.
+    """
+
+    async def start_render_workers():
+        app.container.render_service().start()
+
+    if WARMUP_ENABLED:
+        app.router.add_event_handler("startup", start_render_workers)
+
+    async def stop_render_workers():
+        app.container.render_service().shutdown()
+
+    app.router.add_event_handler("shutdown", stop_render_workers)
@@ -0,0 +1,13 @@
+from fastapi import FastAPI
+from app.application.tools.utils.warmup import warm_up_api
+from app.domain.settings.constants import WARMUP_ENABLED
+
+
+def setup_warmup(app: FastAPI):
+    """
+    Startup warm-up.
+    Runs at import so gunicorn's master (with preload_app) loads the indexes
+    once and the forked workers share them copy-on-write.
+    """
+    if WARMUP_ENABLED:
+        warm_up_api()
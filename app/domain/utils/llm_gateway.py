@@ -0,0 +1,460 @@
+"""
+LLM Gateway
+
+A chat model that spreads each call over the models of a manifest's
+`language.llm` block (primary first, then secondary):
+
+- Every model has a circuit breaker that opens when its error rate over the
+  last calls crosses a threshold. While it is open the model is skipped, and
+  after a recovery timeout one trial call decides whether it closes again.
+- A failed call falls back to the next model whose breaker allows it.
+- Optionally, calls are hedged: when the primary model takes longer than a
+  percentile of its recent latencies, the same request is sent to the
+  secondary model and the first answer wins.
+
+Breakers and latency statistics belong to a model (provider and name), so
+agents sharing a model share its health, and the models of a provider share
+one connection pool. The secondary model is only built the first time a call
+needs it.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpx
+import numpy as np
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict
+
+from app.domain.settings.constants import (
+    LLM_CIRCUIT_FAILURE_RATE,
+    LLM_CIRCUIT_MIN_CALLS,
+    LLM_CIRCUIT_RECOVERY_TIMEOUT,
+    LLM_CIRCUIT_WINDOW,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_LATENCY_WINDOW,
+    LLM_MAX_CONNECTIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when every model of a gateway has its circuit open"""
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker.
+
+    Opens when at least min_calls of the last `window` calls were made and
+    the share of failures among them reaches failure_rate. After
+    recovery_timeout seconds a single trial call is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = LLM_CIRCUIT_FAILURE_RATE,
+        window: int = LLM_CIRCUIT_WINDOW,
+        min_calls: int = LLM_CIRCUIT_MIN_CALLS,
+        recovery_timeout: float = LLM_CIRCUIT_RECOVERY_TIMEOUT,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.recovery_timeout = recovery_timeout
+        self._outcomes: deque = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.recovery_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may be made now (claims the trial call when half-open)"""
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Give back a call that was let through but abandoned before its outcome"""
+        with self._lock:
+            self._trial = False
+
+    def record(self, success: bool) -> None:
+        """Record the outcome of a call"""
+        with self._lock:
+            if self._opened_at is not None:
+                # Outcome of the trial call
+                self._trial = False
+                if success:
+                    self._opened_at = None
+                    self._outcomes.clear()
+                else:
+                    self._opened_at = time.monotonic()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._opened_at = time.monotonic()
+                logger.warning(
+                    f"Circuit opened after {failures} failures "
+                    f"in {len(self._outcomes)} calls"
+                )
+
+
+class LatencyTracker:
+    """Latencies of the last successful calls of a model"""
+
+    def __init__(
+        self, window: int = LLM_LATENCY_WINDOW, min_samples: int = LLM_HEDGE_MIN_SAMPLES
+    ):
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Latency percentile, in seconds
+
+        Returns:
+            The percentile, or None until min_samples calls were recorded
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        return float(np.percentile(self._samples, percentile))
+
+
+class ModelRoute:
+    """A model of a gateway with its circuit breaker and latency statistics"""
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[], BaseChatModel],
+        circuit_breaker: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            name: Provider and model name; routes with the same name share
+                their breaker and latency statistics
+            build: Builds (or returns the shared) chat model, on first use
+            circuit_breaker: Breaker settings (failure_rate, window, min_calls,
+                recovery_timeout), used if the model has no breaker yet
+        """
+        self.name = name
+        self._build = build
+        self._model: Optional[BaseChatModel] = None
+        self.breaker, self.latencies = get_model_health(name, circuit_breaker)
+
+    @property
+    def model(self) -> BaseChatModel:
+        if self._model is None:
+            self._model = self._build()
+        return self._model
+
+
+_health: Dict[str, Tuple[CircuitBreaker, LatencyTracker]] = {}
+_health_lock = threading.Lock()
+
+
+def get_model_health(
+    name: str, circuit_breaker: Optional[Dict[str, Any]] = None
+) -> Tuple[CircuitBreaker, LatencyTracker]:
+    """
+    Get the process-wide circuit breaker and latency statistics of a model
+
+    Args:
+        name: Provider and model name
+        circuit_breaker: Breaker settings, used when the model is first seen
+
+    Returns:
+        Tuple of (circuit breaker, latency tracker)
+    """
+    health = _health.get(name)
+    if health is None:
+        with _health_lock:
+            health = _health.get(name)
+            if health is None:
+                health = (CircuitBreaker(**(circuit_breaker or {})), LatencyTracker())
+                _health[name] = health
+    return health
+
+
+_http_clients: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+_http_clients_lock = threading.Lock()
+
+
+def get_provider_http_clients(provider: str) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Get the HTTP clients shared by every model of a provider
+
+    Request timeouts are set per model by the provider SDKs.
+
+    Returns:
+        Tuple of (sync client, async client)
+    """
+    clients = _http_clients.get(provider)
+    if clients is None:
+        with _http_clients_lock:
+            clients = _http_clients.get(provider)
+            if clients is None:
+                limits = httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                )
+                clients = (
+                    httpx.Client(limits=limits),
+                    httpx.AsyncClient(limits=limits),
+                )
+                _http_clients[provider] = clients
+    return clients
+
+
+async def close_provider_http_clients() -> None:
+    """Close the HTTP clients of every provider"""
+    with _http_clients_lock:
+        clients = list(_http_clients.values())
+        _http_clients.clear()
+    for sync_client, async_client in clients:
+        sync_client.close()
+        await async_client.aclose()
+
+
+class GatewayChatModel(BaseChatModel):
+    """
+    Chat model routing calls over several models with circuit breakers,
+    fallbacks and optional hedging.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    routes: List[ModelRoute]
+    # Latency percentile of the primary model after which the request is also
+    # sent to the secondary one; None disables hedging
+    hedge_percentile: Optional[float] = None
+
+    @property
+    def model_name(self) -> str:
+        return self.routes[0].name
+
+    @property
+    def _llm_type(self) -> str:
+        return "langpify-gateway"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {
+            "routes": [route.name for route in self.routes],
+            "hedge_percentile": self.hedge_percentile,
+        }
+
+    def bind_tools(
+        self,
+        tools: Any,
+        *,
+        tool_choice: Optional[Any] = None,
+        parallel_tool_calls: Optional[bool] = None,
+        **kwargs: Any,
+    ):
+        # Tools are formatted once by the primary model; every provider of the
+        # gateway takes them in the OpenAI format
+        if parallel_tool_calls is not None:
+            kwargs["parallel_tool_calls"] = parallel_tool_calls
+        binding = self.routes[0].model.bind_tools(
+            tools, tool_choice=tool_choice, **kwargs
+        )
+        return self.bind(**binding.kwargs)
+
+    def _available(self) -> Iterator[ModelRoute]:
+        # Breakers are asked lazily, so a half-open model only gives its trial
+        # call to a request that actually uses it
+        routes = (route for route in self.routes if route.breaker.allow())
+        first = next(routes, None)
+        if first is None:
+            raise CircuitOpenError(
+                "Every model is unavailable: "
+                + ", ".join(route.name for route in self.routes)
+            )
+        yield first
+        yield from routes
+
+    async def _attempt(
+        self,
+        route: ModelRoute,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]],
+        run_manager: Optional[AsyncCallbackManagerForLLMRun],
+        **kwargs: Any,
+    ) -> ChatResult:
+        start = time.perf_counter()
+        try:
+            result = await route.model._agenerate(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        except asyncio.CancelledError:
+            # A hedged call that lost the race is not a failure
+            route.breaker.release()
+            raise
+        except Exception as e:
+            route.breaker.record(False)
+            logger.warning(f"LLM call to {route.name} failed: {str(e)}")
+            raise
+        route.breaker.record(True)
+        route.latencies.record(time.perf_counter() - start)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        routes = self._available()
+        primary = next(routes)
+
+        hedge_after = None
+        if self.hedge_percentile is not None and len(self.routes) > 1:
+            hedge_after = primary.latencies.percentile(self.hedge_percentile)
+
+        tasks = [
+            asyncio.ensure_future(
+                self._attempt(primary, messages, stop, run_manager, **kwargs)
+            )
+        ]
+        try:
+            if hedge_after is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                hedge = None if done else next(routes, None)
+                if hedge is not None:
+                    logger.info(
+                        f"{primary.name} slower than {hedge_after:.2f}s, "
+                        f"hedging with {hedge.name}"
+                    )
+                    tasks.append(
+                        asyncio.ensure_future(
+                            self._attempt(hedge, messages, stop, run_manager, **kwargs)
+                        )
+                    )
+
+            error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+
+            # Every call in flight failed: fall back to the remaining models
+            for route in routes:
+                try:
+                    return await self._attempt(
+                        route, messages, stop, run_manager, **kwargs
+                    )
+                except Exception as e:
+                    error = e
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        error = None
+        for route in self._available():
+            start = time.perf_counter()
+            try:
+                result = route.model._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                route.breaker.record(False)
+                logger.warning(f"LLM call to {route.name} failed: {str(e)}")
+                error = e
+                continue
+            route.breaker.record(True)
+            route.latencies.record(time.perf_counter() - start)
+            return result
+        raise error
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        # Streams fall back to the next model only before their first chunk
+        error = None
+        for route in self._available():
+            start = time.perf_counter()
+            started = False
+            try:
+                async for chunk in route.model._astream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    started = True
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                route.breaker.release()
+                raise
+            except Exception as e:
+                route.breaker.record(False)
+                logger.warning(f"LLM stream from {route.name} failed: {str(e)}")
+                if started:
+                    raise
+                error = e
+                continue
+            route.breaker.record(True)
+            route.latencies.record(time.perf_counter() - start)
+            return
+        raise error
@@ -1,6 +1,9 @@
 from app.infrastructure.entities.entities import (
     Framework,
     LangpifyTemplateLanguage,
+    LangpifyTemplateLLM,
+    LangpifyTemplateLLMGateway,
+    LangpifyTemplateGatewayPolicy,
     LangpifyLanguage,
     LangpifyLLM,
     LangpifyAgentType,
@@ -14,11 +17,20 @@ from app.infrastructure.entities.entities import (
 
 
 from app.domain.agents.supervisor.supervisor_prompt import SUPERVISOR_PROMPT
+from app.domain.settings.constants import LLM_MAX_RETRIES, LLM_TIMEOUT
+from app.domain.utils.llm_gateway import (
+    GatewayChatModel,
+    ModelRoute,
+    get_provider_http_clients,
+)
 
 from langchain_openai import ChatOpenAI
 from langchain_groq import ChatGroq
 
 import os
+import json
+import threading
+from functools import partial
 from dotenv import dotenv_values, load_dotenv
 from typing import Any, Optional, Type, Callable, List
 import yaml
@@ -140,6 +152,108 @@ def setup_logging(
     return logger
 
 
+_chat_models: dict[tuple, Any] = {}
+_chat_models_lock = threading.Lock()
+
+
+def get_chat_model(
+    model_settings: LangpifyTemplateLLM,
+    policy: Optional[LangpifyTemplateGatewayPolicy] = None,
+) -> Any:
+    """
+    Get the chat model client for a provider, model and temperature.
+
+    Clients are shared by every agent (and every environment re-init) that
+    uses the same model, and every client of a provider shares one
+    connection pool.
+
+    Args:
+        model_settings: Model block of an agent manifest
+        policy: Gateway block of the manifest (request timeout and retries)
+
+    Returns:
+        A ChatOpenAI or ChatGroq instance
+    """
+    policy = policy or {}
+    timeout = policy.get("timeout", LLM_TIMEOUT)
+    max_retries = policy.get("max_retries", LLM_MAX_RETRIES)
+    key = (
+        model_settings["provider"],
+        model_settings["model"],
+        model_settings.get("temperature"),
+        timeout,
+        max_retries,
+    )
+    model = _chat_models.get(key)
+    if model is None:
+        with _chat_models_lock:
+            model = _chat_models.get(key)
+            if model is None:
+                if model_settings["provider"] == "openai":
+                    model_class = ChatOpenAI
+                elif model_settings["provider"] == "groq":
+                    model_class = ChatGroq
+                else:
+                    raise ValueError(
+                        f"Unsupported model provider: {model_settings['provider']}"
+                    )
+                http_client, http_async_client = get_provider_http_clients(
+                    model_settings["provider"]
+                )
+                model = model_class(
+                    model=model_settings["model"],
+                    temperature=model_settings.get("temperature"),
+                    timeout=timeout,
+                    max_retries=max_retries,
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                    verbose=True,
+                )
+                _chat_models[key] = model
+    return model
+
+
+_gateways: dict[str, GatewayChatModel] = {}
+
+
+def get_gateway_model(llm_settings: LangpifyTemplateLLMGateway) -> GatewayChatModel:
+    """
+    Get the LLM gateway for a manifest's `language.llm` block.
+
+    The primary model is used first; the secondary one takes failed calls,
+    calls made while the primary's circuit is open and, with a
+    `hedge_percentile` in the gateway block, calls where the primary is slow.
+
+    Args:
+        llm_settings: `language.llm` block of an agent manifest
+
+    Returns:
+        A chat model routing over the primary and secondary models
+    """
+    key = json.dumps(llm_settings, sort_keys=True, default=str)
+    gateway = _gateways.get(key)
+    if gateway is None:
+        policy = llm_settings.get("gateway") or {}
+        routes = []
+        for role in ("primary_model", "secondary_model"):
+            model_settings = llm_settings.get(role)
+            if model_settings:
+                routes.append(
+                    ModelRoute(
+                        f"{model_settings['provider']}/{model_settings['model']}",
+                        partial(get_chat_model, model_settings, policy),
+                        policy.get("circuit_breaker"),
+                    )
+                )
+        gateway = GatewayChatModel(
+            routes=routes, hedge_percentile=policy.get("hedge_percentile")
+        )
+        # The primary model is built now so a bad manifest fails at init
+        routes[0].model
+        _gateways[key] = gateway
+    return gateway
+
+
 def get_llm(
     framework: Framework,
     llm_settings: LangpifyTemplateLanguage,
@@ -156,51 +270,12 @@ def get_llm(
         llm["model_provider"] = llm_settings["llm"]["primary_model"]["provider"]
         llm["model_name"] = llm_settings["llm"]["primary_model"]["model"]
 
-        """ As a good practise we add a LLM fallback 
-        Notice that this is just a simplification where we assumed which would be the secondary model
-        At productive environments we should build a more dynamic LLM Gateway fallback system
-        with circuit breakers for multiple models and providers, handling token management and cost optimization,
-        
-        
-        In productive environments we should also use rate limiters.
-         """
-
-        if llm_settings["llm"]["primary_model"]["provider"] == "openai":
-            openai_model = ChatOpenAI(
-                model=llm_settings["llm"]["primary_model"]["model"],
-                temperature=llm_settings["llm"]["primary_model"]["temperature"],
-                verbose=True,
-            )
-            groq_model = ChatGroq(
-                model=llm_settings["llm"]["secondary_model"]["model"],
-                temperature=llm_settings["llm"]["secondary_model"]["temperature"],
-                verbose=True,
-            )
-            llm["model"] = openai_model
-
-            """ We could use fallbacks if we want to use a secondary model
-            llm["model"] = openai_model.with_fallbacks(
-                [groq_model]
-            )
-            """
-        elif llm_settings["llm"]["primary_model"]["provider"] == "groq":
-            groq_model = ChatGroq(
-                model=llm_settings["llm"]["primary_model"]["model"],
-                temperature=llm_settings["llm"]["primary_model"]["temperature"],
-                verbose=True,
-            )
-            openai_model = ChatOpenAI(
-                model=llm_settings["llm"]["secondary_model"]["model"],
-                temperature=llm_settings["llm"]["secondary_model"]["temperature"],
-                verbose=True,
-            )
-            llm["model"] = groq_model
-
-            """ We could use fallbacks if we want to use a secondary model
-            llm["model"] = groq_model.with_fallbacks(
-                [openai_model]
-            )
-            """
+        # The LLM gateway falls back to the secondary model when the primary
+        # fails or its circuit breaker is open, and can hedge slow calls with it.
+        # Its policy (timeouts, retries, circuit breaker, hedging) comes from the
+        # `gateway` block of the manifest.
+        # In productive environments we should also use rate limiters.
+        llm["model"] = get_gateway_model(llm_settings["llm"])
 
         language["llm"] = llm
 
@@ -1,6 +1,11 @@
 from dependency_injector import containers, providers
 
+from app.application.services.agent_factory import AgentFactory
 from app.application.services.agent_management_service import AgentManagementService
+from app.application.services.battle_service import BattleService
+from app.application.services.prefetcher import Prefetcher
+from app.application.services.query_router import QueryRouter
+from app.application.services.render_service import RenderService
 from app.application.ai_settings.ai_settings_provider import AISettingsProvider
 
 
@@ -22,7 +27,28 @@ class Container(containers.DeclarativeContainer):
     # Registrar AISettingsProvider como singleton
     ai_settings_provider = providers.Singleton(AISettingsProvider)
 
-    # Inyectar AISettingsProvider en AgentManagementService
+    # Agentes construidos (clientes LLM y grafos compilados) por huella del manifiesto
+    agent_factory = providers.Singleton(AgentFactory)
+
+    # Clasificador local de consultas del supervisor (y sus métricas)
+    query_router = providers.Singleton(QueryRouter)
+
+    # Precarga especulativa de los Pokémon nombrados en cada pregunta
+    prefetcher = providers.Singleton(Prefetcher)
+
+    # Inyectar AISettingsProvider, AgentFactory, QueryRouter y Prefetcher en AgentManagementService
     agent_management_service = providers.Singleton(
-        AgentManagementService, ai_settings_provider=ai_settings_provider
+        AgentManagementService,
+        ai_settings_provider=ai_settings_provider,
+        agent_factory=agent_factory,
+        query_router=query_router,
+        prefetcher=prefetcher,
     )
+
+    # Servicio de batallas deterministas (modo fast) y narraciones en segundo plano
+    battle_service = providers.Singleton(
+        BattleService, agent_management_service=agent_management_service
+    )
+
+    # Servicio de renderizado de GIFs en un pool de procesos
+    render_service = providers.Singleton(RenderService)
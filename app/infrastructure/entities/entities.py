@@ -103,9 +103,25 @@ class LangpifyTemplateLLM(TypedDict):
     max_tokens: Optional[int] = None
 
 
+class LangpifyTemplateCircuitBreaker(TypedDict, total=False):
+    failure_rate: float  # Share of failed calls that opens the circuit
+    window: int  # Number of recent calls the failure rate is computed over
+    min_calls: int  # Calls needed in the window before the circuit can open
+    recovery_timeout: float  # Seconds before a trial call may close it again
+
+
+class LangpifyTemplateGatewayPolicy(TypedDict, total=False):
+    timeout: float  # Seconds per LLM request
+    max_retries: int  # Provider SDK retries per request
+    # Primary latency percentile that triggers a hedged request to the secondary model
+    hedge_percentile: Optional[float]
+    circuit_breaker: LangpifyTemplateCircuitBreaker
+
+
 class LangpifyTemplateLLMGateway(TypedDict):
     primary_model: LangpifyTemplateLLM
     secondary_model: Optional[LangpifyTemplateLLM]
+    gateway: Optional[LangpifyTemplateGatewayPolicy]
 
 
 class LangpifyTemplateLanguage(TypedDict):
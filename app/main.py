@@ -8,6 +8,9 @@ from app.domain.settings.routers import setup_routers
 from app.domain.settings.limiters import setup_limiters
 from app.domain.settings.static import setup_static
 from app.domain.settings.ai_settings import setup_ai_settings
+from app.domain.settings.http_clients import setup_http_clients
+from app.domain.settings.render import setup_render
+from app.domain.settings.warmup import setup_warmup
 from app.infrastructure.container.container import Container
 from app.domain.utils.utils import setup_logging
 
@@ -36,9 +39,18 @@ app.logger = setup_logging(logger_name="pokemon_agent_system")
 # Setup Static
 setup_static(app)
 
+# Setup outbound HTTP clients
+setup_http_clients(app)
+
 # Dependencies Container
 app.container = Container()
 
+# Setup render workers
+setup_render(app)
+
+# Preload indexes (in gunicorn's master, before fork)
+setup_warmup(app)
+
 # Global AI Settings
 setup_ai_settings(app)
 
@@ -1,12 +1,26 @@
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi import Request
+import json
 import os
 
 from app.presentation.routers.endpoints import AGENT_PREFIX, AGENT_TEMPLATES
 from app.infrastructure.container.container import Container
 from dependency_injector.wiring import inject, Provide
 from app.application.services.agent_management_service import AgentManagementService
+from app.application.services.agent_registry import (
+    AgentNotFoundError,
+    AgentStatusError,
+)
+from app.application.services.battle_service import BattleService
+from app.application.services.prefetcher import Prefetcher
+from app.application.services.query_router import QueryRouter
+from app.application.services.render_service import (
+    DONE,
+    RenderQueueFullError,
+    RenderService,
+)
 from typing import Annotated
 from fastapi import HTTPException
 from app.domain.entities.routers.agents.routers import (
@@ -16,12 +30,66 @@ from app.domain.entities.routers.agents.routers import (
     AgentModel,
     InitEnvironmentResponse,
     ListAgentsResponse,
+    CountersResponse,
+    BattleMode,
+    AnimationFormat,
+    FastBattleResponse,
+    NarrationResponse,
+    RenderJobResponse,
+    MetricsResponse,
+    NegativeCacheMetrics,
+    PrefetchMetrics,
+    QueryRouterMetrics,
 )
+from app.infrastructure.entities.entities import LangpifyAgentType, LangpifyStatus
+from app.domain.settings.constants import (
+    BATTLE_ANIMATION_FORMAT,
+    BATTLE_DEFAULT_MODE,
+)
+from app.application.tools.utils.cache import get_pokeapi_cache
+from app.application.tools.utils.counters_index import get_counters_index
 from fastapi import Query
+from typing import Optional
 
 router = APIRouter(prefix=AGENT_PREFIX, tags=["agents"])
 
 
+def battle_question(pokemon1: str, pokemon2: str) -> str:
+    """Question asked to the supervisor for a battle between two Pokémon"""
+    return f"Tell me who would win in a battle between {pokemon1} and {pokemon2}? Provide detailed analysis. Make sure to invoke researcher and pokemon expert."
+
+
+def event_stream(events) -> StreamingResponse:
+    """
+    Serve (event, data) pairs as Server-Sent Events.
+
+    Errors raised while streaming are sent as a last 'error' event, since the
+    status code has already been sent. The events are closed once the
+    response ends, even when the client left before the first one.
+    """
+
+    async def close():
+        aclose = getattr(events, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    async def stream():
+        try:
+            async for event, data in events:
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            await close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(close),
+    )
+
+
 @router.get("/battle_minimal", response_class=HTMLResponse)
 async def serve_battle_minimal(request: Request):
     """
@@ -42,6 +110,16 @@ async def serve_battle_minimal(request: Request):
     return HTMLResponse(content=html_content)
 
 
+def _agent_model(agent) -> AgentModel:
+    agent_type = getattr(agent, "type", None)
+    return AgentModel(
+        aid=agent.aid,
+        role_name=agent.role["name"] if agent.role else "",
+        status=agent.status.value,
+        type=agent_type.value if agent_type else None,
+    )
+
+
 """
 List all available agent templates.
 Templates allow users to create agents with predefined roles and configurations.
@@ -88,12 +166,7 @@ async def create(
         agent = await agent_management_service.create_agent_from_template(
             aid_prefix=request.aid_prefix
         )
-        agent_model = AgentModel(
-            aid=agent.aid,
-            role_name=agent.role["name"] if agent.role else "",
-            status=agent.status.value,
-        )
-        return CreateAgentResponse(agent=agent_model)
+        return CreateAgentResponse(agent=_agent_model(agent))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -113,14 +186,7 @@ async def init(
     try:
         agents = await agent_management_service.init_environment()
         return InitEnvironmentResponse(
-            agents=[
-                AgentModel(
-                    aid=agent.aid,
-                    role_name=agent.role["name"] if agent.role else "",
-                    status=agent.status.value,
-                )
-                for agent in agents
-            ],
+            agents=[_agent_model(agent) for agent in agents],
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -137,23 +203,177 @@ async def list_agents(
     agent_management_service: Annotated[
         AgentManagementService, Depends(Provide[Container.agent_management_service])
     ],
+    type: Annotated[
+        Optional[LangpifyAgentType], Query(description="Only agents of this type")
+    ] = None,
+    agent_status: Annotated[
+        Optional[LangpifyStatus],
+        Query(alias="status", description="Only agents in this status"),
+    ] = None,
 ):
     try:
-        agents = await agent_management_service.list_agents()
+        agents = await agent_management_service.list_agents(
+            type=type, status=agent_status
+        )
         return ListAgentsResponse(
-            agents=[
-                AgentModel(
-                    aid=agent.aid,
-                    role_name=agent.role["name"] if agent.role else "",
-                    status=agent.status.value,
-                )
-                for agent in agents
-            ],
+            agents=[_agent_model(agent) for agent in agents],
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+"""
+Agent lifecycle: suspend, resume and delete agents without rebuilding them
+"""
+
+
+async def _lifecycle(transition, aid: str) -> AgentModel:
+    try:
+        return _agent_model(await transition(aid))
+    except AgentNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AgentStatusError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post(
+    "/{aid}/suspend", status_code=status.HTTP_200_OK, response_model=AgentModel
+)
+@inject
+async def suspend_agent(
+    aid: str,
+    agent_management_service: Annotated[
+        AgentManagementService, Depends(Provide[Container.agent_management_service])
+    ],
+):
+    return await _lifecycle(agent_management_service.suspend_agent, aid)
+
+
+@router.post("/{aid}/resume", status_code=status.HTTP_200_OK, response_model=AgentModel)
+@inject
+async def resume_agent(
+    aid: str,
+    agent_management_service: Annotated[
+        AgentManagementService, Depends(Provide[Container.agent_management_service])
+    ],
+):
+    return await _lifecycle(agent_management_service.resume_agent, aid)
+
+
+@router.delete("/{aid}", status_code=status.HTTP_200_OK, response_model=AgentModel)
+@inject
+async def delete_agent(
+    aid: str,
+    agent_management_service: Annotated[
+        AgentManagementService, Depends(Provide[Container.agent_management_service])
+    ],
+):
+    return await _lifecycle(agent_management_service.delete_agent, aid)
+
+
+@router.get(
+    "/system/metrics", status_code=status.HTTP_200_OK, response_model=MetricsResponse
+)
+@inject
+async def metrics(
+    query_router: Annotated[QueryRouter, Depends(Provide[Container.query_router])],
+    prefetcher: Annotated[Prefetcher, Depends(Provide[Container.prefetcher])],
+):
+    """
+    Routing metrics of the supervisor's local query router, prefetch counts
+    and the PokéAPI negative cache.
+
+    Returns:
+        Queries classified, how many skipped the supervisor (hit rate), the
+        decisions by pathway, the Pokémon prefetched from questions and the
+        unknown names answered without the PokéAPI
+    """
+    return MetricsResponse(
+        query_router=QueryRouterMetrics(**query_router.metrics()),
+        prefetch=PrefetchMetrics(**prefetcher.metrics()),
+        pokeapi_negative_cache=NegativeCacheMetrics(
+            **get_pokeapi_cache().negative_stats()
+        ),
+    )
+
+
+"""
+Stream an agent run as Server-Sent Events: 'handoff', 'tool_start', 'tool_end',
+'token' and a last 'final' event (or 'error')
+"""
+
+
+@router.get("/system/chat/stream", status_code=status.HTTP_200_OK)
+@inject
+async def chat_stream(
+    question: str,
+    agent_management_service: Annotated[
+        AgentManagementService, Depends(Provide[Container.agent_management_service])
+    ],
+    use_cache: Annotated[
+        bool, Query(description="Answer repeated questions from the response cache")
+    ] = True,
+    refresh: Annotated[
+        bool, Query(description="Ignore the cached answer and store a fresh one")
+    ] = False,
+):
+    return event_stream(
+        agent_management_service.stream_agent(
+            aid="supervisor@langpify.agents",
+            question=question,
+            use_cache=use_cache,
+            refresh=refresh,
+        )
+    )
+
+
+@router.get("/system/battle/stream", status_code=status.HTTP_200_OK)
+@inject
+async def battle_stream(
+    pokemon1: Annotated[str, Query(..., description="First Pokémon for battle")],
+    pokemon2: Annotated[str, Query(..., description="Second Pokémon for battle")],
+    agent_management_service: Annotated[
+        AgentManagementService, Depends(Provide[Container.agent_management_service])
+    ],
+    use_cache: Annotated[
+        bool, Query(description="Answer repeated questions from the response cache")
+    ] = True,
+    refresh: Annotated[
+        bool, Query(description="Ignore the cached answer and store a fresh one")
+    ] = False,
+):
+    return event_stream(
+        agent_management_service.stream_agent(
+            aid="supervisor@langpify.agents",
+            question=battle_question(pokemon1, pokemon2),
+            use_cache=use_cache,
+            refresh=refresh,
+        )
+    )
+
+
+@router.get("/{aid}/stream", status_code=status.HTTP_200_OK)
+@inject
+async def invoke_agent_stream(
+    aid: str,
+    question: str,
+    agent_management_service: Annotated[
+        AgentManagementService, Depends(Provide[Container.agent_management_service])
+    ],
+    use_cache: Annotated[
+        bool, Query(description="Answer repeated questions from the response cache")
+    ] = True,
+    refresh: Annotated[
+        bool, Query(description="Ignore the cached answer and store a fresh one")
+    ] = False,
+):
+    return event_stream(
+        agent_management_service.stream_agent(
+            aid=aid, question=question, use_cache=use_cache, refresh=refresh
+        )
+    )
+
+
 """
 Invoke an agent
 """
@@ -167,9 +387,17 @@ async def invoke_agent(
     agent_management_service: Annotated[
         AgentManagementService, Depends(Provide[Container.agent_management_service])
     ],
+    use_cache: Annotated[
+        bool, Query(description="Answer repeated questions from the response cache")
+    ] = True,
+    refresh: Annotated[
+        bool, Query(description="Ignore the cached answer and store a fresh one")
+    ] = False,
 ):
     try:
-        agent = await agent_management_service.invoke_agent(aid=aid, question=question)
+        agent = await agent_management_service.invoke_agent(
+            aid=aid, question=question, use_cache=use_cache, refresh=refresh
+        )
         return agent
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -182,10 +410,19 @@ async def chat(
     agent_management_service: Annotated[
         AgentManagementService, Depends(Provide[Container.agent_management_service])
     ],
+    use_cache: Annotated[
+        bool, Query(description="Answer repeated questions from the response cache")
+    ] = True,
+    refresh: Annotated[
+        bool, Query(description="Ignore the cached answer and store a fresh one")
+    ] = False,
 ):
     try:
         agent = await agent_management_service.invoke_agent(
-            aid="supervisor@langpify.agents", question=question
+            aid="supervisor@langpify.agents",
+            question=question,
+            use_cache=use_cache,
+            refresh=refresh,
         )
         return agent
     except Exception as e:
@@ -200,24 +437,62 @@ async def battle(
     agent_management_service: Annotated[
         AgentManagementService, Depends(Provide[Container.agent_management_service])
     ],
+    battle_service: Annotated[
+        BattleService, Depends(Provide[Container.battle_service])
+    ],
+    mode: Annotated[
+        Optional[BattleMode],
+        Query(
+            description="'fast' skips the LLM, 'agents' runs the multi-agent workflow"
+        ),
+    ] = None,
+    narrate: Annotated[
+        bool, Query(description="In fast mode, narrate the result in the background")
+    ] = False,
+    use_cache: Annotated[
+        bool, Query(description="Answer repeated questions from the response cache")
+    ] = True,
+    refresh: Annotated[
+        bool, Query(description="Ignore the cached answer and store a fresh one")
+    ] = False,
 ):
     """
-    Simulates a battle between two Pokémon using the supervisor agent.
+    Simulates a battle between two Pokémon using the supervisor agent, or
+    deterministically with the battle analysis in fast mode.
 
     Args:
         pokemon1: First Pokémon name (e.g. 'pikachu')
         pokemon2: Second Pokémon name (e.g. 'bulbasaur')
+        mode: 'fast' or 'agents' (defaults to BATTLE_DEFAULT_MODE)
+        narrate: Start an LLM narration of the fast result
+        use_cache: Answer repeated battles from the response cache (agents mode)
+        refresh: Ignore the cached answer and store a fresh one (agents mode)
 
     Returns:
-        The agent's response with battle analysis
+        The agent's response with battle analysis, or the winner and reasoning
+        in fast mode
     """
     try:
+        if (mode or BattleMode(BATTLE_DEFAULT_MODE)) == BattleMode.FAST:
+            result = await battle_service.fast_battle(pokemon1, pokemon2)
+            narration_id = (
+                battle_service.narrate(pokemon1, pokemon2, result) if narrate else None
+            )
+            return FastBattleResponse(
+                winner=result.winner,
+                reasoning=result.reasoning,
+                narration_id=narration_id,
+            )
+
         # Format the battle question
-        question = f"Tell me who would win in a battle between {pokemon1} and {pokemon2}? Provide detailed analysis. Make sure to invoke researcher and pokemon expert."
+        question = battle_question(pokemon1, pokemon2)
 
         # Invoke the supervisor agent
         agent_response = await agent_management_service.invoke_agent(
-            aid="supervisor@langpify.agents", question=question
+            aid="supervisor@langpify.agents",
+            question=question,
+            use_cache=use_cache,
+            refresh=refresh,
         )
 
         return agent_response
@@ -228,3 +503,209 @@ async def battle(
         raise HTTPException(
             status_code=500, detail=f"Error processing battle request: {str(e)}"
         )
+
+
+@router.get(
+    "/system/battle/narration/{narration_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=NarrationResponse,
+)
+@inject
+async def battle_narration(
+    narration_id: str,
+    battle_service: Annotated[
+        BattleService, Depends(Provide[Container.battle_service])
+    ],
+):
+    """
+    Poll the narration started by a fast battle with narrate=true.
+
+    Args:
+        narration_id: Id returned by the battle route
+
+    Returns:
+        The narration status and text once done
+    """
+    narration = battle_service.get_narration(narration_id)
+    if narration is None:
+        raise HTTPException(
+            status_code=404, detail=f"Narration {narration_id} not found"
+        )
+    return NarrationResponse(**narration)
+
+
+def _render_job_response(job_id: str, job: dict) -> RenderJobResponse:
+    return RenderJobResponse(
+        job_id=job_id,
+        status=job["status"],
+        error=job["error"],
+        result_url=(
+            f"{AGENT_PREFIX}/system/battle/render/{job_id}/result"
+            if job["status"] == DONE
+            else None
+        ),
+    )
+
+
+@router.post(
+    "/system/battle/render",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=RenderJobResponse,
+)
+@inject
+async def submit_render(
+    pokemon1: Annotated[str, Query(..., description="First Pokémon for battle")],
+    pokemon2: Annotated[str, Query(..., description="Second Pokémon for battle")],
+    render_service: Annotated[
+        RenderService, Depends(Provide[Container.render_service])
+    ],
+    use_shiny: Annotated[bool, Query(description="Use shiny sprites")] = False,
+    output_format: Annotated[
+        Optional[AnimationFormat],
+        Query(alias="format", description="gif, webp or apng"),
+    ] = None,
+):
+    """
+    Queue the rendering of a battle animation on the render workers.
+
+    Args:
+        pokemon1: First Pokémon name (e.g. 'pikachu')
+        pokemon2: Second Pokémon name (e.g. 'bulbasaur')
+        use_shiny: Whether to use shiny sprites
+        output_format: Animation format (BATTLE_ANIMATION_FORMAT by default)
+
+    Returns:
+        The job id and status to poll
+    """
+    output_format = (output_format or AnimationFormat(BATTLE_ANIMATION_FORMAT)).value
+    try:
+        job_id = render_service.submit(pokemon1, pokemon2, use_shiny, output_format)
+    except RenderQueueFullError as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "5"}
+        )
+    return _render_job_response(job_id, render_service.get_job(job_id))
+
+
+@router.get("/system/battle/render/stream", status_code=status.HTTP_200_OK)
+@inject
+async def render_stream(
+    pokemon1: Annotated[str, Query(..., description="First Pokémon for battle")],
+    pokemon2: Annotated[str, Query(..., description="Second Pokémon for battle")],
+    render_service: Annotated[
+        RenderService, Depends(Provide[Container.render_service])
+    ],
+    use_shiny: Annotated[bool, Query(description="Use shiny sprites")] = False,
+):
+    """
+    Render a battle and stream its frames as Server-Sent Events.
+
+    Args:
+        pokemon1: First Pokémon name (e.g. 'pikachu')
+        pokemon2: Second Pokémon name (e.g. 'bulbasaur')
+        use_shiny: Whether to use shiny sprites
+
+    Returns:
+        'frame' events (index, duration in milliseconds and a JPEG data URL)
+        as soon as each frame is drawn, then a 'done' event with the result
+    """
+    try:
+        frames = render_service.stream(pokemon1, pokemon2, use_shiny)
+    except RenderQueueFullError as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "5"}
+        )
+    return event_stream(frames)
+
+
+@router.get(
+    "/system/battle/render/{job_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=RenderJobResponse,
+)
+@inject
+async def render_status(
+    job_id: str,
+    render_service: Annotated[
+        RenderService, Depends(Provide[Container.render_service])
+    ],
+):
+    """
+    Poll a render job.
+
+    Args:
+        job_id: Id returned by the submit route
+
+    Returns:
+        The job status, and the download URL once done
+    """
+    job = render_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Render job {job_id} not found")
+    return _render_job_response(job_id, job)
+
+
+@router.get("/system/battle/render/{job_id}/result", status_code=status.HTTP_200_OK)
+@inject
+async def render_result(
+    job_id: str,
+    render_service: Annotated[
+        RenderService, Depends(Provide[Container.render_service])
+    ],
+):
+    """
+    Download the animation of a finished render job.
+
+    Args:
+        job_id: Id returned by the submit route
+
+    Returns:
+        The battle animation
+    """
+    job = render_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Render job {job_id} not found")
+    if job["status"] != DONE:
+        raise HTTPException(
+            status_code=409, detail=f"Render job {job_id} is {job['status']}"
+        )
+    if not os.path.exists(job["path"]):
+        raise HTTPException(
+            status_code=410, detail=f"Render job {job_id} output was removed"
+        )
+    return FileResponse(job["path"], media_type=job["media_type"])
+
+
+@router.get(
+    "/system/counters/{pokemon}",
+    status_code=status.HTTP_200_OK,
+    response_model=CountersResponse,
+)
+async def counters(
+    pokemon: str,
+    limit: Annotated[
+        Optional[int], Query(ge=1, description="Maximum number of counters")
+    ] = None,
+):
+    """
+    Best counters of a Pokémon from the precomputed counters index (no LLM call).
+
+    Args:
+        pokemon: Pokémon name, national dex id or alias (e.g. 'garchomp')
+        limit: Optional maximum number of counters
+
+    Returns:
+        The Pokémon's counters, widest winning margin first
+    """
+    index = get_counters_index()
+    if len(index) == 0:
+        raise HTTPException(
+            status_code=503,
+            detail="Counters index not built, run `make counters` first",
+        )
+    result = index.counters(pokemon, limit)
+    if result is None:
+        raise HTTPException(
+            status_code=404, detail=f"Pokémon '{pokemon}' not found in counters index"
+        )
+    return CountersResponse(pokemon=index.resolve(pokemon), counters=result)
@@ -1,4 +1,11 @@
+import gc
 import multiprocessing
+import os
+
+from app.application.services.render_service import (
+    start_render_broker,
+    stop_render_broker,
+)
 
 workers = multiprocessing.cpu_count() * 2 + 1
 bind = "0.0.0.0:" + os.getenv("PORT", "8080")
@@ -8,3 +15,18 @@ keepalive = 5
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
+
+# Import the app (and run its warm-up) once in the master, before forking
+preload_app = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+
+
+def when_ready(server):
+    # One render pool and job queue, shared by every worker forked from here
+    start_render_broker()
+    # Move everything loaded so far out of the garbage collector's reach, so
+    # collections in the workers don't write to (and copy) the shared pages
+    gc.freeze()
+
+
+def on_exit(server):
+    stop_render_broker()
@@ -1,13 +1,29 @@
 import pytest
 import sys
 import os
+import json
 from unittest.mock import MagicMock, AsyncMock
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.domain.agents.base_agent import LangpifyBaseAgent
-from app.domain.entities.agent_status import AgentStatus
+from app.infrastructure.entities.base_agent import LangpifyBaseAgent
+from app.infrastructure.entities.entities import LangpifyStatus as AgentStatus
 from app.application.services.agent_management_service import AgentManagementService
+from app.application.tools.utils.pokedex import PokedexStore, write_pokedex
+
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixtures", "pokedex_snapshot.json"
+)
+
+
+@pytest.fixture
+def pokedex_store(tmp_path):
+    """Fixture for a Pokédex store built from the checked-in snapshot"""
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    db_path = str(tmp_path / "pokedex.sqlite")
+    write_pokedex(db_path, snapshot["entries"], snapshot["types"])
+    return PokedexStore(db_path)
 
 
 @pytest.fixture
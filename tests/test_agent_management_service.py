@@ -0,0 +1,349 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch, MagicMock, AsyncMock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.services.agent_management_service import AgentManagementService
+from app.application.services.agent_registry import (
+    AgentNotFoundError,
+    AgentRegistry,
+    AgentStatusError,
+)
+from app.application.services.prefetcher import Prefetcher
+from app.application.services.query_router import QueryRouter
+from app.application.tools.utils.name_extractor import NameExtractor
+from app.application.tools.utils.cache import TwoTierCache
+from app.infrastructure.entities.entities import LangpifyAgentType, LangpifyStatus
+from langchain_core.messages import AIMessage
+
+
+@pytest.fixture
+def service_with_agent():
+    """Fixture for a service holding one active agent with a mocked workflow"""
+    with patch(
+        "app.application.services.agent_management_service.get_agent_response_cache",
+        return_value=TwoTierCache(name="test", directory=None, stale_ttl=0),
+    ):
+        # No Pokémon names, so every query goes to the supervisor workflow
+        # and nothing is prefetched
+        service = AgentManagementService(
+            ai_settings_provider=MagicMock(),
+            query_router=QueryRouter(names=[]),
+            prefetcher=Prefetcher(extractor=NameExtractor({})),
+        )
+
+    workflow = MagicMock()
+    workflow.ainvoke = AsyncMock(
+        side_effect=lambda state: {"input": state["input"], "messages": []}
+    )
+    agent = MagicMock()
+    agent.aid = "supervisor@langpify.agents"
+    agent.role = {"prompt": "You are a Supervisor."}
+    agent.status = LangpifyStatus.ACTIVE
+    agent.planning = {"workflow": {"graph": workflow}}
+    service._agents.put(agent)
+    return service, workflow
+
+
+class TestAgentManagementService:
+    """Tests for the AgentManagementService response cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_question_is_cached(self, service_with_agent):
+        """Test that normalized repeats of a question skip the workflow"""
+        service, workflow = service_with_agent
+
+        first = await service.invoke_agent(
+            "supervisor@langpify.agents", "Who wins, Pikachu or Squirtle?"
+        )
+        second = await service.invoke_agent(
+            "supervisor@langpify.agents", "  who wins,   pikachu or squirtle  "
+        )
+
+        assert first == second
+        assert workflow.ainvoke.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_bypass_and_refresh(self, service_with_agent):
+        """Test that use_cache=False and refresh=True run the workflow again"""
+        service, workflow = service_with_agent
+        aid = "supervisor@langpify.agents"
+
+        await service.invoke_agent(aid, "Tell me about Pikachu")
+        await service.invoke_agent(aid, "Tell me about Pikachu", use_cache=False)
+        await service.invoke_agent(aid, "Tell me about Pikachu", refresh=True)
+        await service.invoke_agent(aid, "Tell me about Pikachu")
+
+        assert workflow.ainvoke.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_state_is_json(self, service_with_agent, tmp_path):
+        """Test that final states are cached as JSON and their messages rebuilt"""
+        service, workflow = service_with_agent
+        service._response_cache = TwoTierCache(
+            name="test", directory=str(tmp_path), stale_ttl=0
+        )
+        workflow.ainvoke = AsyncMock(
+            return_value={"messages": [AIMessage(content="Pikachu!")], "step": 1}
+        )
+        aid = "supervisor@langpify.agents"
+
+        await service.invoke_agent(aid, "Tell me about Pikachu")
+        service._response_cache.clear_memory()
+        cached = await service.invoke_agent(aid, "Tell me about Pikachu")
+
+        assert workflow.ainvoke.call_count == 1
+        assert [path.suffix for path in tmp_path.iterdir()] == [".json"]
+        assert isinstance(cached["messages"][0], AIMessage)
+        assert cached["messages"][0].content == "Pikachu!"
+        assert cached["step"] == 1
+
+    def test_normalize_question(self):
+        """Test question normalization"""
+        assert AgentManagementService.normalize_question("  Who WINS?\n") == "who wins"
+
+    @pytest.mark.asyncio
+    async def test_stream_agent(self, service_with_agent):
+        """Test that stream events are mapped and the final state is cached"""
+        service, workflow = service_with_agent
+
+        async def astream_events(state, version):
+            yield {
+                "event": "on_tool_start",
+                "name": "transfer_to_researcher",
+                "metadata": {"langgraph_node": "supervisor"},
+                "data": {},
+            }
+            yield {
+                "event": "on_chat_model_stream",
+                "name": "ChatOpenAI",
+                "metadata": {"langgraph_node": "researcher"},
+                "data": {"chunk": MagicMock(content="Pika")},
+            }
+            yield {
+                "event": "on_chain_end",
+                "name": "LangGraph",
+                "parent_ids": [],
+                "data": {
+                    "output": {
+                        "messages": [AIMessage(content="Pikachu!")],
+                        "structured_response": None,
+                    }
+                },
+            }
+
+        workflow.astream_events = astream_events
+        aid = "supervisor@langpify.agents"
+
+        events = [e async for e in service.stream_agent(aid, "Tell me about Pikachu")]
+        assert [event for event, _ in events] == ["handoff", "token", "final"]
+        assert events[0][1] == {"to": "researcher"}
+        assert events[-1][1]["answer"] == "Pikachu!"
+
+        replay = [e async for e in service.stream_agent(aid, "Tell me about Pikachu")]
+        assert len(replay) == 1 and replay[0][1]["cached"]
+
+    @pytest.mark.asyncio
+    async def test_init_environment_reuses_agents(self):
+        """Test that re-initializing the environment builds each agent once"""
+
+        def build_agent(**kwargs):
+            agent = MagicMock()
+            agent.aid = kwargs["aid"]
+            agent.planning = {"workflow": {"graph": MagicMock()}}
+            return agent
+
+        with patch(
+            "app.application.services.agent_management_service.get_agent_response_cache"
+        ), patch(
+            "app.application.services.agent_management_service.LangpifyBaseAgent",
+            side_effect=build_agent,
+        ) as mock_agent:
+            service = AgentManagementService(ai_settings_provider=MagicMock())
+            first = await service.init_environment()
+            second = await service.init_environment()
+
+        assert mock_agent.call_count == 3
+        assert [agent.aid for agent in first] == [agent.aid for agent in second]
+        assert all(a is b for a, b in zip(first, second))
+        assert len(await service.list_agents()) == 3
+
+        # The supervisor embeds its sub-agents' workflows, found by aid
+        sub_workflows = mock_agent.call_args_list[-1].kwargs["sub_workflows"]
+        assert sub_workflows == [
+            service._agents.get(aid).planning["workflow"]["graph"]
+            for aid in ("researcher@langpify.agents", "pokemon_expert@langpify.agents")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_lifecycle(self, service_with_agent):
+        """Test suspending, resuming and deleting an agent"""
+        service, workflow = service_with_agent
+        aid = "supervisor@langpify.agents"
+
+        await service.suspend_agent(aid)
+        assert await service.list_agents(status=LangpifyStatus.ACTIVE) == []
+        with pytest.raises(ValueError, match="not active"):
+            await service.invoke_agent(aid, "Tell me about Pikachu")
+        with pytest.raises(AgentStatusError):
+            await service.suspend_agent(aid)
+
+        await service.resume_agent(aid)
+        assert len(await service.list_agents(status=LangpifyStatus.ACTIVE)) == 1
+        await service.invoke_agent(aid, "Tell me about Pikachu")
+
+        await service.delete_agent(aid)
+        assert await service.list_agents() == []
+        with pytest.raises(AgentNotFoundError):
+            await service.resume_agent(aid)
+
+    @pytest.mark.asyncio
+    async def test_query_router_skips_supervisor(self, service_with_agent):
+        """Test that a confidently classified battle runs the sub-agents directly"""
+        from langchain_core.messages import AIMessage
+        from app.domain.agents.pokemon_expert.pokemon_expert_models import (
+            PokemonExpertResponse,
+        )
+
+        service, supervisor_workflow = service_with_agent
+        service.query_router = QueryRouter(names=["pikachu", "squirtle"])
+        sub_workflows = {}
+        for aid, answer, structured in (
+            ("researcher@langpify.agents", "[pikachu, squirtle]", None),
+            (
+                "pokemon_expert@langpify.agents",
+                "Pikachu wins",
+                PokemonExpertResponse(winner="pikachu", reasoning="Electric"),
+            ),
+        ):
+            agent = MagicMock()
+            agent.aid = aid
+            agent.name = aid.split("@")[0]
+            agent.role = {"prompt": "You are a sub-agent."}
+            agent.status = LangpifyStatus.ACTIVE
+            sub_workflows[aid] = MagicMock()
+            sub_workflows[aid].ainvoke = AsyncMock(
+                return_value={
+                    "messages": [AIMessage(content=answer)],
+                    "structured_response": structured,
+                }
+            )
+            agent.planning = {"workflow": {"graph": sub_workflows[aid]}}
+            service._agents.put(agent)
+
+        state = await service.invoke_agent(
+            "supervisor@langpify.agents", "Who would win, Pikachu or Squirtle?"
+        )
+
+        assert state["structured_response"].answer == "Pikachu wins"
+        assert state["pokemon_expert_response"].winner == "pikachu"
+        assert state["route"]["pathway"] == "D"
+        supervisor_workflow.ainvoke.assert_not_called()
+        # The expert gets the researcher's data
+        expert_input = sub_workflows[
+            "pokemon_expert@langpify.agents"
+        ].ainvoke.call_args[0][0]["input"]
+        assert "[pikachu, squirtle]" in expert_input
+
+        # Researcher-only answers carry no reasoning
+        state = await service.invoke_agent(
+            "supervisor@langpify.agents", "What are the base stats of Pikachu?"
+        )
+        assert state["route"]["pathway"] == "B"
+        assert state["structured_response"].reasoning is None
+
+        # Ambiguous queries and failed dispatches go to the supervisor
+        await service.invoke_agent("supervisor@langpify.agents", "Who wins?")
+        await service.suspend_agent("researcher@langpify.agents")
+        await service.invoke_agent(
+            "supervisor@langpify.agents", "Compare Pikachu and Squirtle"
+        )
+        assert supervisor_workflow.ainvoke.call_count == 2
+        metrics = service.query_router.metrics()
+        assert metrics["queries"] == 4
+        assert metrics["direct"] == 2
+        assert metrics["dispatch_errors"] == 1
+
+
+class TestAgentRegistry:
+    """Tests for the indexed agent registry"""
+
+    @staticmethod
+    def agent(aid, type, status=LangpifyStatus.ACTIVE):
+        agent = MagicMock()
+        agent.aid = aid
+        agent.type = type
+        agent.status = status
+        return agent
+
+    def test_indexes_follow_replacements_and_status(self):
+        """Test that the type and status indexes stay in sync"""
+        registry = AgentRegistry()
+        researcher = self.agent("researcher", LangpifyAgentType.OPS_AGENT)
+        supervisor = self.agent("supervisor", LangpifyAgentType.COORDINATOR_AGENT)
+        registry.put(researcher)
+        registry.put(supervisor)
+
+        assert registry.find(type=LangpifyAgentType.OPS_AGENT) == [researcher]
+
+        # Registering the aid again replaces the agent in place
+        rebuilt = self.agent("researcher", LangpifyAgentType.OPS_AGENT)
+        registry.put(rebuilt)
+        assert len(registry) == 2
+        assert registry.find() == [rebuilt, supervisor]
+
+        registry.set_status("supervisor", LangpifyStatus.SUSPENDED)
+        assert registry.find(status=LangpifyStatus.ACTIVE) == [rebuilt]
+        assert registry.find(
+            type=LangpifyAgentType.COORDINATOR_AGENT,
+            status=LangpifyStatus.SUSPENDED,
+        ) == [supervisor]
+
+        registry.remove("researcher")
+        assert registry.find(type=LangpifyAgentType.OPS_AGENT) == []
+        assert registry.get("researcher") is None
+        with pytest.raises(AgentNotFoundError):
+            registry.require("researcher")
+
+
+class TestChatModels:
+    """Tests for the shared LLM clients built by get_llm"""
+
+    def test_clients_are_shared_and_fallback_is_lazy(self):
+        """Test that agents with the same model share one client"""
+        from app.domain.utils import utils
+        from app.infrastructure.entities.entities import Framework
+
+        settings = {
+            "default": "en-US",
+            "llm": {
+                "primary_model": {
+                    "provider": "openai",
+                    "model": "gpt-4o-mini",
+                    "temperature": 0.1,
+                },
+                "secondary_model": {
+                    "provider": "groq",
+                    "model": "llama-3.1-8b-instant",
+                    "temperature": 0.2,
+                },
+            },
+        }
+        with patch.dict(utils._chat_models, clear=True), patch.dict(
+            utils._gateways, clear=True
+        ), patch.object(utils, "ChatOpenAI") as mock_openai, patch.object(
+            utils, "ChatGroq"
+        ) as mock_groq:
+            first = utils.get_llm(Framework.LANGGRAPH, settings)
+            second = utils.get_llm(Framework.LANGGRAPH, settings)
+
+            assert first["llm"]["model"] is second["llm"]["model"]
+            assert mock_openai.call_count == 1
+            mock_groq.assert_not_called()
+
+            # The gateway builds its secondary model on first use
+            fallback = first["llm"]["model"].routes[1].model
+            assert fallback is second["llm"]["model"].routes[1].model
+            assert mock_groq.call_count == 1
@@ -0,0 +1,91 @@
+import pytest
+import sys
+import os
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils.animation_encoder import (
+    TRANSPARENT_INDEX,
+    collapse_frames,
+    encode_animation,
+    shared_palette,
+)
+
+
+@pytest.fixture
+def frames():
+    """Battle-like frames: a static background with a changing message box"""
+    background = np.zeros((100, 160, 3), dtype=np.uint8)
+    background[:60] = (176, 224, 230)
+    background[60:] = (76, 187, 23)
+    result = []
+    for shade in (0, 0, 80, 160, 160, 160):
+        pixels = background.copy()
+        pixels[80:95, 10:60] = shade
+        result.append(Image.fromarray(pixels))
+    return result
+
+
+class TestAnimationEncoder:
+    """Tests for the battle animation encoder"""
+
+    def test_collapse_frames(self, frames):
+        """Test that identical consecutive frames become one longer frame"""
+        unique, durations = collapse_frames(frames, [1000] * len(frames))
+        assert len(unique) == 3
+        assert durations == [2000, 1000, 3000]
+
+    def test_gif(self, frames, tmp_path):
+        """Test that GIFs keep every distinct frame with a shared palette"""
+        path = encode_animation(
+            frames, [1000] * len(frames), str(tmp_path / "battle.gif")
+        )
+
+        with Image.open(path) as gif:
+            decoded = [frame.convert("RGB") for frame in ImageSequence.Iterator(gif)]
+            durations = []
+            for i in range(gif.n_frames):
+                gif.seek(i)
+                durations.append(gif.info["duration"])
+
+        assert durations == [2000, 1000, 3000]
+        for frame, expected in zip(decoded, (frames[0], frames[2], frames[3])):
+            assert np.array_equal(np.asarray(frame), np.asarray(expected))
+
+    def test_gif_delta_frames(self, frames, tmp_path):
+        """Test that frames after the first only store what changed"""
+        path = encode_animation(
+            frames, [1000] * len(frames), str(tmp_path / "battle.gif")
+        )
+        with Image.open(path) as gif:
+            gif.seek(1)
+            assert gif.dispose_extent == (10, 80, 60, 95)
+
+    @pytest.mark.parametrize("output_format", ["webp", "apng"])
+    def test_other_formats(self, frames, tmp_path, output_format):
+        """Test that WebP and APNG animations hold the distinct frames"""
+        path = encode_animation(
+            frames,
+            [1000] * len(frames),
+            str(tmp_path / f"battle.{output_format}"),
+            output_format,
+        )
+        with Image.open(path) as animation:
+            assert animation.n_frames == 3
+
+    def test_unknown_format(self, frames, tmp_path):
+        """Test that unknown formats are rejected"""
+        with pytest.raises(ValueError):
+            encode_animation(frames, [1000] * len(frames), str(tmp_path / "x"), "bmp")
+
+    def test_palette_keeps_transparent_index_free(self, frames):
+        """Test that no color is quantized to the transparent index"""
+        palette = shared_palette(frames)
+        for frame in frames:
+            indices = np.asarray(
+                frame.quantize(palette=palette, dither=Image.Dither.NONE)
+            )
+            assert not (indices == TRANSPARENT_INDEX).any()
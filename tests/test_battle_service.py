@@ -0,0 +1,118 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.services.battle_service import BattleService
+from app.application.tools.utils.cache import TwoTierCache
+
+
+@pytest.fixture(autouse=True)
+def narration_cache(tmp_path):
+    """Narration store in a temporary directory"""
+    cache = TwoTierCache(name="narrations", directory=str(tmp_path), max_entries=0)
+    with patch(
+        "app.application.services.battle_service.get_narration_cache",
+        return_value=cache,
+    ):
+        yield cache
+
+
+class TestBattleService:
+    """Tests for the BattleService"""
+
+    @pytest.mark.asyncio
+    async def test_fast_battle(self, pikachu_data, bulbasaur_data):
+        """Test that fast battles use the battle analysis without any agent"""
+        agent_management_service = MagicMock()
+        agent_management_service.invoke_agent = AsyncMock()
+        service = BattleService(agent_management_service)
+
+        with patch(
+            "app.application.services.battle_service.afetch_pokemon_data",
+            AsyncMock(side_effect=[pikachu_data, bulbasaur_data]),
+        ):
+            result = await service.fast_battle("pikachu", "bulbasaur")
+
+        assert result.winner == "bulbasaur"
+        assert "Bulbasaur" in result.reasoning
+        agent_management_service.invoke_agent.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fast_battle_unknown_pokemon(self, pikachu_data):
+        """Test that unknown Pokémon raise a ValueError"""
+        service = BattleService(MagicMock())
+
+        with patch(
+            "app.application.services.battle_service.afetch_pokemon_data",
+            AsyncMock(
+                side_effect=[pikachu_data, {"error": "Pokémon 'missingno' not found."}]
+            ),
+        ):
+            with pytest.raises(ValueError):
+                await service.fast_battle("pikachu", "missingno")
+
+    @pytest.mark.asyncio
+    async def test_narration(self, pikachu_data, bulbasaur_data):
+        """Test that narrations prompt the chat model with the fixed result"""
+        agent_management_service = MagicMock()
+        agent_management_service.invoke_agent = AsyncMock()
+        model = agent_management_service.get_chat_model.return_value
+        model.ainvoke = AsyncMock(return_value=AIMessage(content="A grassy showdown!"))
+        service = BattleService(agent_management_service)
+
+        with patch(
+            "app.application.services.battle_service.afetch_pokemon_data",
+            AsyncMock(side_effect=[pikachu_data, bulbasaur_data]),
+        ):
+            result = await service.fast_battle("pikachu", "bulbasaur")
+
+        narration_id = service.narrate("pikachu", "bulbasaur", result)
+        assert service.get_narration(narration_id)["status"] == "pending"
+
+        await asyncio.gather(*service._tasks)
+        assert service.get_narration(narration_id) == {
+            "status": "done",
+            "narration": "A grassy showdown!",
+        }
+        # The agents (and the query router) never see the battle again
+        agent_management_service.invoke_agent.assert_not_called()
+        prompt = model.ainvoke.call_args.args[0][-1].content
+        assert "Winner: bulbasaur" in prompt
+
+    @pytest.mark.asyncio
+    async def test_narration_shared_by_workers(self):
+        """Test that a narration started on one worker can be polled on another"""
+        model = MagicMock()
+        model.ainvoke = AsyncMock(return_value=AIMessage(content="Zap!"))
+        agent_management_service = MagicMock()
+        agent_management_service.get_chat_model.return_value = model
+        worker1 = BattleService(agent_management_service)
+        result = MagicMock(winner="pikachu", reasoning="Pikachu is faster.")
+
+        narration_id = worker1.narrate("pikachu", "squirtle", result)
+        await asyncio.gather(*worker1._tasks)
+
+        worker2 = BattleService(MagicMock())
+        assert worker2.get_narration(narration_id)["narration"] == "Zap!"
+        assert worker2.get_narration("../" + narration_id) is None
+
+    @pytest.mark.asyncio
+    async def test_narration_error(self):
+        """Test that a failing chat model marks the narration as failed"""
+        agent_management_service = MagicMock()
+        agent_management_service.get_chat_model.side_effect = ValueError(
+            "Agent supervisor@langpify.agents not found"
+        )
+        service = BattleService(agent_management_service)
+        result = MagicMock(winner="pikachu", reasoning="Pikachu is faster.")
+
+        narration_id = service.narrate("pikachu", "squirtle", result)
+        await asyncio.gather(*service._tasks)
+
+        assert service.get_narration(narration_id)["status"] == "error"
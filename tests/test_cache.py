@@ -0,0 +1,212 @@
+import pytest
+import sys
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils.cache import (
+    FileCache,
+    TwoTierCache,
+    battle_animation_key,
+    FRESH,
+    STALE,
+    MISS,
+)
+
+
+class TestTwoTierCache:
+    """Tests for the cache.py module"""
+
+    def test_memory_lru_eviction(self):
+        """Test that the in-process tier is bounded and evicts least recently used"""
+        cache = TwoTierCache(name="test", directory=None, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["memory_evictions"] == 1
+
+    def test_disk_tier_survives_memory_loss(self, tmp_path):
+        """Test that entries are read back from disk after the memory tier is dropped"""
+        cache = TwoTierCache(name="test", directory=str(tmp_path))
+        cache.set("pokemon_pikachu", {"name": "pikachu"})
+        cache.clear_memory()
+
+        assert cache.get("pokemon_pikachu") == {"name": "pikachu"}
+        assert cache.stats()["disk_hits"] == 1
+        assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+    def test_overwrites_keep_the_disk_size(self, tmp_path):
+        """Test that rewriting a key doesn't count its bytes twice"""
+        cache = TwoTierCache(name="test", directory=str(tmp_path))
+        for _ in range(6):
+            cache.set("pokemon_pikachu", {"name": "pikachu"})
+
+        # Timestamps differ in length, so compare with the file actually kept
+        size = os.path.getsize(tmp_path / "pokemon_pikachu.json")
+        assert cache.stats()["disk_bytes"] == size
+
+        cache.delete("pokemon_pikachu")
+        assert cache.stats()["disk_bytes"] == 0
+
+    def test_disk_budget_eviction(self, tmp_path):
+        """Test that the disk tier is trimmed once it exceeds its size budget"""
+        cache = TwoTierCache(name="test", directory=str(tmp_path), max_disk_bytes=200)
+        for i in range(10):
+            cache.set(f"key_{i}", {"payload": "x" * 40})
+
+        total = sum(os.path.getsize(tmp_path / p) for p in os.listdir(tmp_path))
+        assert total <= 200
+        assert cache.stats()["disk_evictions"] > 0
+
+    def test_ttl_states(self):
+        """Test fresh, stale and expired states"""
+        cache = TwoTierCache(name="test", directory=None, ttl=10, stale_ttl=10)
+        cache.set("a", 1)
+        assert cache.lookup("a") == (1, FRESH)
+
+        now = time.time()
+        with patch("app.application.tools.utils.cache.time.time") as mock_time:
+            mock_time.return_value = now + 15
+            assert cache.lookup("a") == (1, STALE)
+            mock_time.return_value = now + 25
+            assert cache.lookup("a") == (None, MISS)
+
+    def test_get_or_fetch_stale_while_revalidate(self):
+        """Test that stale values are served while a background refresh runs"""
+        cache = TwoTierCache(name="test", directory=None, ttl=10, stale_ttl=100)
+        cache.set("a", "old")
+        fetch = MagicMock(return_value="new")
+
+        now = time.time()
+        with patch("app.application.tools.utils.cache.time.time") as mock_time:
+            mock_time.return_value = now + 20
+            assert cache.get_or_fetch("a", fetch) == "old"
+
+        # Wait for the background refresh
+        for _ in range(50):
+            if cache.lookup("a")[0] == "new":
+                break
+            time.sleep(0.01)
+        assert cache.lookup("a") == ("new", FRESH)
+        fetch.assert_called_once()
+
+    def test_negative_tier_expires_and_is_bounded(self):
+        """Test that missing keys expire, are evicted past the bound and cleared by a write"""
+        cache = TwoTierCache(
+            name="test", directory=None, negative_ttl=0.05, max_negative_entries=2
+        )
+        cache.set_missing("pokemon_a")
+        assert cache.is_missing("pokemon_a")
+
+        time.sleep(0.06)
+        assert not cache.is_missing("pokemon_a")
+
+        for key in ("pokemon_b", "pokemon_c", "pokemon_d"):
+            cache.set_missing(key)
+        assert not cache.is_missing("pokemon_b")
+
+        cache.set("pokemon_d", {"name": "d"})
+        assert not cache.is_missing("pokemon_d")
+        assert cache.negative_stats()["evictions"] == 2
+        # The positive tier's counters are kept apart
+        assert cache.stats()["misses"] == 0
+
+    def test_negative_circuit_opens_after_repeated_misses(self):
+        """Test that a key missed repeatedly is held for the circuit period"""
+        cache = TwoTierCache(
+            name="test",
+            directory=None,
+            negative_ttl=0.01,
+            circuit_misses=2,
+            circuit_ttl=60,
+        )
+        cache.set_missing("pokemon_garbage")
+        time.sleep(0.02)
+        assert not cache.is_missing("pokemon_garbage")
+
+        cache.set_missing("pokemon_garbage")
+        time.sleep(0.02)
+        assert cache.is_missing("pokemon_garbage")
+        assert cache.negative_stats()["open_circuits"] == 1
+        assert cache.negative_stats()["circuit_opens"] == 1
+
+    def test_negative_tier_disabled_by_default(self):
+        """Test that caches without a negative TTL don't remember missing keys"""
+        cache = TwoTierCache(name="test", directory=None)
+        cache.set_missing("answer")
+
+        assert not cache.is_missing("answer")
+
+    def test_get_or_fetch_does_not_cache_none(self):
+        """Test that missing resources are not stored"""
+        cache = TwoTierCache(name="test", directory=None)
+        assert cache.get_or_fetch("missing", lambda: None) is None
+        assert cache.stats()["writes"] == 0
+
+
+class TestFileCache:
+    """Tests for the FileCache in cache.py"""
+
+    def test_put_and_get(self, tmp_path):
+        """Test that files are written under their key and found again"""
+        cache = FileCache(str(tmp_path), max_disk_bytes=1024, suffix=".gif")
+        assert cache.get("abc") is None
+
+        def write(path):
+            with open(path, "wb") as f:
+                f.write(b"GIF89a")
+
+        path = cache.put("abc", write)
+        assert path == cache.get("abc")
+        with open(path, "rb") as f:
+            assert f.read() == b"GIF89a"
+
+    def test_failed_write_leaves_nothing(self, tmp_path):
+        """Test that a failing writer leaves neither the file nor a temp file"""
+        cache = FileCache(str(tmp_path), max_disk_bytes=1024, suffix=".gif")
+
+        def write(path):
+            raise RuntimeError("render failed")
+
+        with pytest.raises(RuntimeError):
+            cache.put("abc", write)
+        assert os.listdir(tmp_path) == []
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently read files are evicted first"""
+        cache = FileCache(str(tmp_path), max_disk_bytes=250, suffix=".gif")
+
+        def write(path):
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+
+        cache.put("old", write)
+        cache.put("recent", write)
+        os.utime(cache.path("old"), (time.time() - 60, time.time() - 60))
+        os.utime(cache.path("recent"), (time.time() - 30, time.time() - 30))
+        # Reading "old" makes "recent" the least recently used file
+        cache.get("old")
+        cache.put("new", write)
+
+        assert cache.get("old") is not None
+        assert cache.get("recent") is None
+        assert cache.get("new") is not None
+
+    def test_battle_animation_key(self):
+        """Test that battle keys depend on the matchup and the result"""
+        key = battle_animation_key("Pikachu", "squirtle", "pikachu", "Faster", False)
+        assert key == battle_animation_key(
+            "pikachu", "squirtle", "Pikachu", "Faster", False
+        )
+        assert key != battle_animation_key(
+            "squirtle", "pikachu", "pikachu", "Faster", False
+        )
+        assert key != battle_animation_key(
+            "pikachu", "squirtle", "pikachu", "Faster", True
+        )
@@ -0,0 +1,57 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils.counters_index import (
+    CountersIndex,
+    build_counters,
+    write_counters,
+)
+from app.application.tools.utils.matchup_engine import encode_pokedex
+from app.application.tools.utils.pokemon_utils import (
+    analyze_pokemon_battle,
+    parse_pokemon_data,
+)
+
+
+@pytest.fixture
+def counters_index(tmp_path, pokedex_store):
+    """Fixture for a counters index built from the Pokédex fixture"""
+    path = str(tmp_path / "counters.npz")
+    write_counters(path, build_counters(encode_pokedex(pokedex_store), top_k=3))
+    return CountersIndex(path, store=pokedex_store)
+
+
+class TestCountersIndex:
+    """Tests for the counters_index.py module"""
+
+    def test_counters_beat_the_pokemon(self, counters_index, pokedex_store):
+        """Test that every counter wins per analyze_pokemon_battle, best first"""
+        bulbasaur = parse_pokemon_data(pokedex_store.get_pokemon("bulbasaur"))
+        result = counters_index.counters("bulbasaur")
+
+        assert len(result) == 3
+        margins = [counter["margin"] for counter in result]
+        assert margins == sorted(margins, reverse=True)
+        for counter in result:
+            attacker = parse_pokemon_data(pokedex_store.get_pokemon(counter["name"]))
+            winner, _ = analyze_pokemon_battle(attacker, bulbasaur)
+            assert winner == counter["name"]
+
+    def test_unbeaten_pokemon(self, counters_index):
+        """Test that a Pokémon nothing beats has an empty list, not None"""
+        assert counters_index.counters("garchomp") == []
+
+    def test_lookup_by_alias_and_limit(self, counters_index):
+        """Test alias/id lookups and the limit"""
+        assert counters_index.resolve("Glurak") == "charizard"
+        assert counters_index.counters("6") == counters_index.counters("charizard")
+        assert len(counters_index.counters("charizard", limit=1)) <= 1
+        assert counters_index.counters("missingno") is None
+
+    def test_missing_index_is_empty(self, tmp_path):
+        """Test that an index without a file answers nothing"""
+        index = CountersIndex(str(tmp_path / "missing.npz"))
+        assert len(index) == 0
@@ -0,0 +1,226 @@
+import pytest
+import asyncio
+import sys
+import os
+import time
+from typing import Any, List, Optional
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.domain.utils import llm_gateway
+from app.domain.utils.llm_gateway import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    GatewayChatModel,
+    LatencyTracker,
+    ModelRoute,
+)
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model answering its own name after a delay, or failing"""
+
+    answer: str
+    delay: float = 0.0
+    fail: bool = False
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _result(self) -> ChatResult:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f"{self.answer} is down")
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=self.answer))]
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self._result()
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.delay)
+        return self._result()
+
+
+@pytest.fixture(autouse=True)
+def clear_health():
+    """Start every test with fresh breakers and latency statistics"""
+    with patch.dict(llm_gateway._health, clear=True):
+        yield
+
+
+def gateway(primary, secondary, hedge_percentile=None, circuit_breaker=None):
+    return GatewayChatModel(
+        routes=[
+            ModelRoute("fake/primary", lambda: primary, circuit_breaker),
+            ModelRoute("fake/secondary", lambda: secondary, circuit_breaker),
+        ],
+        hedge_percentile=hedge_percentile,
+    )
+
+
+class TestCircuitBreaker:
+    """Tests for the error-rate circuit breaker"""
+
+    def test_opens_on_error_rate_and_recovers(self):
+        """Test that the breaker opens, lets one trial call through and closes"""
+        breaker = CircuitBreaker(
+            failure_rate=0.5, window=4, min_calls=4, recovery_timeout=0.05
+        )
+        for success in (True, False, True):
+            breaker.record(success)
+        assert breaker.state == CLOSED
+
+        breaker.record(False)
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        # Only one trial call at a time
+        assert not breaker.allow()
+
+        breaker.record(True)
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_failed_trial_opens_again(self):
+        """Test that a failed trial call reopens the breaker"""
+        breaker = CircuitBreaker(
+            failure_rate=0.5, window=2, min_calls=2, recovery_timeout=0.05
+        )
+        breaker.record(False)
+        breaker.record(False)
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record(False)
+        assert breaker.state == OPEN
+
+
+class TestLatencyTracker:
+    """Tests for the latency statistics used to hedge"""
+
+    def test_percentile_needs_min_samples(self):
+        """Test that no percentile is given until enough calls were made"""
+        tracker = LatencyTracker(window=10, min_samples=3)
+        tracker.record(1.0)
+        tracker.record(2.0)
+        assert tracker.percentile(50) is None
+
+        tracker.record(3.0)
+        assert tracker.percentile(50) == 2.0
+
+
+class TestGatewayChatModel:
+    """Tests for the LLM gateway"""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_primary_fails(self):
+        """Test that a failed call is answered by the secondary model"""
+        primary = FakeChatModel(answer="primary", fail=True)
+        secondary = FakeChatModel(answer="secondary")
+        model = gateway(primary, secondary)
+
+        result = await model.ainvoke([HumanMessage(content="hi")])
+
+        assert result.content == "secondary"
+        assert primary.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_primary(self):
+        """Test that a model with an open circuit is not called"""
+        primary = FakeChatModel(answer="primary", fail=True)
+        secondary = FakeChatModel(answer="secondary")
+        model = gateway(
+            primary,
+            secondary,
+            circuit_breaker={"failure_rate": 0.5, "window": 2, "min_calls": 2},
+        )
+
+        for _ in range(4):
+            assert (await model.ainvoke("hi")).content == "secondary"
+
+        assert model.routes[0].breaker.state == OPEN
+        assert primary.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_every_circuit_open(self):
+        """Test that the gateway fails fast when no model is available"""
+        model = gateway(
+            FakeChatModel(answer="primary", fail=True),
+            FakeChatModel(answer="secondary", fail=True),
+            circuit_breaker={"failure_rate": 0.5, "window": 1, "min_calls": 1},
+        )
+
+        with pytest.raises(RuntimeError):
+            await model.ainvoke("hi")
+        with pytest.raises(CircuitOpenError):
+            await model.ainvoke("hi")
+
+    @pytest.mark.asyncio
+    async def test_hedges_slow_primary(self):
+        """Test that a call slower than the latency percentile is hedged"""
+        primary = FakeChatModel(answer="primary", delay=1.0)
+        secondary = FakeChatModel(answer="secondary")
+        model = gateway(primary, secondary, hedge_percentile=95)
+        for _ in range(llm_gateway.LLM_HEDGE_MIN_SAMPLES):
+            model.routes[0].latencies.record(0.01)
+
+        result = await asyncio.wait_for(model.ainvoke("hi"), timeout=0.5)
+
+        assert result.content == "secondary"
+        # The abandoned primary call doesn't count as a failure
+        assert model.routes[0].breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_history(self):
+        """Test that calls aren't hedged before the primary has statistics"""
+        primary = FakeChatModel(answer="primary", delay=0.05)
+        secondary = FakeChatModel(answer="secondary")
+        model = gateway(primary, secondary, hedge_percentile=95)
+
+        assert (await model.ainvoke("hi")).content == "primary"
+        assert secondary.calls == 0
+
+    def test_secondary_is_built_lazily(self):
+        """Test that the secondary model is only built when a call needs it"""
+        built = []
+
+        def build():
+            built.append("secondary")
+            return FakeChatModel(answer="secondary")
+
+        model = GatewayChatModel(
+            routes=[
+                ModelRoute("fake/primary", lambda: FakeChatModel(answer="primary")),
+                ModelRoute("fake/secondary", build),
+            ]
+        )
+
+        assert model.invoke("hi").content == "primary"
+        assert built == []
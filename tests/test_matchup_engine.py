@@ -0,0 +1,95 @@
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils.matchup_engine import (
+    analyze_matchups,
+    encode_pokedex,
+    encode_roster,
+)
+from app.application.tools.utils.pokemon_utils import (
+    analyze_pokemon_battle,
+    parse_pokemon_data,
+)
+
+
+class TestMatchupEngine:
+    """Tests for the matchup_engine.py module"""
+
+    def test_matches_scalar_analysis(self, pokedex_store):
+        """Test that every pair has the winner of analyze_pokemon_battle"""
+        roster = encode_pokedex(pokedex_store)
+        pokemons = [
+            parse_pokemon_data(pokedex_store.get_pokemon(name)) for name in roster.names
+        ]
+        matrices = analyze_matchups(roster, roster)
+
+        assert matrices["attacker_wins"].shape == (len(pokemons), len(pokemons))
+        for i, attacker in enumerate(pokemons):
+            for j, defender in enumerate(pokemons):
+                # Mirror matches are ties the scalar function gives to pokemon2
+                if i == j:
+                    assert not matrices["attacker_wins"][i, j]
+                    continue
+                winner, _ = analyze_pokemon_battle(attacker, defender)
+                assert matrices["attacker_wins"][i, j] == (
+                    winner == attacker["name"]
+                ), f"{attacker['name']} vs {defender['name']}"
+
+    def test_tie_breakers(self):
+        """Test that equal turns fall back to speed, then HP, then the defender"""
+
+        def pokemon(name, hp=100, speed=100, defense=100):
+            return {
+                "name": name,
+                "types": ["normal"],
+                "base_stats": {
+                    "hp": hp,
+                    "attack": 100,
+                    "defense": defense,
+                    "special_attack": 100,
+                    "special_defense": defense,
+                    "speed": speed,
+                },
+            }
+
+        # Turns depend on HP, so the HP tie-breaker needs equal turns and speed:
+        # "bulky" has twice the HP and half the defenses of "twin"
+        roster = encode_roster(
+            [
+                pokemon("fast", speed=120),
+                pokemon("slow", speed=80),
+                pokemon("twin"),
+                pokemon("bulky", hp=200, defense=50),
+            ]
+        )
+        matrices = analyze_matchups(roster, roster)
+        wins = matrices["attacker_wins"]
+        assert wins[0, 1] and not wins[1, 0]
+        assert not wins[2, 2]
+        assert matrices["attacker_turns"][3, 2] == matrices["defender_turns"][3, 2]
+        assert wins[3, 2] and not wins[2, 3]
+
+    def test_untyped_pokemon_are_neutral(self):
+        """Test that Pokémon without a known type take and deal neutral damage"""
+        stats = {
+            "hp": 50,
+            "attack": 50,
+            "defense": 50,
+            "special_attack": 50,
+            "special_defense": 50,
+            "speed": 50,
+        }
+        roster = encode_roster(
+            [
+                {"name": "ghost", "types": ["ghost"], "base_stats": stats},
+                {"name": "unknown", "types": ["???"], "base_stats": stats},
+            ]
+        )
+        matrices = analyze_matchups(roster, roster)
+        assert np.isclose(
+            matrices["attacker_turns"][0, 1], matrices["defender_turns"][0, 1]
+        )
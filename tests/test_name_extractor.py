@@ -0,0 +1,53 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils.name_extractor import NameExtractor, match_key
+
+
+@pytest.fixture
+def extractor():
+    """Fixture for an extractor over a few names and aliases"""
+    return NameExtractor(
+        {
+            "mew": "mew",
+            "mewtwo": "mewtwo",
+            "mr-mime": "mr-mime",
+            "mime-jr": "mime-jr",
+            "ho-oh": "ho-oh",
+            "farfetchd": "farfetchd",
+            "Salamèche": "charmander",
+            "4": "charmander",
+        }
+    )
+
+
+class TestNameExtractor:
+    """Tests for the Aho–Corasick name extractor"""
+
+    def test_match_key(self):
+        """Test text normalization for matching"""
+        assert match_key("Farfetch’d vs. Type: Null") == "farfetchd vs type null"
+        assert match_key("  Ho-Oh!! ") == "ho oh"
+
+    def test_extract_in_order_without_duplicates(self, extractor):
+        """Test that names, aliases and punctuated names are found once, in order"""
+        assert extractor.extract(
+            "Would Ho-Oh beat Mewtwo? And mew, or Farfetch'd... or ho oh again"
+        ) == ["ho-oh", "mewtwo", "mew", "farfetchd"]
+
+    def test_aliases_map_to_canonical_names(self, extractor):
+        """Test that localized aliases resolve and numeric keys are ignored"""
+        assert extractor.extract("Salamèche contre 4 Pokémon") == ["charmander"]
+        assert len(extractor) == 7
+
+    def test_word_boundaries(self, extractor):
+        """Test that names inside other words are not matched"""
+        assert extractor.extract("Mewtwos and homewrecker") == []
+
+    def test_leftmost_longest(self, extractor):
+        """Test that overlapping matches keep the leftmost, longest name"""
+        assert extractor.extract("mr mime jr") == ["mr-mime"]
+        assert extractor.extract("Mime Jr. and Mr. Mime") == ["mime-jr", "mr-mime"]
@@ -0,0 +1,116 @@
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils import name_resolver
+from app.application.tools.utils.name_resolver import (
+    NameResolver,
+    canonical_key,
+    edit_distance,
+)
+
+ALIASES = {
+    "pikachu": "pikachu",
+    "pichu": "pichu",
+    "charizard": "charizard",
+    "charizard-mega-x": "charizard-mega-x",
+    "charizard-mega-y": "charizard-mega-y",
+    "jigglypuff": "jigglypuff",
+    "wigglytuff": "wigglytuff",
+    "mimikyu": "mimikyu-disguised",
+    "Mr. Mime": "mr-mime",
+    "25": "pikachu",
+}
+
+
+class TestCanonicalKey:
+    """Tests for the name canonicalizer"""
+
+    def test_punctuation_and_accents(self):
+        """Test that names are spelled the PokéAPI way"""
+        assert canonical_key("  Mr. Mime ") == "mr-mime"
+        assert canonical_key("Farfetch’d") == "farfetchd"
+        assert canonical_key("Type: Null") == "type-null"
+        assert canonical_key("Flabébé") == "flabebe"
+        assert canonical_key("Nidoran♀") == "nidoran-f"
+        assert canonical_key("ho_oh") == "ho-oh"
+
+    def test_forms(self):
+        """Test that leading form words move after the species"""
+        assert canonical_key("Alolan Ninetales") == "ninetales-alola"
+        assert canonical_key("ninetales alolan") == "ninetales-alola"
+        assert canonical_key("Galarian Mr. Mime") == "mr-mime-galar"
+        assert canonical_key("Mega Charizard X") == "charizard-mega-x"
+        assert canonical_key("Gigantamax Pikachu") == "pikachu-gmax"
+        # PokéAPI names are left as they are
+        assert canonical_key("darmanitan-galar-standard") == "darmanitan-galar-standard"
+
+    def test_edit_distance(self):
+        """Test that a transposition counts as a single edit"""
+        assert edit_distance("bulbasuar", "bulbasaur") == 1
+        assert edit_distance("pickachu", "pikachu") == 1
+        assert edit_distance("", "mew") == 3
+
+
+class TestNameResolver:
+    """Tests for the fuzzy name resolver"""
+
+    def test_exact_names_and_aliases(self):
+        """Test that names, aliases and ids resolve to canonical names"""
+        resolver = NameResolver(ALIASES)
+
+        assert resolver.resolve("Mimikyu") == ("mimikyu-disguised", True, [])
+        assert resolver.resolve("mr mime").name == "mr-mime"
+        assert resolver.resolve("25").name == "pikachu"
+        assert resolver.resolve("charizard mega x").name == "charizard-mega-x"
+
+    def test_corrects_misspellings_with_complete_index(self):
+        """Test that a close, unambiguous misspelling is corrected"""
+        resolver = NameResolver(ALIASES, complete=True)
+
+        resolution = resolver.resolve("Pickachu")
+
+        assert resolution.name == "pikachu"
+        assert not resolution.exact
+        assert resolution.suggestions == ["pikachu", "pichu"]
+        assert resolver.resolve("charzard").name == "charizard"
+
+    def test_ambiguous_names_are_not_corrected(self):
+        """Test that equally close names are only suggested"""
+        resolver = NameResolver(ALIASES, complete=True)
+
+        resolution = resolver.resolve("charizard-mega-z")
+
+        assert resolution.name == "charizard-mega-z"
+        assert resolution.suggestions[:2] == ["charizard-mega-x", "charizard-mega-y"]
+
+    def test_incomplete_index_only_suggests(self):
+        """Test that without a snapshot unknown names are kept as spelled"""
+        resolver = NameResolver({"jigglypuff": "jigglypuff"})
+
+        resolution = resolver.resolve("Wigglytuff")
+
+        assert resolution.name == "wigglytuff"
+        assert resolution.suggestions == ["jigglypuff"]
+
+    def test_unknown_names_and_ids(self):
+        """Test that far names get no suggestions and ids are never fuzzy matched"""
+        resolver = NameResolver(ALIASES, complete=True)
+
+        assert resolver.resolve("xyzzy") == ("xyzzy", False, [])
+        assert resolver.resolve("26") == ("26", False, [])
+        assert resolver.suggest("wiglytuff") == ["wigglytuff", "jigglypuff"]
+
+    def test_partial_snapshot_is_not_complete(self, pokedex_store):
+        """Test that the resolver only corrects names over a complete snapshot"""
+        with patch.object(
+            name_resolver, "get_pokedex", return_value=pokedex_store
+        ), patch.object(name_resolver, "_resolver", None):
+            resolver = name_resolver.get_name_resolver()
+            assert not resolver.complete
+
+            pokedex_store.complete = True
+            name_resolver._resolver = None
+            assert name_resolver.get_name_resolver().complete
@@ -0,0 +1,114 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils import pokedex, pokemon_utils
+from app.application.tools.utils.pokedex import (
+    PokedexStore,
+    download_pokedex,
+    write_pokedex,
+)
+
+PIKACHU_RAW = {
+    "id": 25,
+    "name": "pikachu",
+    "species": {"name": "pikachu"},
+    "types": [{"slot": 1, "type": {"name": "electric"}}],
+    "stats": [{"base_stat": 90, "stat": {"name": "speed"}}],
+    "sprites": {"front_default": "25.png"},
+    "forms": [{"name": "pikachu"}],
+}
+
+RESPONSES = {
+    "pokemon?limit=100000": {"results": [{"name": "pikachu"}, {"name": "mew"}]},
+    "pokemon/pikachu": PIKACHU_RAW,
+    "pokemon-form/pikachu": {"name": "pikachu", "sprites": {}},
+    "pokemon-species/pikachu": {
+        "id": 25,
+        "name": "pikachu",
+        "names": [{"name": "Pikachu"}],
+        "varieties": [{"is_default": True, "pokemon": {"name": "pikachu"}}],
+    },
+    "type?limit=100": {"results": [{"name": "electric"}]},
+    "type/electric": {"name": "electric", "damage_relations": {}},
+}
+
+
+class TestPokedex:
+    """Tests for the pokedex.py module"""
+
+    def test_lookup_by_name_id_and_alias(self, pokedex_store):
+        """Test lookups by canonical name, national dex id and localized alias"""
+        assert pokedex_store.get_pokemon("pikachu")["id"] == 25
+        assert pokedex_store.get_pokemon("25")["name"] == "pikachu"
+        assert pokedex_store.get_pokemon(25)["name"] == "pikachu"
+        assert pokedex_store.get_pokemon("Glurak")["name"] == "charizard"
+        assert pokedex_store.get_pokemon("  PIKACHU ")["name"] == "pikachu"
+
+    def test_unknown_name(self, pokedex_store):
+        """Test that unknown names are not answered by the snapshot"""
+        assert pokedex_store.get_pokemon("missingno") is None
+        assert pokedex_store.get_form("missingno") is None
+
+    def test_form_record(self, pokedex_store):
+        """Test that the default form sprites are stored"""
+        form = pokedex_store.get_form("gengar")
+        assert form["name"] == "gengar"
+        assert form["sprites"]["front_default"].endswith("/94.png")
+
+    def test_missing_snapshot_is_empty(self, tmp_path):
+        """Test that a store without a snapshot file answers nothing"""
+        store = PokedexStore(str(tmp_path / "missing.sqlite"))
+        assert len(store) == 0
+        assert store.get_pokemon("pikachu") is None
+
+    def test_fetch_pokemon_data_uses_snapshot(self, pokedex_store):
+        """Test that fetch_pokemon_data answers from the snapshot without network"""
+        with patch.object(
+            pokemon_utils, "get_pokedex", return_value=pokedex_store
+        ), patch.object(pokemon_utils, "fetch_resource") as mock_fetch:
+            result = pokemon_utils.fetch_pokemon_data("Garchomp")
+
+        assert result["name"] == "garchomp"
+        assert result["types"] == ["dragon", "ground"]
+        assert result["base_stats"]["attack"] == "130"
+        mock_fetch.assert_not_called()
+
+    def test_reconnects_after_fork(self, pokedex_store):
+        """Test that a forked process opens its own SQLite connection"""
+        parent_conn = pokedex_store._connection()
+        # Pretend the store was inherited from another process
+        pokedex_store._pid = -1
+        assert pokedex_store.get_pokemon("pikachu")["id"] == 25
+        assert pokedex_store._connection() is not parent_conn
+
+    def test_completeness_is_recorded(self, tmp_path):
+        """Test that the store reads whether the snapshot has every Pokémon"""
+        entry = {"pokemon": pokedex.trim_pokemon_record(PIKACHU_RAW)}
+        complete_path = str(tmp_path / "complete.sqlite")
+        partial_path = str(tmp_path / "partial.sqlite")
+        write_pokedex(complete_path, [entry], complete=True)
+        write_pokedex(partial_path, [entry])
+
+        assert PokedexStore(complete_path).complete
+        assert not PokedexStore(partial_path).complete
+
+    @pytest.mark.asyncio
+    async def test_download_reports_failed_pokemon(self):
+        """Test that a Pokémon failing to download makes the snapshot incomplete"""
+
+        async def get_json(path):
+            if path == "pokemon/mew":
+                raise RuntimeError("connection reset")
+            return RESPONSES[path]
+
+        with patch.object(pokedex, "_get_json", side_effect=get_json):
+            dataset = await download_pokedex()
+
+        assert [e["pokemon"]["name"] for e in dataset["entries"]] == ["pikachu"]
+        assert "Pikachu" in dataset["entries"][0]["aliases"]
+        assert dataset["missing"] == ["mew"]
+        assert not dataset["complete"]
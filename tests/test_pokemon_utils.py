@@ -1,21 +1,44 @@
 import pytest
+import asyncio
 import sys
 import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.application.tools.utils.cache import TwoTierCache
+from app.application.tools.utils.name_resolver import NameResolver
+from app.application.tools.utils.pokeapi_client import PokeAPIClient
+from app.application.tools.utils.pokedex import PokedexStore
 from app.application.tools.utils.pokemon_utils import (
+    afetch_pokemon_data,
     fetch_pokemon_data,
     calculate_type_effectiveness,
     analyze_pokemon_battle,
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_data_layer():
+    """Fixture isolating tests from the shared cache and any local snapshot"""
+    cache = TwoTierCache(name="test", directory=None)
+    with patch(
+        "app.application.tools.utils.pokeapi_client.get_pokeapi_cache",
+        return_value=cache,
+    ), patch(
+        "app.application.tools.utils.pokemon_utils.get_pokedex",
+        return_value=PokedexStore(None),
+    ), patch(
+        "app.application.tools.utils.pokemon_utils.get_name_resolver",
+        return_value=NameResolver({"pikachu": "pikachu", "raichu": "raichu"}),
+    ):
+        yield cache
+
+
 class TestPokemonUtils:
     """Tests for the pokemon_utils.py module"""
 
-    @patch("app.application.tools.utils.pokemon_utils.requests.get")
+    @patch("app.application.tools.utils.pokeapi_client.PokeAPIClient.get_sync")
     def test_fetch_pokemon_data_success(self, mock_get):
         """Test successful Pokemon data fetch"""
         # Mock response
@@ -48,7 +71,7 @@ class TestPokemonUtils:
         assert result["base_stats"]["special_defense"] == "50"
         assert result["base_stats"]["speed"] == "90"
 
-    @patch("app.application.tools.utils.pokemon_utils.requests.get")
+    @patch("app.application.tools.utils.pokeapi_client.PokeAPIClient.get_sync")
     def test_fetch_pokemon_data_not_found(self, mock_get):
         """Test Pokemon data fetch when Pokemon not found"""
         # Mock response
@@ -63,6 +86,83 @@ class TestPokemonUtils:
         assert "error" in result
         assert "not found" in result["error"]
 
+    @pytest.mark.asyncio
+    @patch(
+        "app.application.tools.utils.pokeapi_client.PokeAPIClient.get",
+        new_callable=AsyncMock,
+    )
+    async def test_afetch_pokemon_data_not_found(self, mock_get):
+        """Test async Pokemon data fetch when Pokemon not found"""
+        # Mock response
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        mock_get.return_value = mock_response
+
+        # Call the function
+        result = await afetch_pokemon_data("nonexistentpokemon")
+
+        # Assertions
+        assert "error" in result
+        assert "not found" in result["error"]
+        mock_get.assert_awaited_once_with("pokemon/nonexistentpokemon")
+
+    @patch("app.application.tools.utils.pokeapi_client.PokeAPIClient.get_sync")
+    def test_fetch_pokemon_data_not_found_suggests_names(self, mock_get):
+        """Test that a misspelled name not in the index comes back with suggestions"""
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        mock_get.return_value = mock_response
+
+        result = fetch_pokemon_data("Pickachu")
+
+        # Without a snapshot the name is asked upstream as spelled
+        mock_get.assert_called_once_with("pokemon/pickachu")
+        assert "not found" in result["error"]
+        assert result["suggestions"][0] == "pikachu"
+
+    @patch("app.application.tools.utils.pokeapi_client.PokeAPIClient.get_sync")
+    def test_fetch_pokemon_data_remembers_unknown_names(
+        self, mock_get, isolated_data_layer
+    ):
+        """Test that a name the PokéAPI doesn't know isn't asked for again"""
+        isolated_data_layer.negative_ttl = 60
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        mock_get.return_value = mock_response
+
+        for _ in range(3):
+            result = fetch_pokemon_data("missingno")
+            assert "not found" in result["error"]
+
+        mock_get.assert_called_once_with("pokemon/missingno")
+        assert isolated_data_layer.negative_stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_afetch_pokemon_data_coalesces_concurrent_calls(self):
+        """Test that concurrent lookups of the same Pokemon share one upstream call"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "name": "pikachu",
+            "stats": [{"base_stat": v} for v in (35, 55, 40, 50, 50, 90)],
+            "types": [{"type": {"name": "electric"}}],
+        }
+
+        async def slow_get(path):
+            await asyncio.sleep(0.01)
+            return mock_response
+
+        with patch(
+            "app.application.tools.utils.pokeapi_client.PokeAPIClient.get",
+            side_effect=slow_get,
+        ) as mock_get:
+            results = await asyncio.gather(
+                *(afetch_pokemon_data("pikachu") for _ in range(20))
+            )
+
+        assert all(result["name"] == "pikachu" for result in results)
+        assert mock_get.call_count == 1
+
     def test_calculate_type_effectiveness(self):
         """Test type effectiveness calculation"""
         # Test normal effectiveness (1x)
@@ -114,3 +214,19 @@ class TestPokemonUtils:
         # Assertions - geodude should win due to type advantage
         assert winner == "geodude"
         assert "type advantage" in reasoning.lower()
+
+
+class TestPokeAPIClient:
+    """Tests for the shared PokéAPI client"""
+
+    def test_client_of_previous_loop_is_closed(self):
+        """Test that a new event loop gets a new client and the old one is closed"""
+        client = PokeAPIClient()
+
+        first = asyncio.run(client._get_async_client())
+        second = asyncio.run(client._get_async_client())
+
+        assert first is not second
+        assert first.is_closed
+        assert not second.is_closed
+        asyncio.run(client.aclose())
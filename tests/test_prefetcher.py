@@ -0,0 +1,57 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.services.prefetcher import Prefetcher
+from app.application.tools.utils.name_extractor import NameExtractor
+
+
+class TestPrefetcher:
+    """Tests for the speculative Pokémon prefetcher"""
+
+    @pytest.mark.asyncio
+    @patch(
+        "app.application.services.prefetcher.afetch_pokemon_data",
+        new_callable=AsyncMock,
+    )
+    async def test_prefetch_in_background(self, mock_afetch_pokemon_data):
+        """Test that named Pokémon are fetched without blocking the caller"""
+        fetched = asyncio.Event()
+
+        async def fetch(name):
+            await fetched.wait()
+            return {"name": name}
+
+        mock_afetch_pokemon_data.side_effect = fetch
+        prefetcher = Prefetcher(
+            extractor=NameExtractor({"pikachu": "pikachu", "eevee": "eevee"}),
+            max_names=1,
+        )
+
+        # Returns while the fetches are still pending
+        assert prefetcher.prefetch("Pikachu vs Eevee") == ["pikachu"]
+        fetched.set()
+        await asyncio.gather(*prefetcher._tasks)
+
+        mock_afetch_pokemon_data.assert_awaited_once_with("pikachu")
+        assert prefetcher.metrics() == {"questions": 1, "pokemon": 1, "errors": 0}
+
+    @pytest.mark.asyncio
+    @patch(
+        "app.application.services.prefetcher.afetch_pokemon_data",
+        new_callable=AsyncMock,
+        side_effect=RuntimeError("PokéAPI down"),
+    )
+    async def test_prefetch_errors_are_counted(self, mock_afetch_pokemon_data):
+        """Test that a failed prefetch is only counted"""
+        prefetcher = Prefetcher(extractor=NameExtractor({"mew": "mew"}))
+
+        prefetcher.prefetch("Tell me about Mew")
+        await asyncio.gather(*prefetcher._tasks)
+
+        assert prefetcher.metrics()["errors"] == 1
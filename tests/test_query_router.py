@@ -0,0 +1,92 @@
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.services.query_router import (
+    BATTLE,
+    COMPARISON,
+    GENERAL,
+    SINGLE_POKEMON,
+    VISUALIZATION,
+    QueryRouter,
+)
+
+
+@pytest.fixture
+def router():
+    """Fixture for a router with a small name index"""
+    return QueryRouter(
+        names=["pikachu", "charizard", "blastoise", "mr-mime", "ho-oh", "type-null"]
+    )
+
+
+class TestQueryRouter:
+    """Tests for the local supervisor query router"""
+
+    def test_extract_pokemon(self, router):
+        """Test that multi-word and punctuated names are found once, in order"""
+        assert router.extract_pokemon(
+            "Mr. Mime vs Type: Null vs Ho-Oh and mr mime again"
+        ) == ["mr-mime", "type-null", "ho-oh"]
+
+    def test_battle_question_is_direct(self, router):
+        """Test that the battle route's question skips the supervisor"""
+        decision = router.classify(
+            "Tell me who would win in a battle between Pikachu and Charizard? "
+            "Provide detailed analysis."
+        )
+
+        assert decision.pathway == BATTLE
+        assert decision.pokemon == ["pikachu", "charizard"]
+        assert decision.direct
+
+    @pytest.mark.parametrize(
+        "question,pathway,direct",
+        [
+            ("What are the base stats of Ho-Oh?", SINGLE_POKEMON, True),
+            ("Compare Pikachu, Charizard and Blastoise", COMPARISON, True),
+            ("Which is stronger between Pikachu and Blastoise?", COMPARISON, True),
+            ("Pikachu vs Charizard", BATTLE, True),
+            (
+                "Visualize a battle between Charizard and Blastoise",
+                VISUALIZATION,
+                False,
+            ),
+            ("How many generations of Pokémon exist?", GENERAL, False),
+            # Vague wording and missing Pokémon are left to the supervisor
+            ("Tell me about Pikachu", SINGLE_POKEMON, False),
+            ("Who would win against Pikachu?", BATTLE, False),
+            # Battle and comparison keywords alone are not enough
+            ("Best team to beat Charizard and Blastoise", BATTLE, False),
+            ("Can pikachu beat charizard in a race?", BATTLE, False),
+            ("Is Pikachu stronger than Blastoise?", COMPARISON, False),
+            (
+                "Which is better between Pikachu and Charizard or Blastoise?",
+                COMPARISON,
+                False,
+            ),
+        ],
+    )
+    def test_classify(self, router, question, pathway, direct):
+        """Test pathway classification and the confidence threshold"""
+        decision = router.classify(question)
+
+        assert decision.pathway == pathway
+        assert decision.direct == direct
+
+    def test_metrics(self, router):
+        """Test routing counts and hit rate"""
+        router.record(router.classify("Pikachu vs Charizard"), direct=True)
+        router.record(router.classify("Hello"), direct=False)
+        router.record_dispatch_error()
+
+        metrics = router.metrics()
+
+        assert metrics["queries"] == 2
+        assert metrics["direct"] == 1
+        assert metrics["hit_rate"] == 0.5
+        assert metrics["decisions"] == {BATTLE: 1, GENERAL: 1}
+        assert metrics["direct_by_pathway"] == {BATTLE: 1}
+        assert metrics["dispatch_errors"] == 1
@@ -0,0 +1,313 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.services.render_service import (
+    DONE,
+    FAILED,
+    QUEUED,
+    RenderBroker,
+    RenderQueueFullError,
+    RenderService,
+    connect_render_broker,
+    start_render_broker,
+    stop_render_broker,
+)
+
+PIKACHU = {
+    "name": "pikachu",
+    "types": ["electric"],
+    "base_stats": {
+        "hp": 35,
+        "attack": 55,
+        "defense": 40,
+        "special_attack": 50,
+        "special_defense": 50,
+        "speed": 90,
+    },
+}
+
+SQUIRTLE = {
+    "name": "squirtle",
+    "types": ["water"],
+    "base_stats": {
+        "hp": 44,
+        "attack": 48,
+        "defense": 65,
+        "special_attack": 50,
+        "special_defense": 64,
+        "speed": 43,
+    },
+}
+
+
+@pytest.fixture
+def render_service():
+    """RenderService on an in-process broker rendering on threads"""
+    service = RenderService(
+        broker=RenderBroker(
+            max_workers=1, max_queue=2, timeout=1, executor=ThreadPoolExecutor(1)
+        )
+    )
+    with patch(
+        "app.application.services.render_service.get_battle_animation_cache"
+    ) as mock_cache:
+        mock_cache.return_value.get.return_value = None
+        yield service
+    service.shutdown()
+
+
+async def finished(service, job_id):
+    """Wait for the broker to finish a job"""
+    await asyncio.gather(*service._tasks)
+    for _ in range(100):
+        job = service.get_job(job_id)
+        if job["status"] in (DONE, FAILED):
+            return job
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"Render job {job_id} did not finish")
+
+
+class TestRenderService:
+    """Tests for the RenderService"""
+
+    @pytest.mark.asyncio
+    async def test_render_job(self, render_service):
+        """Test that jobs are rendered with the deterministic battle result"""
+
+        def render(p1, p2, result, use_shiny, timeout, output_format):
+            return f"/tmp/{result['winner']}.{output_format}"
+
+        with patch(
+            "app.application.services.render_service.afetch_pokemon_data",
+            AsyncMock(side_effect=[PIKACHU, SQUIRTLE]),
+        ), patch("app.application.services.render_service.render_battle_job", render):
+            job_id = render_service.submit("pikachu", "squirtle")
+            assert render_service.get_job(job_id)["status"] == QUEUED
+            await finished(render_service, job_id)
+
+        assert render_service.get_job(job_id) == {
+            "status": DONE,
+            "path": "/tmp/pikachu.gif",
+            "error": None,
+            "media_type": "image/gif",
+        }
+
+    @pytest.mark.asyncio
+    async def test_queue_full(self, render_service):
+        """Test that submissions beyond max_queue are rejected"""
+        with patch(
+            "app.application.services.render_service.afetch_pokemon_data",
+            AsyncMock(return_value={"error": "Pokémon 'missingno' not found."}),
+        ):
+            render_service.submit("missingno", "missingno")
+            render_service.submit("missingno", "missingno")
+            with pytest.raises(RenderQueueFullError):
+                render_service.submit("missingno", "missingno")
+
+            await asyncio.gather(*render_service._tasks)
+            # Finished jobs free their queue slot
+            render_service.submit("missingno", "missingno")
+            await asyncio.gather(*render_service._tasks)
+
+    @pytest.mark.asyncio
+    async def test_unknown_pokemon(self, render_service):
+        """Test that jobs for unknown Pokémon fail with the lookup error"""
+        with patch(
+            "app.application.services.render_service.afetch_pokemon_data",
+            AsyncMock(
+                side_effect=[PIKACHU, {"error": "Pokémon 'missingno' not found."}]
+            ),
+        ):
+            job_id = render_service.submit("pikachu", "missingno")
+            await asyncio.gather(*render_service._tasks)
+
+        job = render_service.get_job(job_id)
+        assert job["status"] == FAILED
+        assert "missingno" in job["error"]
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, render_service):
+        """Test that jobs exceeding the timeout fail"""
+        render_service._broker.timeout = 0.1
+        render_service._broker.TIMEOUT_GRACE = 0
+
+        def render(*args):
+            time.sleep(0.5)
+            return "/tmp/late.gif"
+
+        with patch(
+            "app.application.services.render_service.afetch_pokemon_data",
+            AsyncMock(side_effect=[PIKACHU, SQUIRTLE]),
+        ), patch("app.application.services.render_service.render_battle_job", render):
+            job_id = render_service.submit("pikachu", "squirtle")
+            job = await finished(render_service, job_id)
+
+        assert job["status"] == FAILED
+        assert "timed out" in job["error"]
+
+    @pytest.mark.asyncio
+    async def test_cached_render(self, render_service):
+        """Test that battles rendered before skip the workers"""
+        with patch(
+            "app.application.services.render_service.afetch_pokemon_data",
+            AsyncMock(side_effect=[PIKACHU, SQUIRTLE]),
+        ), patch(
+            "app.application.services.render_service.get_battle_animation_cache"
+        ) as mock_cache, patch(
+            "app.application.services.render_service.render_battle_job"
+        ) as mock_render:
+            mock_cache.return_value.get.return_value = "/tmp/cached.gif"
+            job_id = render_service.submit("pikachu", "squirtle")
+            await asyncio.gather(*render_service._tasks)
+
+        assert render_service.get_job(job_id)["path"] == "/tmp/cached.gif"
+        assert render_service.get_job(job_id)["status"] == DONE
+        mock_render.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stream_frames(self, render_service):
+        """Test that frames are streamed as the worker draws them"""
+
+        def render(p1, p2, result, use_shiny, timeout, frames, stop):
+            for duration in (1000.0, 2000.0):
+                frames.put((b"jpeg", duration))
+            frames.put(None)
+
+        with patch(
+            "app.application.services.render_service.afetch_pokemon_data",
+            AsyncMock(side_effect=[PIKACHU, SQUIRTLE]),
+        ), patch("app.application.services.render_service.stream_battle_job", render):
+            events = [
+                event async for event in render_service.stream("pikachu", "squirtle")
+            ]
+
+        assert [event for event, _ in events] == ["frame", "frame", "done"]
+        assert events[1][1]["index"] == 1
+        assert events[1][1]["duration"] == 2000.0
+        assert events[0][1]["image"] == "data:image/jpeg;base64,anBlZw=="
+        assert events[2][1]["winner"] == "pikachu"
+        assert render_service._broker.active() == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_worker_error(self, render_service):
+        """Test that a failing worker ends the stream with its error"""
+
+        def render(p1, p2, result, use_shiny, timeout, frames, stop):
+            frames.put(None)
+            raise RuntimeError("sprite decoding failed")
+
+        with patch(
+            "app.application.services.render_service.afetch_pokemon_data",
+            AsyncMock(side_effect=[PIKACHU, SQUIRTLE]),
+        ), patch("app.application.services.render_service.stream_battle_job", render):
+            with pytest.raises(RuntimeError):
+                async for _ in render_service.stream("pikachu", "squirtle"):
+                    pass
+
+        assert render_service._broker.active() == 0
+
+    @pytest.mark.asyncio
+    async def test_closed_stream_stops_the_worker(self, render_service):
+        """Test that a client leaving stops the worker before its slot is freed"""
+        stopped = threading.Event()
+
+        def render(p1, p2, result, use_shiny, timeout, frames, stop):
+            try:
+                # More frames than the bounded queue holds
+                for _ in range(100):
+                    if stop.is_set():
+                        break
+                    frames.put((b"jpeg", 100.0), timeout=timeout)
+            finally:
+                stopped.set()
+
+        with patch(
+            "app.application.services.render_service.afetch_pokemon_data",
+            AsyncMock(side_effect=[PIKACHU, SQUIRTLE]),
+        ), patch("app.application.services.render_service.stream_battle_job", render):
+            stream = render_service.stream("pikachu", "squirtle")
+            event, _ = await stream.__anext__()
+            await stream.aclose()
+
+        assert event == "frame"
+        assert stopped.is_set()
+        assert render_service._broker.active() == 0
+
+    @pytest.mark.asyncio
+    async def test_unstarted_stream_frees_its_slot(self, render_service):
+        """Test that closing a stream that never started frees its queue slot once"""
+        stream = render_service.stream("pikachu", "squirtle")
+        assert render_service._broker.active() == 1
+
+        await stream.aclose()
+        await stream.aclose()
+
+        assert render_service._broker.active() == 0
+
+    def test_start_workers(self):
+        """Test that start runs one warm-up task per worker"""
+        executor = ThreadPoolExecutor(2)
+        service = RenderService(max_workers=2, executor=executor)
+        with patch.object(executor, "submit") as mock_submit:
+            service.start()
+        assert mock_submit.call_count == 2
+        service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_services_share_the_broker(self):
+        """Test that API workers on one broker see each other's jobs and queue"""
+        broker = RenderBroker(
+            max_workers=1, max_queue=2, timeout=1, executor=ThreadPoolExecutor(1)
+        )
+        first, second = RenderService(broker=broker), RenderService(broker=broker)
+
+        job_id = broker.reserve_job()
+        second.stream("pikachu", "squirtle")
+
+        assert first.get_job(job_id)["status"] == QUEUED
+        with pytest.raises(RenderQueueFullError):
+            first.submit("pikachu", "squirtle")
+
+        broker.finish(job_id, DONE, "/tmp/pikachu.gif")
+        assert second.get_job(job_id)["path"] == "/tmp/pikachu.gif"
+        broker.shutdown()
+
+    def test_abandoned_jobs_are_dropped(self):
+        """Test that jobs never handed over stop holding the queue"""
+        broker = RenderBroker(max_workers=1, max_queue=1, timeout=0)
+        broker.TIMEOUT_GRACE = 0
+
+        job_id = broker.reserve_job()
+        broker.reserve_job()
+
+        assert broker.get_job(job_id)["status"] == FAILED
+        assert "abandoned" in broker.get_job(job_id)["error"]
+
+    def test_socket_broker(self, tmp_path):
+        """Test that workers connected to the shared broker share its jobs"""
+        with patch(
+            "app.application.services.render_service.WARMUP_ENABLED", False
+        ), patch.dict(os.environ):
+            start_render_broker(str(tmp_path / "render.sock"))
+            try:
+                first, second = connect_render_broker(), connect_render_broker()
+
+                job_id = first.reserve_job("webp")
+                assert second.get_job(job_id)["media_type"] == "image/webp"
+
+                second.finish(job_id, FAILED, None, "sprite decoding failed")
+                assert first.get_job(job_id)["status"] == FAILED
+                assert first.active() == 0
+            finally:
+                stop_render_broker()
+
+        assert connect_render_broker() is None
@@ -1,38 +1,52 @@
-import pytest
-import sys
 import os
-from unittest.mock import patch, MagicMock, AsyncMock
+import sys
+from unittest.mock import MagicMock, patch
+
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.main import app
-from app.domain.entities.routers.agents.routers import (
-    ListAgentTemplatesResponse,
-    CreateAgentRequest,
-    CreateAgentResponse,
-    AgentModel,
-    InitEnvironmentResponse,
-    ListAgentsResponse,
+from app.domain.agents.pokemon_expert.pokemon_expert_models import (
+    PokemonExpertResponse,
 )
-from app.domain.agents.base_agent import LangpifyBaseAgent
-from app.domain.entities.agent_status import AgentStatus
+from app.domain.settings.routers import setup_routers
+from app.infrastructure.container.container import Container
+from app.infrastructure.entities.base_agent import LangpifyBaseAgent
+from app.infrastructure.entities.entities import LangpifyStatus as AgentStatus
+
+
+def create_test_app() -> FastAPI:
+    """
+    The app's routers and container, without the rate limiters of app.main
+    (their global limit of one request per second would answer 429)
+    """
+    app = FastAPI()
+    app.container = Container()
+    setup_routers(app)
+    return app
 
 
 class TestAgentRoutes:
     """Tests for the agent routes"""
 
-    client = TestClient(app)
+    client = TestClient(create_test_app())
 
     @patch(
         "app.application.services.agent_management_service.AgentManagementService.list_all_templates"
     )
-    async def test_list_templates(self, mock_list_all_templates):
+    def test_list_templates(self, mock_list_all_templates):
         """Test listing agent templates endpoint"""
         # Setup mock
         mock_list_all_templates.return_value = [
-            {"name": "pokemon_expert", "description": "Pokemon Expert Agent"},
-            {"name": "researcher", "description": "Researcher Agent"},
+            {
+                "aid_prefix": "pokemonExpertAgent",
+                "file_name": "pokemon_expert/pokemon_expert_manifest.yaml",
+            },
+            {
+                "aid_prefix": "researcherAgent",
+                "file_name": "researcher/researcher_manifest.yaml",
+            },
         ]
 
         # Make request
@@ -43,13 +57,13 @@ class TestAgentRoutes:
         data = response.json()
         assert "templates" in data
         assert len(data["templates"]) == 2
-        assert data["templates"][0]["name"] == "pokemon_expert"
-        assert data["templates"][1]["name"] == "researcher"
+        assert data["templates"][0]["aid_prefix"] == "pokemonExpertAgent"
+        assert data["templates"][1]["aid_prefix"] == "researcherAgent"
 
     @patch(
         "app.application.services.agent_management_service.AgentManagementService.create_agent_from_template"
     )
-    async def test_create_agent(self, mock_create_agent):
+    def test_create_agent(self, mock_create_agent):
         """Test creating an agent endpoint"""
         # Setup mock
         mock_agent = MagicMock(spec=LangpifyBaseAgent)
@@ -67,12 +81,12 @@ class TestAgentRoutes:
         assert "agent" in data
         assert data["agent"]["aid"] == "pokemon_expert@langpify.agents"
         assert data["agent"]["role_name"] == "Pokemon Expert"
-        assert data["agent"]["status"] == "ACTIVE"
+        assert data["agent"]["status"] == "active"
 
     @patch(
         "app.application.services.agent_management_service.AgentManagementService.init_environment"
     )
-    async def test_init_environment(self, mock_init_environment):
+    def test_init_environment(self, mock_init_environment):
         """Test initializing the environment endpoint"""
         # Setup mock
         mock_agent1 = MagicMock(spec=LangpifyBaseAgent)
@@ -101,7 +115,7 @@ class TestAgentRoutes:
     @patch(
         "app.application.services.agent_management_service.AgentManagementService.list_agents"
     )
-    async def test_list_agents(self, mock_list_agents):
+    def test_list_agents(self, mock_list_agents):
         """Test listing agents endpoint"""
         # Setup mock
         mock_agent1 = MagicMock(spec=LangpifyBaseAgent)
@@ -127,10 +141,63 @@ class TestAgentRoutes:
         assert data["agents"][0]["aid"] == "pokemon_expert@langpify.agents"
         assert data["agents"][1]["aid"] == "researcher@langpify.agents"
 
+    @patch(
+        "app.application.services.agent_management_service.AgentManagementService.suspend_agent"
+    )
+    def test_suspend_agent(self, mock_suspend_agent):
+        """Test suspending an agent endpoint"""
+        from app.application.services.agent_registry import (
+            AgentNotFoundError,
+            AgentStatusError,
+        )
+
+        # Setup mock
+        mock_agent = MagicMock(spec=LangpifyBaseAgent)
+        mock_agent.aid = "researcher@langpify.agents"
+        mock_agent.role = {"name": "Researcher"}
+        mock_agent.status = AgentStatus.SUSPENDED
+        mock_suspend_agent.side_effect = [
+            mock_agent,
+            AgentStatusError("Agent is suspended, not active"),
+            AgentNotFoundError("Agent missing@langpify.agents not found"),
+        ]
+
+        # Make requests
+        response = self.client.post("/agents/researcher@langpify.agents/suspend")
+        conflict = self.client.post("/agents/researcher@langpify.agents/suspend")
+        missing = self.client.post("/agents/missing@langpify.agents/suspend")
+
+        # Assertions
+        assert response.status_code == 200
+        assert response.json()["status"] == "suspended"
+        assert conflict.status_code == 409
+        assert missing.status_code == 404
+
+    @patch("app.application.services.query_router.QueryRouter.metrics")
+    def test_metrics(self, mock_metrics):
+        """Test the query router metrics endpoint"""
+        # Setup mock
+        mock_metrics.return_value = {
+            "queries": 4,
+            "direct": 3,
+            "supervisor": 1,
+            "hit_rate": 0.75,
+            "dispatch_errors": 0,
+            "decisions": {"D": 3, "A": 1},
+            "direct_by_pathway": {"D": 3},
+        }
+
+        # Make request
+        response = self.client.get("/agents/system/metrics")
+
+        # Assertions
+        assert response.status_code == 200
+        assert response.json()["query_router"]["hit_rate"] == 0.75
+
     @patch(
         "app.application.services.agent_management_service.AgentManagementService.invoke_agent"
     )
-    async def test_invoke_agent(self, mock_invoke_agent):
+    def test_invoke_agent(self, mock_invoke_agent):
         """Test invoking an agent endpoint"""
         # Setup mock
         mock_invoke_agent.return_value = {
@@ -150,7 +217,7 @@ class TestAgentRoutes:
     @patch(
         "app.application.services.agent_management_service.AgentManagementService.invoke_agent"
     )
-    async def test_chat(self, mock_invoke_agent):
+    def test_chat(self, mock_invoke_agent):
         """Test chat endpoint"""
         # Setup mock
         mock_invoke_agent.return_value = {
@@ -170,7 +237,7 @@ class TestAgentRoutes:
     @patch(
         "app.application.services.agent_management_service.AgentManagementService.invoke_agent"
     )
-    async def test_battle(self, mock_invoke_agent):
+    def test_battle(self, mock_invoke_agent):
         """Test battle endpoint"""
         # Setup mock
         mock_invoke_agent.return_value = {
@@ -188,3 +255,175 @@ class TestAgentRoutes:
         assert "response" in data
         assert "Pikachu" in data["response"]
         assert "Bulbasaur" in data["response"]
+
+    @patch("app.presentation.routers.agent_routers.get_counters_index")
+    def test_counters(self, mock_get_counters_index):
+        """Test counters endpoint"""
+        # Setup mock
+        mock_index = MagicMock()
+        mock_index.__len__.return_value = 8
+        mock_index.resolve.return_value = "garchomp"
+        mock_index.counters.return_value = [
+            {
+                "name": "mamoswine",
+                "margin": 0.8,
+                "turns_to_win": 0.4,
+                "opponent_turns_to_win": 1.2,
+            }
+        ]
+        mock_get_counters_index.return_value = mock_index
+
+        # Make request
+        response = self.client.get("/agents/system/counters/garchomp?limit=5")
+
+        # Assertions
+        assert response.status_code == 200
+        data = response.json()
+        assert data["pokemon"] == "garchomp"
+        assert data["counters"][0]["name"] == "mamoswine"
+        mock_index.counters.assert_called_once_with("garchomp", 5)
+
+    @patch("app.application.services.battle_service.BattleService.fast_battle")
+    def test_battle_fast_mode(self, mock_fast_battle):
+        """Test battle endpoint in fast mode skips the agents"""
+        # Setup mock
+        mock_fast_battle.return_value = PokemonExpertResponse(
+            winner="pikachu", reasoning="Pikachu is faster and would attack first."
+        )
+
+        # Make request
+        response = self.client.get(
+            "/agents/system/battle?pokemon1=pikachu&pokemon2=squirtle&mode=fast"
+        )
+
+        # Assertions
+        assert response.status_code == 200
+        data = response.json()
+        assert data["winner"] == "pikachu"
+        assert data["narration_id"] is None
+
+    @patch("app.application.services.battle_service.BattleService.get_narration")
+    def test_battle_narration(self, mock_get_narration):
+        """Test polling the narration of a fast battle"""
+        # Setup mock
+        mock_get_narration.side_effect = [
+            {"status": "done", "narration": "Pikachu zaps Squirtle!"},
+            None,
+        ]
+
+        # Make requests
+        response = self.client.get("/agents/system/battle/narration/abc123")
+        missing = self.client.get("/agents/system/battle/narration/unknown")
+
+        # Assertions
+        assert response.status_code == 200
+        assert response.json()["narration"] == "Pikachu zaps Squirtle!"
+        assert missing.status_code == 404
+
+    @patch(
+        "app.application.services.agent_management_service.AgentManagementService.stream_agent"
+    )
+    def test_chat_stream(self, mock_stream_agent):
+        """Test chat streaming endpoint emits Server-Sent Events"""
+
+        # Setup mock
+        async def events(*args, **kwargs):
+            yield "handoff", {"to": "researcher"}
+            yield "token", {"agent": "researcher", "content": "Pikachu"}
+            yield "final", {"structured_response": {"answer": "Pikachu"}}
+
+        mock_stream_agent.side_effect = events
+
+        # Make request
+        response = self.client.get(
+            "/agents/system/chat/stream?question=Tell me about Pikachu"
+        )
+
+        # Assertions
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: handoff" in response.text
+        assert "event: final" in response.text
+
+    @patch("app.application.services.render_service.RenderService.get_job")
+    @patch("app.application.services.render_service.RenderService.submit")
+    def test_render_battle(self, mock_submit, mock_get_job):
+        """Test render endpoint queues a job and reports its status"""
+        # Setup mocks
+        mock_submit.return_value = "job123"
+        mock_get_job.return_value = {"status": "queued", "path": None, "error": None}
+
+        # Make request
+        response = self.client.post(
+            "/agents/system/battle/render?pokemon1=pikachu&pokemon2=squirtle"
+        )
+
+        # Assertions
+        assert response.status_code == 202
+        data = response.json()
+        assert data["job_id"] == "job123"
+        assert data["status"] == "queued"
+        assert data["result_url"] is None
+
+    @patch("app.application.services.render_service.RenderService.get_job")
+    def test_render_status(self, mock_get_job):
+        """Test render status endpoint links the result once the job is done"""
+        # Setup mock
+        mock_get_job.side_effect = [
+            {"status": "done", "path": "/tmp/battle.gif", "error": None},
+            None,
+        ]
+
+        # Make requests
+        response = self.client.get("/agents/system/battle/render/job123")
+        missing = self.client.get("/agents/system/battle/render/unknown")
+
+        # Assertions
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "done"
+        assert data["result_url"].endswith("/system/battle/render/job123/result")
+        assert missing.status_code == 404
+
+    @patch("app.application.services.render_service.RenderService.submit")
+    def test_render_battle_queue_full(self, mock_submit):
+        """Test render endpoint answers 429 when the queue is full"""
+        from app.application.services.render_service import RenderQueueFullError
+
+        # Setup mock
+        mock_submit.side_effect = RenderQueueFullError("Render queue is full")
+
+        # Make request
+        response = self.client.post(
+            "/agents/system/battle/render?pokemon1=pikachu&pokemon2=squirtle"
+        )
+
+        # Assertions
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+
+    @patch("app.application.services.render_service.RenderService.stream")
+    def test_render_stream(self, mock_stream):
+        """Test frame streaming endpoint emits Server-Sent Events"""
+
+        # Setup mock
+        async def events():
+            yield "frame", {
+                "index": 0,
+                "duration": 1000.0,
+                "image": "data:image/jpeg;base64,",
+            }
+            yield "done", {"winner": "pikachu", "reasoning": "Pikachu is faster."}
+
+        mock_stream.return_value = events()
+
+        # Make request
+        response = self.client.get(
+            "/agents/system/battle/render/stream?pokemon1=pikachu&pokemon2=squirtle"
+        )
+
+        # Assertions
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: frame" in response.text
+        assert "event: done" in response.text
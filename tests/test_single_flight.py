@@ -0,0 +1,67 @@
+import pytest
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for the single_flight.py module"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Test that concurrent callers of a key share a single execution"""
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "pikachu"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+        assert results == ["pikachu"] * 5
+        assert len(calls) == 1
+        assert flight.stats() == {"executions": 1, "coalesced": 4}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_doesnt_cancel_followers(self):
+        """Test that a follower still gets the result when the leader is cancelled"""
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def fetch():
+            started.set()
+            await asyncio.sleep(0.02)
+            return "pikachu"
+
+        leader = asyncio.create_task(flight.do("key", fetch))
+        await started.wait()
+        follower = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "pikachu"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert flight.stats()["executions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_exceptions_reach_every_caller(self):
+        """Test that a failed call raises in every caller and isn't kept"""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("not found")
+
+        results = await asyncio.gather(
+            *(flight.do("key", fetch) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight._async_calls == {}
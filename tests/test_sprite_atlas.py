@@ -0,0 +1,184 @@
+import pytest
+import sys
+import io
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils.sprite_atlas import (
+    SpriteAtlas,
+    download_sprites,
+    preprocess_sprite,
+    remove_black_background,
+    select_sprite_url,
+    sprite_key,
+    write_sprite_atlas,
+)
+
+
+def remove_black_background_per_pixel(sprite: Image.Image) -> Image.Image:
+    """Reference per-pixel implementation the NumPy version replaced"""
+    data = sprite.getdata()
+    if any(item[3] < 255 for item in data):
+        return sprite
+    width, height = sprite.size
+    edge_pixels = []
+    for x in range(width):
+        edge_pixels.append(data[x])
+        edge_pixels.append(data[(height - 1) * width + x])
+    for y in range(height):
+        edge_pixels.append(data[y * width])
+        edge_pixels.append(data[y * width + width - 1])
+    bg_color_count = sum(
+        1 for p in edge_pixels if p[0] < 10 and p[1] < 10 and p[2] < 10
+    )
+    if bg_color_count > len(edge_pixels) * 0.7:
+        sprite = sprite.copy()
+        sprite.putdata(
+            [
+                (0, 0, 0, 0) if item[0] < 10 and item[1] < 10 and item[2] < 10 else item
+                for item in data
+            ]
+        )
+    return sprite
+
+
+@pytest.fixture
+def black_background_sprite():
+    """Opaque sprite on a black background with a colored body"""
+    rng = np.random.default_rng(0)
+    pixels = np.zeros((40, 30, 4), dtype=np.uint8)
+    pixels[..., 3] = 255
+    pixels[10:30, 5:25, :3] = rng.integers(0, 256, (20, 20, 3))
+    return Image.fromarray(pixels)
+
+
+class TestSpritePreprocessing:
+    """Tests for the NumPy sprite preprocessing in sprite_atlas.py"""
+
+    def test_matches_per_pixel_reference(self, black_background_sprite):
+        """Test that the NumPy mask matches the per-pixel implementation"""
+        expected = remove_black_background_per_pixel(black_background_sprite)
+        result = remove_black_background(np.asarray(black_background_sprite))
+        assert np.array_equal(result, np.asarray(expected))
+        assert result[0, 0, 3] == 0
+
+    def test_keeps_intended_black(self):
+        """Test that sprites whose edges aren't mostly black are unchanged"""
+        pixels = np.full((20, 20, 4), 255, dtype=np.uint8)
+        pixels[5:15, 5:15, :3] = 0
+        assert np.array_equal(remove_black_background(pixels), pixels)
+
+    def test_keeps_transparent_sprites(self, black_background_sprite):
+        """Test that sprites already using transparency are unchanged"""
+        pixels = np.asarray(black_background_sprite).copy()
+        pixels[0, 0, 3] = 0
+        assert np.array_equal(remove_black_background(pixels), pixels)
+
+    def test_preprocess_resizes(self):
+        """Test that large sprites are shrunk to fit 400x400"""
+        sprite = preprocess_sprite(Image.new("RGB", (800, 600), (255, 0, 0)))
+        assert sprite.mode == "RGBA"
+        assert sprite.size == (400, 300)
+
+    def test_select_sprite_url(self):
+        """Test variant selection with fallback to the default sprite"""
+        data = {
+            "sprites": {
+                "back_default": "back.png",
+                "back_shiny": "back_shiny.png",
+                "front_default": "front.png",
+            }
+        }
+        form_data = {"sprites": {"front_default": "form.png", "front_female": "f.png"}}
+
+        assert select_sprite_url(data, form_data, "shiny", True) == "back_shiny.png"
+        assert select_sprite_url(data, form_data, "female", True) == "back.png"
+        assert select_sprite_url(data, form_data, "female", False) == "f.png"
+        assert select_sprite_url(data, form_data, "shiny", False) == "form.png"
+        assert select_sprite_url(data, None, "default", False) == "front.png"
+
+
+class TestSpriteAtlas:
+    """Tests for the memory-mapped sprite atlas"""
+
+    def test_roundtrip(self, tmp_path):
+        """Test that sprites are read back from the atlas unchanged"""
+        red = Image.new("RGBA", (3, 2), (255, 0, 0, 255))
+        blue = Image.new("RGBA", (4, 5), (0, 0, 255, 128))
+        sprites = {
+            sprite_key("pikachu", "front", "default"): "red.png",
+            sprite_key("pikachu", "front", "female"): "red.png",
+            sprite_key("squirtle", "back", "default"): "blue.png",
+            sprite_key("missingno", "front", "default"): None,
+        }
+        path = str(tmp_path / "sprites.bin")
+        count = write_sprite_atlas(path, sprites, {"red.png": red, "blue.png": blue})
+
+        atlas = SpriteAtlas(path)
+        assert count == 3
+        assert len(atlas) == 3
+        # Variants falling back to the same image share their pixels
+        assert os.path.getsize(path) == (3 * 2 + 4 * 5) * 4
+        assert np.array_equal(
+            np.asarray(atlas.get("pikachu_front_female")), np.asarray(red)
+        )
+        assert np.array_equal(
+            np.asarray(atlas.get("squirtle_back_default")), np.asarray(blue)
+        )
+        assert atlas.get("missingno_front_default") is None
+
+    def test_missing_atlas(self, tmp_path):
+        """Test that a missing atlas is empty"""
+        atlas = SpriteAtlas(str(tmp_path / "sprites.bin"))
+        assert len(atlas) == 0
+        assert atlas.get("pikachu_front_default") is None
+
+    def test_sprite_served_from_atlas(self, tmp_path):
+        """Test that get_pokemon_sprite reads the atlas before any download"""
+        from app.application.tools.utils.visualization_utils import get_pokemon_sprite
+
+        red = Image.new("RGBA", (3, 2), (255, 0, 0, 255))
+        path = str(tmp_path / "sprites.bin")
+        write_sprite_atlas(path, {"pikachu_back_shiny": "red.png"}, {"red.png": red})
+
+        with patch(
+            "app.application.tools.utils.visualization_utils.get_sprite_atlas",
+            return_value=SpriteAtlas(path),
+        ), patch(
+            "app.application.tools.utils.visualization_utils.get_pokeapi_client"
+        ) as mock_client:
+            sprite = get_pokemon_sprite("Pikachu", "shiny", is_first_pokemon=True)
+
+        assert sprite.size == (3, 2)
+        mock_client.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_download_skips_failed_sprites(self):
+        """Test that one failed sprite doesn't abort the whole download"""
+        png = io.BytesIO()
+        Image.new("RGBA", (3, 2), (255, 0, 0, 255)).save(png, format="PNG")
+        responses = {
+            "ok.png": MagicMock(status_code=200, content=png.getvalue()),
+            "missing.png": MagicMock(status_code=404),
+            "broken.png": MagicMock(status_code=200, content=b"not an image"),
+        }
+
+        async def get(url):
+            if url == "timeout.png":
+                raise TimeoutError("read timed out")
+            return responses[url]
+
+        with patch(
+            "app.application.tools.utils.sprite_atlas.get_pokeapi_client"
+        ) as mock_client:
+            mock_client.return_value.get = AsyncMock(side_effect=get)
+            images = await download_sprites(
+                ["ok.png", "missing.png", "broken.png", "timeout.png"]
+            )
+
+        assert list(images) == ["ok.png"]
@@ -1,7 +1,8 @@
 import pytest
+import asyncio
 import sys
 import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -9,6 +10,8 @@ from app.application.tools.tools import (
     analyze_battle,
     explain_stats,
     fetch_pokemon_info,
+    fetch_pokemon_infos,
+    afetch_pokemon_infos,
 )
 
 
@@ -142,3 +145,40 @@ class TestTools:
         # Assertions
         assert "error" in result
         assert result["error"] == "Pokemon not found"
+
+    @patch("app.application.tools.tools.fetch_pokemon_data")
+    def test_fetch_pokemon_infos(self, mock_fetch_pokemon_data):
+        """Test fetch_pokemon_infos fetches each distinct name once, in order"""
+        mock_fetch_pokemon_data.side_effect = lambda name: (
+            {"error": f"Pokémon '{name}' not found."}
+            if name == "missingno"
+            else {"name": name, "types": ["normal"]}
+        )
+
+        result = fetch_pokemon_infos(["Pikachu", "eevee", "pikachu ", "MissingNo"])
+
+        assert [r["name"] for r in result] == ["pikachu", "eevee", "MissingNo"]
+        assert "error" in result[2]
+        assert mock_fetch_pokemon_data.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch("app.application.tools.tools.afetch_pokemon_data", new_callable=AsyncMock)
+    async def test_afetch_pokemon_infos(self, mock_afetch_pokemon_data):
+        """Test afetch_pokemon_infos fetches the names concurrently"""
+        running = []
+
+        async def fetch(name):
+            running.append(name)
+            # Every fetch must be in flight before any of them completes
+            while len(running) < 2:
+                await asyncio.sleep(0)
+            return {"name": name}
+
+        mock_afetch_pokemon_data.side_effect = fetch
+
+        result = await asyncio.wait_for(
+            afetch_pokemon_infos(["Charizard", "blastoise", "charizard"]), timeout=1
+        )
+
+        assert result == [{"name": "charizard"}, {"name": "blastoise"}]
+        assert mock_afetch_pokemon_data.await_count == 2
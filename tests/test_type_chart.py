@@ -0,0 +1,47 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils.type_chart import (
+    DEFENDER_COMBOS,
+    DEFENDER_TABLE,
+    EFFECTIVENESS_MATRIX,
+    type_effectiveness,
+    type_multiplier,
+)
+
+
+class TestTypeChart:
+    """Tests for the type_chart.py module"""
+
+    def test_table_shapes(self):
+        """Test the matrix and the dual-type defender table dimensions"""
+        assert EFFECTIVENESS_MATRIX.shape == (18, 18)
+        assert len(DEFENDER_COMBOS) == 171
+        assert DEFENDER_TABLE.shape == (18, 171)
+
+    def test_single_type_multipliers(self):
+        """Test super effective, resisted and immune matchups"""
+        assert type_multiplier("water", ["fire"]) == 2.0
+        assert type_multiplier("fire", ["water"]) == 0.5
+        assert type_multiplier("electric", ["ground"]) == 0.0
+        assert type_multiplier("fairy", ["fire"]) == 0.5
+
+    def test_dual_type_multipliers(self):
+        """Test that dual-type defenders multiply both types, in any order"""
+        assert type_multiplier("ice", ["dragon", "ground"]) == 4.0
+        assert type_multiplier("ice", ["ground", "dragon"]) == 4.0
+        assert type_multiplier("fire", ["water", "rock"]) == 0.25
+        assert type_multiplier("electric", ["water", "ground"]) == 0.0
+
+    def test_attacker_uses_best_type(self):
+        """Test that a dual-type attacker uses its most effective type"""
+        assert type_effectiveness(["electric", "flying"], ["ground"]) == 1.0
+        assert type_effectiveness(["water", "ground"], ["fire", "rock"]) == 4.0
+
+    def test_unknown_types_are_neutral(self):
+        """Test that unknown or missing types don't change the multiplier"""
+        assert type_effectiveness([], ["fire"]) == 1.0
+        assert type_effectiveness(["shadow"], ["fire"]) == 1.0
+        assert type_multiplier("water", []) == 1.0
@@ -0,0 +1,134 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.tools.utils.cache import FileCache
+from app.application.tools.utils.sprite_atlas import SpriteAtlas, write_sprite_atlas
+from app.application.tools.utils import visualization_utils
+from app.application.tools.utils.visualization_utils import (
+    BattleScene,
+    create_pokemon_shadow,
+    generate_battle_animation,
+    get_battle_fonts,
+    get_pokemon_sprite,
+    get_sky_background,
+    preload_sprites,
+)
+
+
+@pytest.fixture
+def scene():
+    """Fixture for a battle scene with two plain sprites"""
+    sprite1 = Image.new("RGBA", (96, 96), (200, 50, 50, 255))
+    sprite2 = Image.new("RGBA", (120, 120), (50, 50, 200, 255))
+    return BattleScene(sprite1, sprite2, "pikachu", "squirtle")
+
+
+class TestBattleScene:
+    """Tests for the layered battle renderer in visualization_utils.py"""
+
+    def test_sky_gradient(self):
+        """Test that the NumPy gradient matches the per-pixel formula"""
+        background = get_sky_background()
+        assert background.size == (800, 500)
+        for y in (0, 137, 379):
+            expected = (
+                int(176 + (y / 500) * 64),
+                int(224 + (y / 500) * 31),
+                int(230 + (y / 500) * 25),
+            )
+            assert background.getpixel((0, y)) == expected
+            assert background.getpixel((799, y)) == expected
+
+    def test_frames_share_static_layers(self, scene):
+        """Test that frames only differ in health bars and message"""
+        frame1 = scene.render(1.0, 1.0, "Battle begins!")
+        frame2 = scene.render(0.5, 0.1, "Pikachu attacks Squirtle!")
+        assert frame1.size == (800, 500)
+        # Sprites and field are identical, health bars are not
+        assert frame1.getpixel((200, 330)) == frame2.getpixel((200, 330))
+        assert frame1.getpixel((150, 95)) != frame2.getpixel((150, 95))
+
+    def test_fonts_are_loaded_once(self):
+        """Test that fonts are cached across frames"""
+        assert get_battle_fonts() is get_battle_fonts()
+
+
+class TestBattleAnimation:
+    """Tests for the content-addressed battle animations"""
+
+    pikachu = {"name": "pikachu", "types": ["electric"], "base_stats": {"speed": 90}}
+    squirtle = {"name": "squirtle", "types": ["water"], "base_stats": {"speed": 43}}
+    result = {"winner": "pikachu", "reasoning": "Pikachu is faster."}
+
+    def render(self, cache):
+        sprite = Image.new("RGBA", (96, 96), (200, 50, 50, 255))
+        with patch(
+            "app.application.tools.utils.visualization_utils.get_battle_animation_cache",
+            return_value=cache,
+        ), patch(
+            "app.application.tools.utils.visualization_utils.get_pokemon_sprite",
+            return_value=sprite,
+        ) as mock_sprite:
+            path = generate_battle_animation(self.pikachu, self.squirtle, self.result)
+        return path, mock_sprite.call_count
+
+    def test_deterministic_output(self, tmp_path):
+        """Test that the same battle renders byte-identical GIFs"""
+        path1, _ = self.render(FileCache(str(tmp_path / "a"), 2**30, ".gif"))
+        path2, _ = self.render(FileCache(str(tmp_path / "b"), 2**30, ".gif"))
+        with open(path1, "rb") as f1, open(path2, "rb") as f2:
+            assert f1.read() == f2.read()
+
+    def test_served_from_cache(self, tmp_path):
+        """Test that a battle rendered before is not rendered again"""
+        cache = FileCache(str(tmp_path), 2**30, ".gif")
+        path1, sprites1 = self.render(cache)
+        path2, sprites2 = self.render(cache)
+        assert path1 == path2
+        assert sprites1 == 2
+        assert sprites2 == 0
+
+
+class TestSpritePreload:
+    """Tests for the sprites preloaded by the startup warm-up"""
+
+    def test_preloaded_sprites_skip_the_atlas(self, tmp_path):
+        """Test that preloaded sprites are served from memory"""
+        red = Image.new("RGBA", (3, 2), (255, 0, 0, 255))
+        path = str(tmp_path / "sprites.bin")
+        write_sprite_atlas(
+            path,
+            {"pikachu_front_default": "red.png", "pikachu_back_default": "red.png"},
+            {"red.png": red},
+        )
+
+        with patch.dict(visualization_utils._preloaded_sprites, clear=True):
+            with patch(
+                "app.application.tools.utils.visualization_utils.get_sprite_atlas",
+                return_value=SpriteAtlas(path),
+            ):
+                # Missingno is neither in the atlas nor in the sprite cache
+                assert preload_sprites(["Pikachu", "missingno"]) == 2
+
+            with patch(
+                "app.application.tools.utils.visualization_utils.get_sprite_atlas"
+            ) as mock_atlas:
+                sprite = get_pokemon_sprite("pikachu", is_first_pokemon=True)
+
+            assert sprite.size == (3, 2)
+            assert sprite is get_pokemon_sprite("pikachu", is_first_pokemon=True)
+            mock_atlas.assert_not_called()
+
+    def test_shadows_are_built_once_per_size(self):
+        """Test that sprites of the same size share their shadow"""
+        sprite1 = Image.new("RGBA", (96, 96), (200, 50, 50, 255))
+        sprite2 = Image.new("RGBA", (96, 96), (50, 50, 200, 255))
+        shadow = create_pokemon_shadow(sprite1)
+        assert shadow.size == (96, 28)
+        assert create_pokemon_shadow(sprite2) is shadow